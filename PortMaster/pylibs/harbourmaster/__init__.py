@@ -22,6 +22,9 @@ from .config import (
 from .util import (
     Callback,
     CancelEvent,
+    FifoRequest,
+    FifoServer,
+    FileSync,
     HarbourException,
     add_dict_list_unique,
     add_list_unique,
@@ -45,11 +48,20 @@ from .util import (
     remove_dict_list,
     remove_pm_signature,
     runtime_nicename,
-    timeit,
     version_parse,
     PORT_SORT_FUNCS,
     )
 
+from .catalogue import (
+    CatalogueStore,
+    CatalogueView,
+    catalogue_write,
+    )
+
+from .sizes import (
+    DirectorySizes,
+    )
+
 from .info import (
     port_info_load,
     port_info_merge,
@@ -65,6 +77,7 @@ from .hardware import (
     device_info,
     expand_info,
     find_device_by_resolution,
+    refresh_device_info,
     HW_INFO,
     DEVICES,
     )
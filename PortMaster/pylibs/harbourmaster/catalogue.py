@@ -0,0 +1,212 @@
+
+# SPDX-License-Identifier: MIT
+
+"""
+Indexed on-disk catalogue, so sources don't have to keep every port in memory.
+
+The file is laid out as:
+
+    header:  magic, version, record count
+    index:   record offsets (u32), sorted by record name
+    records: name length (u16), name, data length (u32), json data
+
+It is read through mmap, lookups do a binary search over the index and only decode the record asked for.
+"""
+
+# System imports
+import json
+import mmap
+import struct
+
+from collections.abc import Mapping
+from pathlib import Path
+
+# Module imports
+from .util import HarbourException
+
+
+CATALOGUE_MAGIC = b'HMCATLG\x00'
+CATALOGUE_VERSION = 1
+
+_HEADER = struct.Struct('<8sII')
+_OFFSET = struct.Struct('<I')
+_NAME_LEN = struct.Struct('<H')
+_DATA_LEN = struct.Struct('<I')
+
+
+def catalogue_write(file_name, records):
+    """
+    Writes a catalogue file, records is a dict of name -> json data.
+
+    Returns the size of the file written.
+    """
+    file_name = Path(file_name)
+
+    names = sorted(
+        (name.encode('utf-8'), name)
+        for name in records)
+
+    offset = _HEADER.size + _OFFSET.size * len(names)
+    index = []
+    blobs = []
+
+    for name_bytes, name in names:
+        data = json.dumps(records[name], separators=(',', ':')).encode('utf-8')
+
+        blob = b''.join((
+            _NAME_LEN.pack(len(name_bytes)), name_bytes,
+            _DATA_LEN.pack(len(data)), data))
+
+        index.append(_OFFSET.pack(offset))
+        blobs.append(blob)
+        offset += len(blob)
+
+    if offset > 0xFFFFFFFF:
+        raise HarbourException(f"Catalogue {file_name} too big.")
+
+    tmp_file = file_name.with_name(file_name.name + '.tmp')
+    with tmp_file.open('wb') as fh:
+        fh.write(_HEADER.pack(CATALOGUE_MAGIC, CATALOGUE_VERSION, len(names)))
+        fh.writelines(index)
+        fh.writelines(blobs)
+
+    tmp_file.replace(file_name)
+
+    return offset
+
+
+class CatalogueStore(Mapping):
+    """
+    Read only view of a catalogue file, records are decoded on every access so callers are free to modify them.
+    """
+
+    def __init__(self, file_name):
+        self.file_name = Path(file_name)
+
+        with self.file_name.open('rb') as fh:
+            self._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            if len(self._mmap) < _HEADER.size:
+                raise HarbourException(f"Catalogue {self.file_name} is truncated.")
+
+            magic, version, self._count = _HEADER.unpack_from(self._mmap, 0)
+
+            if magic != CATALOGUE_MAGIC or version != CATALOGUE_VERSION:
+                raise HarbourException(f"Catalogue {self.file_name} is not a version {CATALOGUE_VERSION} catalogue.")
+
+            if len(self._mmap) < _HEADER.size + _OFFSET.size * self._count:
+                raise HarbourException(f"Catalogue {self.file_name} is truncated.")
+
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def _offset(self, index):
+        return _OFFSET.unpack_from(self._mmap, _HEADER.size + _OFFSET.size * index)[0]
+
+    def _name(self, index):
+        offset = self._offset(index)
+        name_len = _NAME_LEN.unpack_from(self._mmap, offset)[0]
+        offset += _NAME_LEN.size
+
+        return self._mmap[offset:offset + name_len]
+
+    def _find(self, name):
+        """
+        Returns the record index of name, or None.
+        """
+        if self._mmap is None or not isinstance(name, str):
+            return None
+
+        name_bytes = name.encode('utf-8')
+        low, high = 0, self._count
+
+        ## bisect only grew key= in 3.10
+        while low < high:
+            middle = (low + high) // 2
+            if self._name(middle) < name_bytes:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low < self._count and self._name(low) == name_bytes:
+            return low
+
+        return None
+
+    def _data(self, index):
+        offset = self._offset(index)
+        offset += _NAME_LEN.size + _NAME_LEN.unpack_from(self._mmap, offset)[0]
+        data_len = _DATA_LEN.unpack_from(self._mmap, offset)[0]
+        offset += _DATA_LEN.size
+
+        return json.loads(self._mmap[offset:offset + data_len])
+
+    def __contains__(self, name):
+        return self._find(name) is not None
+
+    def __getitem__(self, name):
+        index = self._find(name)
+        if index is None:
+            raise KeyError(name)
+
+        return self._data(index)
+
+    def __iter__(self):
+        if self._mmap is None:
+            return
+
+        for index in range(self._count):
+            yield self._name(index).decode('utf-8')
+
+    def __len__(self):
+        if self._mmap is None:
+            return 0
+
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class CatalogueView(Mapping):
+    """
+    The records of a CatalogueStore that start with prefix, without the prefix.
+    """
+
+    def __init__(self, store, prefix):
+        self.store = store
+        self.prefix = prefix
+
+    def __contains__(self, name):
+        return isinstance(name, str) and (self.prefix + name) in self.store
+
+    def __getitem__(self, name):
+        if not isinstance(name, str):
+            raise KeyError(name)
+
+        return self.store[self.prefix + name]
+
+    def __iter__(self):
+        for name in self.store:
+            if name.startswith(self.prefix):
+                yield name[len(self.prefix):]
+
+    def __len__(self):
+        return sum(1 for name in self)
+
+
+__all__ = (
+    'CatalogueStore',
+    'CatalogueView',
+    'catalogue_write',
+    )
@@ -26,7 +26,6 @@ HM_SCRIPTS_DIR=None
 HM_UPDATE_FREQUENCY=(60 * 60 * 1)  # Only check automatically once per hour.
 
 HM_TESTING=False
-HM_PERFTEST=False
 
 ## Maximum temporary size is 100 mb, this can cause errors on TrimUI and muOS.
 HM_MAX_TEMP_SIZE = 1024 * 1024 * 100
@@ -82,7 +81,15 @@ elif Path("/opt/muos").is_dir():
 
     MUOS_MMC_TOGGLE        = Path('/mnt/mmc/MUOS/PortMaster/config/muos_mmc_master_race.txt')
 
-    if not MUOS_MMC_TOGGLE.is_file() and '/mnt/sdcard' in subprocess.getoutput(['df']):
+    ## /proc/mounts has the same mount points as df without running it at every import.
+    try:
+        with open('/proc/mounts', 'r') as fh:
+            MUOS_MOUNTS = fh.read()
+
+    except OSError:
+        MUOS_MOUNTS = subprocess.getoutput(['df'])
+
+    if not MUOS_MMC_TOGGLE.is_file() and '/mnt/sdcard' in MUOS_MOUNTS:
         HM_DEFAULT_PORTS_DIR   = Path("/mnt/sdcard/ports")
         HM_DEFAULT_SCRIPTS_DIR = Path("/mnt/sdcard/ROMS/Ports")
 
@@ -205,10 +212,6 @@ else:
     exit(255)
 
 
-if 'HM_PERFTEST' in os.environ:
-    HM_PERFTEST=True
-
-
 HM_SOURCE_DEFAULTS = {
     "020_portmaster.source.json": textwrap.dedent("""
     {
@@ -277,7 +280,6 @@ __all__ = (
     'HM_DEFAULT_TOOLS_DIR',
     'HM_DEFAULT_SCRIPTS_DIR',
     'HM_GENRES',
-    'HM_PERFTEST',
     'HM_PORTS_DIR',
     'HM_SCRIPTS_DIR',
     'HM_SORT_ORDER',
@@ -17,6 +17,8 @@ from pathlib import Path
 from gettext import gettext as _
 
 # Included imports
+import memprofile
+import tracing
 import utility
 
 from loguru import logger
@@ -30,6 +32,8 @@ from .info import *
 from .source import *
 from .platform import *
 from .captain import *
+from .catalogue import *
+from .sizes import *
 
 ################################################################################
 ## Config loading
@@ -54,6 +58,7 @@ class HarbourMaster():
     PORTERS_URL        = PORT_INFO_URL + "porters.json"
     SOURCES_URL        = PORT_INFO_URL + "sources.json"
 
+    @tracing.traced()
     def __init__(self, config, *, tools_dir=None, ports_dir=None, scripts_dir=None, temp_dir=None, callback=None):
         """
         config = load_config()
@@ -100,6 +105,8 @@ class HarbourMaster():
             'debug': config.get('debug', False),
             }
 
+        self._file_owners = {}
+
         self.device = device_info()
 
         if self.device['name'].lower() in HM_PLATFORMS:
@@ -115,6 +122,8 @@ class HarbourMaster():
 
         self._port_attrs_updated = True
 
+        memprofile.add_sizes(self.memory_sizes)
+
         self.ports_dir.mkdir(0o755, parents=True, exist_ok=True)
         self.scripts_dir.mkdir(0o755, parents=True, exist_ok=True)
         self.themes_dir.mkdir(0o755, parents=True, exist_ok=True)
@@ -150,12 +159,18 @@ class HarbourMaster():
                 self.update_config()
                 self.cfg_data['version'] = self.CONFIG_VERSION
 
+            self.dir_sizes = DirectorySizes(self.cfg_dir / "dir_sizes.json")
+
             self.load_info()
 
             self.load_sources()
 
+            memprofile.snapshot('sources loaded')
+
             self.load_ports()
 
+            memprofile.snapshot('ports loaded')
+
             self.platform.loaded()
 
             self.save_config()
@@ -173,7 +188,9 @@ class HarbourMaster():
                 logger.debug(f"rmtree {image_dir}")
                 shutil.rmtree(str(image_dir))
 
-            for source_file in self.cfg_dir.glob("*portmaster*.source.json"):
+            for source_file in [
+                    *self.cfg_dir.glob("*portmaster*.source.json"),
+                    *self.cfg_dir.glob("*portmaster*.source.catalogue")]:
                 if not source_file.is_file():
                     continue
 
@@ -215,6 +232,33 @@ class HarbourMaster():
 
         return self.__PORTERS
 
+    def memory_sizes(self):
+        """
+        Sizes of the biggest structures for `--profile-memory`, {name: (bytes, entries)}.
+        """
+        sizes = {}
+
+        for source_prefix, source in self.sources.items():
+            source_info = getattr(source, '_info', {})
+
+            if isinstance(source_info, CatalogueView):
+                ## Memory mapped, only the pages that get read count towards rss.
+                sizes[f"source[{source_prefix}]._info (mapped)"] = (source_info.store.file_name.stat().st_size, len(source_info))
+
+            else:
+                sizes[f"source[{source_prefix}]._info"] = (memprofile.deep_sizeof(source_info), len(source_info))
+
+        sizes['port_info_cache'] = (memprofile.deep_sizeof(self.__PORT_INFO_CACHE), len(self.__PORT_INFO_CACHE))
+
+        installed_ports = getattr(self, 'installed_ports', {})
+        sizes['installed_ports'] = (memprofile.deep_sizeof(installed_ports), len(installed_ports))
+
+        port_attrs = (getattr(self, '_source_port_attrs', {}), getattr(self, '_installed_port_attrs', {}))
+        sizes['port_attrs'] = (memprofile.deep_sizeof(port_attrs), sum(len(attrs) for attrs in port_attrs))
+
+        return sizes
+
+    @tracing.traced()
     def load_info(self, force_load=False):
         self.callback.message("- {}".format(_("Loading Info.")))
         info_file = self.cfg_dir / "ports_info.json"
@@ -327,6 +371,7 @@ class HarbourMaster():
             if porters_data != "{}":
                 self.cfg_data['porters_checked'] = datetime.datetime.now().isoformat()
 
+    @tracing.traced()
     def load_sources(self):
         source_files = list(self.cfg_dir.glob('*.source.json'))
         source_files.sort()
@@ -382,7 +427,6 @@ class HarbourMaster():
 
             self.sources[source_data['prefix']] = source
 
-
     def _get_pm_signature(self, file_name):
         """
         Returns (file_name, original_file_name, port_name)
@@ -530,7 +574,7 @@ class HarbourMaster():
 
         return (self.ports_dir / file_name)
 
-    @timeit
+    @tracing.traced()
     def load_ports(self):
         """
         Find all installed ports, because ports can be installed by zips we need to recheck every time.
@@ -912,6 +956,11 @@ class HarbourMaster():
                 else:
                     logger.warning(f"Unable to dump {str(ports_files[port_name])}: {port_info}")
 
+        ## Build the owner index, this is kept up to date by installing and uninstalling.
+        self._file_owners = {}
+        for port_name, port_info in (*self.broken_ports.items(), *self.installed_ports.items()):
+            self._index_port_files(port_name, port_info)
+
     def port_info_attrs(self, port_info):
         runtime_fix = {
             'godot': 'godot',
@@ -1030,6 +1079,7 @@ class HarbourMaster():
 
         return result
 
+    @tracing.traced()
     def build_port_attrs(self):
         """
         With this function we create a cache of source_port_attrs and installed_port_attrs.
@@ -1116,6 +1166,8 @@ class HarbourMaster():
                     if port_name not in installed_ports:
                         self._installed_port_attrs.setdefault(port_attr, set()).add(port_name)
 
+        memprofile.snapshot('attrs built', once=True)
+
     def list_ports(self, filters=[], sort_by='alphabetical', reverse=False):
         """
         This is deprecated, and overall a really bad idea.
@@ -1455,7 +1507,12 @@ class HarbourMaster():
 
         return None
 
-    def list_runtimes(self):
+    def list_runtimes(self, verify=True):
+        """
+        Returns a list of (runtime_name, runtime_data).
+
+        With verify=False runtimes that have never been checked are left as Unverified, instead of hashing them here.
+        """
         result = []
         changed = False
         for runtime_name, runtime_data in self.runtimes_info.items():
@@ -1475,7 +1532,10 @@ class HarbourMaster():
                 runtime_md5_file = (self.libs_dir / (runtime_name + '.md5'))
                 runtime_local_arch = None
 
-                if runtime_file.is_file():
+                if runtime_file.is_file() and not verify:
+                    runtime_status = 'Unverified'
+
+                elif runtime_file.is_file():
                     runtime_status = 'Unverified'
 
                     runtime_md5_check = hash_file(runtime_file)
@@ -1524,6 +1584,95 @@ class HarbourMaster():
 
         return result
 
+    def runtime_needs_verify(self, runtime_name):
+        """
+        True if an installed runtime has changed, or never been hashed, since runtime_verified was last called.
+        """
+        runtime_file = self.libs_dir / runtime_name
+        runtime_local = self.runtimes_info.get(runtime_name, {}).get('local', {})
+
+        try:
+            runtime_stat = runtime_file.stat()
+
+        except OSError:
+            return False
+
+        return (
+            runtime_local.get('size', None) != runtime_stat.st_size or
+            runtime_local.get('mtime', None) != runtime_stat.st_mtime_ns)
+
+    def runtime_verified(self, runtime_name, md5sum):
+        """
+        Record the md5 of an installed runtime that was hashed elsewhere, returns its new status.
+
+        Call save_config() afterwards to keep it.
+        """
+        runtime_data = self.runtimes_info.get(runtime_name, None)
+        if runtime_data is None:
+            return None
+
+        runtime_file = self.libs_dir / runtime_name
+        runtime_local = runtime_data.get('local', {})
+
+        try:
+            runtime_stat = runtime_file.stat()
+
+        except OSError:
+            runtime_data['local'] = {
+                'status': 'Not Installed',
+                'md5': None,
+                'arch': None,
+                }
+
+            return runtime_data['local']['status']
+
+        runtime_status = 'Broken'
+        runtime_md5 = None
+        runtime_local_arch = None
+
+        ## Like list_runtimes, the <runtime>.md5 written when it was installed comes first.
+        runtime_md5_file = self.libs_dir / (runtime_name + '.md5')
+        runtime_md5_sidecar = None
+        if runtime_md5_file.is_file():
+            ## list_runtimes leaves one that doesn't match its sidecar as Unverified, not Broken.
+            runtime_status = 'Unverified'
+
+            try:
+                runtime_md5_sidecar = runtime_md5_file.read_text().strip().split(' ')[0]
+
+            except OSError:
+                pass
+
+        if md5sum is not None and runtime_md5_sidecar == md5sum:
+            runtime_status = 'Verified'
+            runtime_md5 = md5sum
+            runtime_local_arch = 'aarch64'
+
+        else:
+            for runtime_arch, runtime_remote in runtime_data.get('remote', {}).items():
+                if runtime_remote.get('md5', None) == md5sum:
+                    runtime_status = 'Verified'
+                    runtime_md5 = md5sum
+                    runtime_local_arch = runtime_arch
+                    break
+
+            else:
+                if md5sum is not None and runtime_local.get('md5', None) == md5sum:
+                    ## Matches what we installed, but not what is available now.
+                    runtime_status = 'Update Available'
+                    runtime_md5 = md5sum
+                    runtime_local_arch = runtime_local.get('arch', None)
+
+        runtime_data['local'] = {
+            'status': runtime_status,
+            'md5': runtime_md5,
+            'arch': runtime_local_arch,
+            'size': runtime_stat.st_size,
+            'mtime': runtime_stat.st_mtime_ns,
+            }
+
+        return runtime_status
+
     def set_gcd_mode(self, mode='standard'):
         self.platform.set_gcd_mode(mode)
 
@@ -1533,7 +1682,13 @@ class HarbourMaster():
     def get_gcd_modes(self):
         return self.platform.get_gcd_modes()
 
-    def _fix_permissions(self, path_check=None):
+    def _fix_permissions(self, path_check=None, files=None):
+        """
+        chmod 777 on ext/overlay filesystems.
+
+        If files is given only those files (and their directories below path_check) are changed,
+        otherwise everything in path_check is.
+        """
         if path_check is None:
             path_check = self.ports_dir
 
@@ -1543,14 +1698,42 @@ class HarbourMaster():
         if path_fs not in ('ext4', 'ext3', 'overlay'):
             return
 
-        try:
-            logger.info(f"Fixing permissions for {path_check}.")
-            subprocess.check_output(['chmod', '-R', '777', str(path_check)])
+        if files is None:
+            try:
+                logger.info(f"Fixing permissions for {path_check}.")
+                subprocess.check_output(['chmod', '-R', '777', str(path_check)])
+
+            except subprocess.CalledProcessError as err:
+                logger.error(f"Failed to fix permissions: {err}")
 
-        except subprocess.CalledProcessError as err:
-            logger.error(f"Failed to fix permissions: {err}")
             return
 
+        fix_paths = set()
+        for file_name in files:
+            file_name = Path(file_name)
+
+            try:
+                relative_parts = file_name.relative_to(path_check).parts
+
+            except ValueError:
+                continue
+
+            ## The file itself, plus any directories between it and path_check.
+            for i in range(1, len(relative_parts) + 1):
+                fix_paths.add(path_check.joinpath(*relative_parts[:i]))
+
+        logger.info(f"Fixing permissions for {len(fix_paths)} files in {path_check}.")
+        for fix_path in sorted(fix_paths):
+            ## Like chmod -R, leave symlinks alone.
+            if fix_path.is_symlink() or not fix_path.exists():
+                continue
+
+            try:
+                fix_path.chmod(0o777)
+
+            except OSError as err:
+                logger.error(f"Failed to fix permissions for {fix_path}: {err}")
+
     def _install_theme(self, download_file, do_delete=False):
         """
         Installs a theme file.
@@ -1607,6 +1790,7 @@ class HarbourMaster():
             if (self.cfg_dir / "PortMaster.sh").is_file():
                 (self.cfg_dir / "PortMaster.sh").unlink()
 
+            installed_files = []
             with zipfile.ZipFile(download_file, 'r') as zf:
                 self.callback.message(_("Installing {download_name}.").format(download_name="PortMaster"))
 
@@ -1624,6 +1808,7 @@ class HarbourMaster():
 
                     # cprint(f"- <b>{file_info.filename!r}</b> <d>[{nice_size(file_info.file_size)} ({compress_saving:.0f}%)]</d>")
                     zf.extract(file_info, path=self.tools_dir)
+                    installed_files.append(dest_file)
 
                     if move_bash and dest_file.name.lower().endswith('.sh'):
                         move_bash_dir = self.platform.MOVE_PM_BASH_DIR
@@ -1632,6 +1817,7 @@ class HarbourMaster():
 
                         self.callback.message(f"- moving {dest_file} to {move_bash_dir / dest_file.name}")
                         shutil.move(dest_file, move_bash_dir / dest_file.name)
+                        installed_files[-1] = move_bash_dir / dest_file.name
 
             self.set_gcd_mode(gcd_mode)
 
@@ -1639,7 +1825,7 @@ class HarbourMaster():
 
             self.callback.message_box(_("Port {download_name!r} installed successfully.").format(download_name="PortMaster"))
 
-            self._fix_permissions(self.tools_dir)
+            self._fix_permissions(self.tools_dir, installed_files)
 
         finally:
             if do_delete:
@@ -1654,6 +1840,7 @@ class HarbourMaster():
         We collect a list of top level scripts/directories, this is added to the port.json file.
         """
         undo_data = []
+        installed_files = []
         is_successs = False
 
         port_nice_name = download_info.get('attr', {}).get('title', download_info['name'])
@@ -1678,7 +1865,7 @@ class HarbourMaster():
 
             port_info_file = self.ports_dir / extra_info['port_info_file']
 
-            with zipfile.ZipFile(download_info['zip_file'], 'r') as zf:
+            with zipfile.ZipFile(download_info['zip_file'], 'r') as zf, tracing.span('HarbourMaster.extract', port=download_info['name']):
                 ## TODO: keep a list of installed files for uninstalling?
                 # At this point the port will be installed
                 # Extract all the files to the specified directory
@@ -1729,6 +1916,7 @@ class HarbourMaster():
 
                     # cprint(f"- <b>{file_info.filename!r}</b> as <b>{fix_path}{file_info.filename}</b> <d>[{nice_size(file_info.file_size)} ({compress_saving:.0f}%)]</d>")
                     zf.extract(file_info, path=dest_dir)
+                    installed_files.append(dest_file)
 
             # print(f"Port Info: {port_info}")
             # print(f"Download Info: {download_info}")
@@ -1774,6 +1962,8 @@ class HarbourMaster():
             with open(port_info_file, 'w') as fh:
                 json.dump(port_info, fh, indent=4)
 
+            installed_files.append(port_info_file)
+
             # Remove the zip file if it is in the self.temp_dir
             is_successs = True
 
@@ -1786,6 +1976,16 @@ class HarbourMaster():
                     if gameinfo_xml.is_file():
                         self.platform.gamelist_add(gameinfo_xml)
 
+            ## Swap the old files for the new ones in the owner index, upgrades can drop files.
+            for port_loc in (self.installed_ports, self.broken_ports):
+                old_port_info = port_loc.pop(port_info['name'], None)
+                if old_port_info is not None:
+                    self._unindex_port_files(port_info['name'], old_port_info)
+
+            self.installed_ports[port_info['name']] = port_info
+            self._index_port_files(port_info['name'], port_info)
+            self._invalidate_port_sizes(port_info)
+
             self._port_attrs_updated = True
 
         except HarbourException as err:
@@ -1817,10 +2017,10 @@ class HarbourMaster():
 
                 return 255
 
-        self._fix_permissions()
+        self._fix_permissions(self.ports_dir, installed_files)
 
         if self.ports_dir != self.scripts_dir:
-            self._fix_permissions(self.scripts_dir)
+            self._fix_permissions(self.scripts_dir, installed_files)
 
         # logger.debug(port_info)
         if len(port_info['attr'].get('runtime', [])) > 0:
@@ -1846,6 +2046,7 @@ class HarbourMaster():
 
         return 0
 
+    @tracing.traced()
     def check_runtime(self, runtime, port_name=None, in_install=False):
         if not isinstance(runtime, str):
             return 255
@@ -1994,10 +2195,13 @@ class HarbourMaster():
 
                 runtime_file = download(runtime_file, runtime_url, md5_source=runtime_md5, callback=self.callback)
 
+                runtime_stat = runtime_file.stat()
                 self.runtimes_info[runtime]['local'] = {
                     "arch": self.device['primary_arch'],
                     "md5": runtime_md5,
-                    "status": "Verified"
+                    "status": "Verified",
+                    "size": runtime_stat.st_size,
+                    "mtime": runtime_stat.st_mtime_ns,
                     }
 
                 download_successfull = True
@@ -2034,6 +2238,7 @@ class HarbourMaster():
 
         return 0
 
+    @tracing.traced()
     def install_port(self, port_name, md5_source=None):
         # Special HTTP download code.
         if port_name.startswith('http'):
@@ -2141,100 +2346,174 @@ class HarbourMaster():
         cprint(f"Unable to find a source for <b>{port_name}</b>")
         return 255
 
-    def uninstall_port(self, port_name):
-        port_info = self.installed_ports.get(port_name.casefold(), None)
-        port_loc = self.installed_ports
+    def _index_port_files(self, port_name, port_info):
+        """
+        Add the files of a port to the owner index.
+        """
+        for item in port_info.get('files', {}):
+            if item in ('port.json', ):
+                continue
+
+            for name in get_dict_list(port_info['files'], item):
+                self._file_owners.setdefault(name, set()).add(port_name)
+
+    def _unindex_port_files(self, port_name, port_info):
+        """
+        Remove the files of a port from the owner index.
+        """
+        for item in port_info.get('files', {}):
+            if item in ('port.json', ):
+                continue
 
+            for name in get_dict_list(port_info['files'], item):
+                owners = self._file_owners.get(name, None)
+                if owners is None:
+                    continue
+
+                owners.discard(port_name)
+                if len(owners) == 0:
+                    del self._file_owners[name]
+
+    def _port_size_paths(self, port_info):
+        """
+        The paths on disk of the files and directories a port owns.
+        """
+        paths = []
+        for item in port_info.get('files', {}):
+            if item in ('port.json', ):
+                continue
+
+            for name in get_dict_list(port_info['files'], item):
+                for base_dir in (self.ports_dir, self.scripts_dir):
+                    path = base_dir / name
+                    if path not in paths and path.exists():
+                        paths.append(path)
+
+        return paths
+
+    def _invalidate_port_sizes(self, port_info):
+        for item in port_info.get('files', {}):
+            if item in ('port.json', ):
+                continue
+
+            for name in get_dict_list(port_info['files'], item):
+                self.dir_sizes.invalidate(self.ports_dir / name)
+                self.dir_sizes.invalidate(self.scripts_dir / name)
+
+    def port_install_size(self, port_name):
+        """
+        Returns the size in bytes of an installed port, or None if it isn't installed.
+        """
+        port_info = self.installed_ports.get(port_name.casefold(), None)
         if port_info is None:
             port_info = self.broken_ports.get(port_name.casefold(), None)
-            port_loc = self.broken_ports
 
             if port_info is None:
-                self.callback.message_box(_("Unknown port {port_name}").format(port_name=port_name))
-                logger.error(f"Unknown port {port_name}")
-                return 255
+                return None
 
-        port_info_name = port_info.get("attr", {}).get("title", port_name)
+        return sum(
+            self.dir_sizes.size(path)
+            for path in self._port_size_paths(port_info))
 
-        all_items = {}
+    def uninstall_port(self, port_name):
+        return self.uninstall_ports([port_name])
+
+    @tracing.traced()
+    def uninstall_ports(self, port_names):
+        """
+        Uninstall one or more ports.
+
+        Files shared between ports are only removed along with their last owner.
+        """
+        uninstall_ports = []
+        seen_ports = set()
+
+        for port_name in port_names:
+            ## The same port twice, in any case, is only uninstalled once.
+            if port_name.casefold() in seen_ports:
+                continue
+
+            seen_ports.add(port_name.casefold())
+
+            port_info = self.installed_ports.get(port_name.casefold(), None)
+            port_loc = self.installed_ports
+
+            if port_info is None:
+                port_info = self.broken_ports.get(port_name.casefold(), None)
+                port_loc = self.broken_ports
+
+                if port_info is None:
+                    self.callback.message_box(_("Unknown port {port_name}").format(port_name=port_name))
+                    logger.error(f"Unknown port {port_name}")
+                    return 255
+
+            uninstall_ports.append((port_name, port_info, port_loc))
 
         self._port_attrs_updated = True
 
-        # We need to build up a list of all associated files
-        # so we only delete the ones that will no longer be associaed with any ports.
-        for item_name, item_info in self.installed_ports.items():
-            # Add all the root dirs/scripts in the port
-            for item in item_info['files']:
-                if item in ('port.json', ):
-                    continue
+        for port_name, port_info, port_loc in uninstall_ports:
+            port_info_name = port_info.get("attr", {}).get("title", port_name)
 
-                for name in get_dict_list(item_info['files'], item):
-                    add_dict_list_unique(all_items, name, item_name)
+            try:
+                self._uninstall_port(port_name, port_info, port_info_name)
 
-        for item_name, item_info in self.broken_ports.items():
-            # Add all the root dirs/scripts in the port
-            for item in item_info['files']:
-                if item in ('port.json', ):
-                    continue
+            except OSError as err:
+                self.callback.message_box(_("Error uninstalling {port_name}\n\n{error}").format(port_name=port_info_name, error=str(err)))
+                return 1
 
-                for name in get_dict_list(item_info['files'], item):
-                    add_dict_list_unique(all_items, name, item_name)
+            finally:
+                self._unindex_port_files(port_name.casefold(), port_info)
+                self._invalidate_port_sizes(port_info)
+                del port_loc[port_name.casefold()]
 
-        # from pprint import pprint
-        # pprint(all_items)
+        if len(uninstall_ports) == 1:
+            self.callback.message_box(_("Successfully uninstalled {port_name}").format(port_name=port_info_name))
 
-        # cprint(f"{all_items}")
-        cprint(f"Uninstalling <b>{port_info_name}</b>")
-        self.callback.message(_("Removing {port_name}").format(port_name=port_info_name))
+        else:
+            self.callback.message_box(_("Successfully uninstalled {count} ports").format(count=len(uninstall_ports)))
+
+        return 0
 
+    def _uninstall_port(self, port_name, port_info, port_info_name):
         all_port_items = []
         for port_file in port_info['files']:
             all_port_items.extend(get_dict_list(port_info['files'], port_file))
 
-        ports_dir = self.ports_dir
+        cprint(f"Uninstalling <b>{port_info_name}</b>")
+        self.callback.message(_("Removing {port_name}").format(port_name=port_info_name))
 
         uninstall_items = [
             item
             for item in all_port_items
             # Only delete files/scripts with only 1 owner.
-            if len(get_dict_list(all_items, item)) == 1]
+            if len(self._file_owners.get(item, ())) == 1]
 
         self.platform.port_uninstall(port_name, port_info, all_port_items)
 
-        try:
-            for item in uninstall_items:
-                item_path = self.ports_dir / item
-
-                if item_path.exists():
-                    cprint(f"- removing {item}")
-                    self.callback.message(f"- {item}")
+        for item in uninstall_items:
+            item_path = self.ports_dir / item
 
-                    if item_path.is_dir():
-                        shutil.rmtree(item_path)
+            if item_path.exists():
+                cprint(f"- removing {item}")
+                self.callback.message(f"- {item}")
 
-                    elif item_path.is_file():
-                        item_path.unlink()
+                if item_path.is_dir():
+                    shutil.rmtree(item_path)
 
-                item_path = self.scripts_dir / item
+                elif item_path.is_file():
+                    item_path.unlink()
 
-                if item_path.exists():
-                    cprint(f"- removing {item}")
-                    self.callback.message(f"- {item}")
+            item_path = self.scripts_dir / item
 
-                    if item_path.is_dir():
-                        shutil.rmtree(item_path)
+            if item_path.exists():
+                cprint(f"- removing {item}")
+                self.callback.message(f"- {item}")
 
-                    elif item_path.is_file():
-                        item_path.unlink()
+                if item_path.is_dir():
+                    shutil.rmtree(item_path)
 
-        except OSError as err:
-            self.callback.message_box(_("Error uninstalling {port_name}\n\n{error}").format(port_name=port_info_name, error=str(err)))
-            del port_loc[port_name.casefold()]
-            return 1
-
-        finally:
-            self.callback.message_box(_("Successfully uninstalled {port_name}").format(port_name=port_info_name))
-            return 0
+                elif item_path.is_file():
+                    item_path.unlink()
 
     def portmd(self, port_info):
         def nice_value(value):
@@ -250,25 +250,26 @@ def cpu_info_v2(info):
         info['primary_arch'] = "aarch64"
 
 
+GLIBC_LIB_PATHS = [
+    # Most likely
+    '/lib/',
+    '/lib64/',
+    '/lib/aarch64-linux-gnu/',
+    '/lib32/',
+    '/lib/arm-linux-gnueabihf/',
+    # Least likely
+    '/usr/lib/',
+    '/usr/lib64/',
+    '/usr/lib32/',
+    ]
+
+
 _GLIBC_VER=None
 def get_glibc_version():
     global _GLIBC_VER
 
-    lib_paths = [
-        # Most likely
-        '/lib/',
-        '/lib64/',
-        '/lib/aarch64-linux-gnu/',
-        '/lib32/',
-        '/lib/arm-linux-gnueabihf/',
-        # Least likely
-        '/usr/lib/',
-        '/usr/lib64/',
-        '/usr/lib32/',
-        ]
-
     if _GLIBC_VER is None:
-        for lib_path in lib_paths:
+        for lib_path in GLIBC_LIB_PATHS:
             libc_path = Path(lib_path) / 'libc.so.6'
 
             if not libc_path.is_file():
@@ -682,14 +683,155 @@ def expand_info(info, override_resolution=None, override_ram=None, use_old_cpu_i
     return info
 
 
+################################################################################
+## Device info cache
+DEVICE_CACHE_VERSION = 1
+DEVICE_CACHE_FILE = HM_TOOLS_DIR / "PortMaster" / "config" / "device_cache.json"
+
+## Everything new_device_info, old_device_info and get_glibc_version look at.
+DEVICE_MARKER_FILES = [
+    '/var/config/retrodeck/retrodeck.cfg',
+    '~/.var/app/net.retrodeck.retrodeck/config/retrodeck/retrodeck.cfg',
+    '/opt/muos/config/version.txt',
+    '/opt/muos/config/system/version',
+    '/opt/muos/config/device.txt',
+    '/opt/muos/device/config/board/name',
+    '/usr/trimui',
+    '/usr/trimui/res/lang/en.lang',
+    '/etc/version',
+    '~/.config/.DEVICE',
+    '/usr/share/plymouth/themes/text.plymouth',
+    '/usr/miyoo/version',
+    '/sys/firmware/devicetree/base/model',
+    '/storage/.config/device',
+    '/etc/os-release',
+    '/usr/share/batocera/batocera.version',
+    '/boot/boot/batocera.board',
+    '/usr/share/reglinux/system.version',
+    '/boot/boot/system.board',
+    '/dev/input/by-path/platform-ff300000.usb-usb-0:1.2:1.0-event-joystick',
+    '/dev/input/by-path/platform-odroidgo2-joypad-event-joystick',
+    '/dev/input/by-path/platform-odroidgo3-joypad-event-joystick',
+    '/dev/input/by-path/platform-gameforce-gamepad-event-joystick',
+    '/boot/rk3326-rg351v-linux.dtb',
+    '/storage/.config/.OS_ARCH',
+    '/etc/emulationstation/es_input.cfg',
+    '/opt/.retrooz/device',
+    ] + [
+    f"{lib_path}libc.so.6"
+    for lib_path in GLIBC_LIB_PATHS
+    ]
+
+
+def _marker_mtime(file_name):
+    try:
+        return os.stat(os.path.expanduser(file_name)).st_mtime_ns
+
+    except OSError:
+        return None
+
+
+def device_fingerprint():
+    """
+    Cheap to build, if this matches the cached one we don't need to probe the device again.
+
+    It changes on every reboot, and whenever any of the marker files (or this file) change.
+    """
+    return {
+        'version': DEVICE_CACHE_VERSION,
+        'boot_id': safe_cat('/proc/sys/kernel/random/boot_id').strip(),
+        'markers': {
+            file_name: _marker_mtime(file_name)
+            for file_name in DEVICE_MARKER_FILES + [__file__]
+            },
+        }
+
+
+def device_cache_load(fingerprint):
+    if not DEVICE_CACHE_FILE.is_file():
+        return None
+
+    try:
+        with open(DEVICE_CACHE_FILE, 'r') as fh:
+            cache_data = json.load(fh)
+
+    except (OSError, ValueError) as err:
+        logger.warning(f"Unable to load device cache: {err}")
+        return None
+
+    if not isinstance(cache_data, dict) or cache_data.get('fingerprint') != fingerprint:
+        return None
+
+    return cache_data
+
+
+def device_cache_save(fingerprint, info, glibc):
+    temp_file = DEVICE_CACHE_FILE.with_suffix(".tmp")
+
+    try:
+        DEVICE_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(temp_file, 'w') as fh:
+            json.dump({
+                'fingerprint': fingerprint,
+                'device': info,
+                'glibc': glibc,
+                }, fh, indent=4)
+
+        temp_file.replace(DEVICE_CACHE_FILE)
+
+    except OSError as err:
+        logger.warning(f"Unable to save device cache: {err}")
+
+        if temp_file.is_file():
+            temp_file.unlink()
+
+
+def cached_device_info():
+    """
+    new_device_info() and the glibc version, cached in DEVICE_CACHE_FILE until the fingerprint changes.
+    """
+    global _GLIBC_VER
+
+    if HM_TESTING:
+        return new_device_info()
+
+    fingerprint = device_fingerprint()
+    cache_data = device_cache_load(fingerprint)
+
+    if cache_data is not None:
+        logger.debug("Using cached device info.")
+        _GLIBC_VER = cache_data['glibc']
+        return cache_data['device']
+
+    info = new_device_info()
+    device_cache_save(fingerprint, info, get_glibc_version())
+
+    return info
+
+
 __root_info = None
+def refresh_device_info():
+    """
+    Forgets everything we know about the device, used by --refresh-device.
+    """
+    global __root_info
+    global _GLIBC_VER
+
+    __root_info = None
+    _GLIBC_VER = None
+
+    if DEVICE_CACHE_FILE.is_file():
+        DEVICE_CACHE_FILE.unlink()
+
+
 def device_info(override_device=None, override_resolution=None):
     global __root_info
     if override_device is None and override_resolution is None and __root_info is not None:
         return __root_info
 
     # Best guess at what device we are running on, and what it is capable of.
-    info = new_device_info()
+    info = cached_device_info()
 
     if override_device is not None:
         info['device'] = override_device
@@ -713,6 +855,7 @@ __all__ = (
     'device_info',
     'expand_info',
     'find_device_by_resolution',
+    'refresh_device_info',
     'HW_INFO',
     'DEVICES',
     )
@@ -5,6 +5,7 @@
 import pathlib
 
 # Included imports
+import tracing
 import utility
 
 from loguru import logger
@@ -249,7 +250,7 @@ def port_info_load(raw_info, source_name=None, do_default=False):
     return port_info
 
 
-@timeit
+@tracing.traced()
 def port_info_merge(port_info, other):
     if isinstance(other, (str, pathlib.PurePath)):
         other_info = port_info_load(other)
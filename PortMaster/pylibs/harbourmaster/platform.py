@@ -27,6 +27,134 @@ from .util import *
 
 SPECIAL_GAMELIST_CODE = object()
 
+
+def parse_gameinfo(gameinfo_file):
+    """
+    Returns the parsed gameinfo.xml, or None if it is broken so the caller can skip it.
+    """
+    try:
+        return ET.parse(gameinfo_file)
+
+    except (ET.ParseError, OSError) as err:
+        logger.error(f"Unable to read {gameinfo_file}: {err}")
+        return None
+
+
+class GamelistSession():
+    """
+    A parsed gamelist.xml with its games indexed by path, used by PlatformBase.gamelist_session.
+    """
+
+    def __init__(self, platform, gamelist_xml):
+        self.platform = platform
+        self.gamelist_xml = gamelist_xml
+        self.changed = False
+        self.finished = False
+        self.files = FileSync()
+
+        self._root = None
+        self._games = {}
+
+        if gamelist_xml in (None, SPECIAL_GAMELIST_CODE):
+            return
+
+        self._root = ET.parse(gamelist_xml).getroot()
+
+        for game_element in self._root.iter('game'):
+            path_element = game_element.find('path')
+            if path_element is None:
+                continue
+
+            ## First one wins, same as find() did.
+            self._games.setdefault(path_element.text, game_element)
+
+    def _fix_path(self, text):
+        new_path = text.strip()
+        if new_path.startswith('./'):
+            new_path = new_path[2:]
+
+        return str(self.platform.hm.ports_dir / new_path)
+
+    def add(self, gameinfo_file):
+        """
+        Merges gameinfo_file into the gamelist, returns False if it couldn't be.
+        """
+        if self._root is None:
+            return True
+
+        gameinfo_tree = parse_gameinfo(gameinfo_file)
+        if gameinfo_tree is None:
+            return False
+
+        try:
+            self._merge(gameinfo_tree)
+
+        except Exception as err:
+            logger.error(f"Unable to merge {gameinfo_file}: {err}")
+            return False
+
+        finally:
+            ## Games merged before an error are still in the tree.
+            self.changed = True
+
+        return True
+
+    def _merge(self, gameinfo_tree):
+        platform = self.platform
+        FIX_PATH = platform.hm.ports_dir != platform.hm.scripts_dir
+
+        for gameinfo_element in gameinfo_tree.findall('game'):
+            path_merge = gameinfo_element.find('path').text
+
+            gamelist_update = self._games.get(path_merge, None)
+            if gamelist_update is None:
+                # Create a new game element
+                gamelist_update = ET.SubElement(self._root, 'game')
+                self._games[path_merge] = gamelist_update
+
+            logger.info(f'{path_merge}: ')
+
+            for child in gameinfo_element:
+                # Check if the child element is in the predefined list
+                if child.tag in platform.XML_ELEMENT_MAP:
+                    gamelist_element = gamelist_update.find(platform.XML_ELEMENT_MAP[child.tag])
+
+                    if gamelist_element is None:
+                        gamelist_element = ET.SubElement(gamelist_update, platform.XML_ELEMENT_MAP[child.tag])
+
+                    if FIX_PATH and child.tag in platform.XML_PATH_FIX:
+                        gamelist_element.text = self._fix_path(child.text)
+
+                    else:
+                        gamelist_element.text = child.text
+
+            for child in gameinfo_element:
+                if child.tag in platform.XML_ELEMENT_CALLBACK:
+                    if FIX_PATH and child.tag in platform.XML_PATH_FIX:
+                        child.text = self._fix_path(child.text)
+
+                    platform.XML_ELEMENT_CALLBACK[child.tag](path_merge, gamelist_update, child)
+
+    def save(self):
+        if self._root is None or not self.changed:
+            return
+
+        if hasattr(ET, 'indent'):
+            ET.indent(self._root, space="  ", level=0)
+
+        ## Write it next to the real one and swap it in, so it is never left half written.
+        gamelist_tmp = self.gamelist_xml.with_name(self.gamelist_xml.name + '.tmp')
+
+        with open(gamelist_tmp, 'w') as fh:
+            print("<?xml version='1.0' encoding='utf-8'?>", file=fh)
+            print("", file=fh)
+            print(ET.tostring(self._root, encoding='unicode'), file=fh)
+
+        os.replace(gamelist_tmp, self.gamelist_xml)
+
+        self.platform.added_ports.add('GAMELIST UPDATER')
+        self.changed = False
+
 class PlatformBase():
     WANT_XBOX_FIX = False
     WANT_SWAP_BUTTONS = False
@@ -61,6 +189,7 @@ class PlatformBase():
         self.hm = hm
         self.added_ports = set()
         self.removed_ports = set()
+        self._gamelist_session = None
 
     def loaded(self):
         ...
@@ -130,70 +259,48 @@ class PlatformBase():
             self._GAMELIST_BACKUP -= 1
             return
 
-    def gamelist_add(self, gameinfo_file):
-        if not gameinfo_file.is_file():
+    @contextlib.contextmanager
+    def gamelist_session(self):
+        """
+        Batches up gamelist_add calls, gamelist.xml is parsed once and written once when the outermost session ends.
+        """
+        if self._gamelist_session is not None:
+            yield self._gamelist_session
             return
 
-        FIX_PATH = self.hm.ports_dir != self.hm.scripts_dir
-
         with self.gamelist_backup() as gamelist_xml:
-            if gamelist_xml is None:
-                return
-
-            gamelist_tree = ET.parse(gamelist_xml)
-            gamelist_root = gamelist_tree.getroot()
-
-            gameinfo_tree = ET.parse(gameinfo_file)
-            gameinfo_root = gameinfo_tree.getroot()
+            session = GamelistSession(self, gamelist_xml)
+            self._gamelist_session = session
 
-            for gameinfo_element in gameinfo_tree.findall('game'):
-                path_merge = gameinfo_element.find('path').text
-
-                gamelist_update = gamelist_root.find(f'.//game[path="{path_merge}"]')
-                if gamelist_update is None:
-                    # Create a new game element
-                    gamelist_update = ET.SubElement(gamelist_root, 'game')
-
-                logger.info(f'{path_merge}: ')
-
-                for child in gameinfo_element:
-                    # Check if the child element is in the predefined list
-                    if child.tag in self.XML_ELEMENT_MAP:
-                        gamelist_element = gamelist_update.find(self.XML_ELEMENT_MAP[child.tag])
-
-                        if gamelist_element is None:
-                            gamelist_element = ET.SubElement(gamelist_update, self.XML_ELEMENT_MAP[child.tag])
-
-                        if FIX_PATH and child.tag in self.XML_PATH_FIX:
-                            new_path = child.text.strip()
-                            if new_path.startswith('./'):
-                                new_path = new_path[2:]
-
-                            gamelist_element.text = str(self.hm.ports_dir / new_path)
-
-                        else:
-                            gamelist_element.text = child.text
+            try:
+                yield session
 
-                for child in gameinfo_element:
-                    if child.tag in self.XML_ELEMENT_CALLBACK:
-                        if FIX_PATH and child.tag in self.XML_PATH_FIX:
-                            new_path = child.text.strip()
-                            if new_path.startswith('./'):
-                                new_path = new_path[2:]
+                session.files.wait()
+                session.save()
+                session.finished = True
 
-                            child.text = str(self.hm.ports_dir / new_path)
+            finally:
+                self._gamelist_session = None
+                session.files.close()
 
-                        self.XML_ELEMENT_CALLBACK[child.tag](path_merge, gamelist_update, child)
+    @contextlib.contextmanager
+    def file_sync(self):
+        """
+        The FileSync of the running gamelist session, or a new one for just this.
+        """
+        if self._gamelist_session is not None:
+            yield self._gamelist_session.files
+            return
 
-            if hasattr(ET, 'indent'):
-                ET.indent(gamelist_root, space="  ", level=0)
+        with FileSync() as files:
+            yield files
 
-            with open(gamelist_xml, 'w') as fh:
-                print("<?xml version='1.0' encoding='utf-8'?>", file=fh)
-                print("", file=fh)
-                print(ET.tostring(gamelist_root, encoding='unicode'), file=fh)
+    def gamelist_add(self, gameinfo_file):
+        if not gameinfo_file.is_file():
+            return
 
-            self.added_ports.add('GAMELIST UPDATER')
+        with self.gamelist_session() as session:
+            return session.add(gameinfo_file)
 
     def ports_changed(self):
         return (len(self.added_ports) > 0 or len(self.removed_ports) > 0)
@@ -683,11 +790,14 @@ class PlatformmuOS(PlatformBase):
         INFO_PREVIEW_DIR = INFO_CATALOG / "preview"
         INFO_TEXT_DIR    = INFO_CATALOG / "text"
 
-        with self.gamelist_backup() as gamelist_xml:
+        with self.gamelist_backup() as gamelist_xml, self.file_sync() as files:
             if gamelist_xml is None:
                 return
 
-            gameinfo_tree = ET.parse(gameinfo_file)
+            gameinfo_tree = parse_gameinfo(gameinfo_file)
+            if gameinfo_tree is None:
+                return False
+
             gameinfo_root = gameinfo_tree.getroot()
 
             for gameinfo_element in gameinfo_tree.findall('game'):
@@ -716,8 +826,8 @@ class PlatformmuOS(PlatformBase):
                             continue
 
                         target_file = INFO_BOX_DIR / (path_merge + '-pre' + image_file.suffix)
-                        logger.debug(f"copying {str(image_file)} to {str(target_file)}")
-                        shutil.copy(image_file, target_file)
+                        logger.debug(f"syncing {str(image_file)} to {str(target_file)}")
+                        files.copy(image_file, target_file)
 
                         screenshot_file = None
                         if (image_file.parent / 'screenshot.jpg').is_file():
@@ -728,16 +838,15 @@ class PlatformmuOS(PlatformBase):
 
                         if screenshot_file:
                             target_file = INFO_PREVIEW_DIR / (path_merge + '-pre' + image_file.suffix)
-                            logger.debug(f"copying {str(screenshot_file)} to {str(target_file)}")
-                            shutil.copy(screenshot_file, target_file)
+                            logger.debug(f"syncing {str(screenshot_file)} to {str(target_file)}")
+                            files.copy(screenshot_file, target_file)
 
                     elif child.tag == 'desc':
                         target_file = INFO_TEXT_DIR / (path_merge + '.txt')
                         text = child.text.strip().split('\n', 1)[0].strip()
 
-                        logger.debug(f"creating {str(target_file)}")
-                        with open(target_file, 'w') as fh:
-                            print(text, file=fh)
+                        logger.debug(f"syncing {str(target_file)}")
+                        files.write_text(target_file, text + '\n')
 
             # HAHA THIS IS FUCKED
             self.added_ports.add('GAMELIST UPDATER')
@@ -862,19 +971,20 @@ class PlatformTrimUI(PlatformBase):
 
         port_mode = self.hm.cfg_data.get('trimui-port-mode', 'roms')
 
-        if port_mode == 'roms':
-            target_file = ROM_SCRIPT_DIR / (port_script.name)
-            logger.debug(f"Copying {str(port_script)} to {str(target_file)}")
-            shutil.copy(port_script, target_file)
+        with self.file_sync() as files:
+            if port_mode == 'roms':
+                target_file = ROM_SCRIPT_DIR / (port_script.name)
+                logger.debug(f"Syncing {str(port_script)} to {str(target_file)}")
+                files.copy(port_script, target_file)
 
-        elif port_mode == 'ports':
-            new_port_dir = PORT_DIR / f"portmaster-{name_cleaner(port_script.stem)}"
+            elif port_mode == 'ports':
+                new_port_dir = PORT_DIR / f"portmaster-{name_cleaner(port_script.stem)}"
 
-            new_port_dir.mkdir(0o755, parents=True, exist_ok=True)
+                new_port_dir.mkdir(0o755, parents=True, exist_ok=True)
 
-            logger.debug(f"Creating {str(new_port_dir / 'config.json')}")
-            with open(new_port_dir / "config.json", "w") as fh:
-                fh.write(
+                logger.debug(f"Syncing {str(new_port_dir / 'config.json')}")
+                files.write_text(
+                    new_port_dir / "config.json",
                     PORT_CONFIG_JSON
                     .replace("{{PORTTITLE}}", port_script.stem)
                     .replace("{{PORTNAME}}", new_port_dir.name.lower())
@@ -918,24 +1028,26 @@ class PlatformTrimUI(PlatformBase):
 
                 port_file.unlink()
 
-        for port_script in self.hm.ports_dir.iterdir():
-            # Do scripts
-            if not port_script.is_file():
-                continue
+        ## One session, so unchanged scripts and images are skipped and the rest are copied in parallel.
+        with self.gamelist_session():
+            for port_script in self.hm.ports_dir.iterdir():
+                # Do scripts
+                if not port_script.is_file():
+                    continue
 
-            self.add_port_script(port_script)
+                self.add_port_script(port_script)
 
-        for port_dir in self.hm.ports_dir.iterdir():
-            # Fill it out with gameinfo if available.
-            if not port_dir.is_dir():
-                continue
+            for port_dir in self.hm.ports_dir.iterdir():
+                # Fill it out with gameinfo if available.
+                if not port_dir.is_dir():
+                    continue
 
-            gameinfo_file = port_dir / 'gameinfo.xml'
+                gameinfo_file = port_dir / 'gameinfo.xml'
 
-            if not gameinfo_file.is_file():
-                continue
+                if not gameinfo_file.is_file():
+                    continue
 
-            self.gamelist_add(gameinfo_file)
+                self.gamelist_add(gameinfo_file)
 
     def gamelist_file(self):
         return SPECIAL_GAMELIST_CODE
@@ -954,11 +1066,14 @@ class PlatformTrimUI(PlatformBase):
 
         self.added_ports.add('GAMELIST UPDATER')
 
-        with self.gamelist_backup() as gamelist_xml:
+        with self.gamelist_backup() as gamelist_xml, self.file_sync() as files:
             if gamelist_xml is None:
                 return
 
-            gameinfo_tree = ET.parse(gameinfo_file)
+            gameinfo_tree = parse_gameinfo(gameinfo_file)
+            if gameinfo_tree is None:
+                return False
+
             gameinfo_root = gameinfo_tree.getroot()
 
             for gameinfo_element in gameinfo_tree.findall('game'):
@@ -1001,31 +1116,31 @@ class PlatformTrimUI(PlatformBase):
                 if port_mode == 'roms':
                     if image_file is not None:
                         target_file = ROM_IMAGE_DIR / (port_script_file.stem + "-pre" + image_file.suffix)
-                        logger.debug(f"Copying {str(image_file)} to {str(target_file)}")
-                        shutil.copy(image_file, target_file)
+                        logger.debug(f"Syncing {str(image_file)} to {str(target_file)}")
+                        files.copy(image_file, target_file)
 
                     target_file = ROM_SCRIPT_DIR / (port_script_file.name)
-                    logger.debug(f"Copying {str(port_script_file)} to {str(target_file)}")
-                    shutil.copy(port_script_file, target_file)
+                    logger.debug(f"Syncing {str(port_script_file)} to {str(target_file)}")
+                    files.copy(port_script_file, target_file)
 
                 elif port_mode == 'ports':
                     new_port_dir = PORT_DIR / f"portmaster-{name_cleaner(port_script_file.stem)}"
 
                     new_port_dir.mkdir(0o755, parents=True, exist_ok=True)
 
-                    logger.debug(f"Creating {str(new_port_dir / 'config.json')}")
-                    with open(new_port_dir / "config.json", "w") as fh:
-                        fh.write(
-                            PORT_CONFIG_JSON
-                            .replace("{{PORTTITLE}}", port_title)
-                            .replace("{{PORTNAME}}", new_port_dir.name.lower())
-                            ## A-PEH ESC-A-PEH
-                            .replace("{{PORTSCRIPT}}", str(port_script_file).replace(' ', '\\\\ ')))
+                    logger.debug(f"Syncing {str(new_port_dir / 'config.json')}")
+                    files.write_text(
+                        new_port_dir / "config.json",
+                        PORT_CONFIG_JSON
+                        .replace("{{PORTTITLE}}", port_title)
+                        .replace("{{PORTNAME}}", new_port_dir.name.lower())
+                        ## A-PEH ESC-A-PEH
+                        .replace("{{PORTSCRIPT}}", str(port_script_file).replace(' ', '\\\\ ')))
 
                     if image_file is not None:
                         target_file = new_port_dir / ("icon-pre" + image_file.suffix)
-                        logger.debug(f"Copying {str(image_file)} to {str(target_file)}")
-                        shutil.copy(image_file, target_file)
+                        logger.debug(f"Syncing {str(image_file)} to {str(target_file)}")
+                        files.copy(image_file, target_file)
 
 
 class PlatformMiyoo(PlatformBase):
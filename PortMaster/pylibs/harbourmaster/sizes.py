@@ -0,0 +1,273 @@
+
+# SPDX-License-Identifier: MIT
+
+"""
+Cached directory sizes, so install sizes don't need every file under a port stat'd every time.
+
+Each directory is stored with its mtime, the total size of the files directly in it and its sub directories.
+Adding, removing or renaming anything in a directory changes its mtime, so only changed directories get
+scanned again. Files rewritten in place don't, so installs and uninstalls call invalidate() on what they touch.
+"""
+
+# System imports
+import collections
+import json
+import os
+import threading
+
+from pathlib import Path
+
+# Included imports
+
+from loguru import logger
+
+
+class DirectorySizes():
+    CACHE_VERSION = 1
+
+    def __init__(self, cache_file=None):
+        self.cache_file = cache_file is not None and Path(cache_file) or None
+
+        ## path -> [mtime_ns, size of files, [sub directory names]]
+        self._dirs = {}
+        self._dirty = False
+
+        ## Finished background scans, path -> total size.
+        self._results = {}
+        self._done = []
+        self._generation = 0
+
+        self._lock = threading.RLock()
+        self._queue = collections.deque()
+        self._thread = None
+
+        self.load()
+
+    def load(self):
+        if self.cache_file is None or not self.cache_file.is_file():
+            return
+
+        try:
+            with self.cache_file.open('r') as fh:
+                data = json.load(fh)
+
+            if data.get('version', None) == self.CACHE_VERSION:
+                self._dirs = data['dirs']
+
+        except (OSError, ValueError, KeyError, AttributeError) as err:
+            logger.warning(f"Unable to load {self.cache_file}: {err}")
+
+    def save(self):
+        if self.cache_file is None:
+            return
+
+        with self._lock:
+            if not self._dirty:
+                return
+
+            data = {
+                'version': self.CACHE_VERSION,
+                'dirs': dict(self._dirs),
+                }
+
+            self._dirty = False
+
+        tmp_file = self.cache_file.with_name(self.cache_file.name + '.tmp')
+        try:
+            with tmp_file.open('w') as fh:
+                json.dump(data, fh, indent=4)
+
+            tmp_file.replace(self.cache_file)
+
+        except OSError as err:
+            logger.warning(f"Unable to save {self.cache_file}: {err}")
+
+    def _forget(self, path):
+        ## Drop path and everything cached under it.
+        prefix = path + os.sep
+
+        for cached_path in [
+                cached_path
+                for cached_path in self._dirs
+                if cached_path == path or cached_path.startswith(prefix)]:
+            del self._dirs[cached_path]
+            self._dirty = True
+
+    def _scan_dir(self, path):
+        mtime_ns = os.stat(path).st_mtime_ns
+
+        with self._lock:
+            cached = self._dirs.get(path, None)
+
+            if cached is not None and cached[0] == mtime_ns:
+                return cached[1], cached[2]
+
+        files_size = 0
+        sub_dirs = []
+
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        sub_dirs.append(entry.name)
+
+                    elif entry.is_file(follow_symlinks=False):
+                        files_size += entry.stat(follow_symlinks=False).st_size
+
+                except OSError:
+                    continue
+
+        with self._lock:
+            if cached is not None:
+                for sub_dir in set(cached[2]) - set(sub_dirs):
+                    self._forget(os.path.join(path, sub_dir))
+
+            self._dirs[path] = [mtime_ns, files_size, sub_dirs]
+            self._dirty = True
+
+        return files_size, sub_dirs
+
+    def size(self, path):
+        """
+        Returns the size of path in bytes, scanning any directories that have changed.
+        """
+        path = os.path.abspath(os.fspath(path))
+
+        if not os.path.isdir(path):
+            try:
+                return os.stat(path).st_size
+
+            except OSError:
+                return 0
+
+        total_size = 0
+        stack = [path]
+
+        while len(stack) > 0:
+            dir_path = stack.pop()
+
+            try:
+                files_size, sub_dirs = self._scan_dir(dir_path)
+
+            except OSError:
+                with self._lock:
+                    self._forget(dir_path)
+
+                continue
+
+            total_size += files_size
+            stack.extend(
+                os.path.join(dir_path, sub_dir)
+                for sub_dir in sub_dirs)
+
+        return total_size
+
+    def cached_size(self, path):
+        """
+        Returns the last known size of path without touching the disk, or None.
+        """
+        path = os.path.abspath(os.fspath(path))
+
+        with self._lock:
+            if path in self._results:
+                return self._results[path]
+
+            if path not in self._dirs:
+                return None
+
+            total_size = 0
+            stack = [path]
+
+            while len(stack) > 0:
+                dir_path = stack.pop()
+                cached = self._dirs.get(dir_path, None)
+
+                if cached is None:
+                    continue
+
+                total_size += cached[1]
+                stack.extend(
+                    os.path.join(dir_path, sub_dir)
+                    for sub_dir in cached[2])
+
+            return total_size
+
+    def invalidate(self, path):
+        """
+        Forget about path, call this after changing files under it.
+        """
+        path = os.path.abspath(os.fspath(path))
+
+        with self._lock:
+            self._forget(path)
+            self._results.pop(path, None)
+            self._generation += 1
+
+            for result_path in list(self._results):
+                if path.startswith(result_path + os.sep):
+                    del self._results[result_path]
+
+    def lookup(self, path):
+        """
+        Returns (size, is_final) for path.
+
+        If it hasn't been checked since startup this queues it for the background thread, and returns the
+        cached size (or 0) with is_final False. Finished scans are picked up with poll().
+        """
+        path = os.path.abspath(os.fspath(path))
+
+        with self._lock:
+            if path in self._results:
+                return self._results[path], True
+
+            if path not in self._queue:
+                self._queue.append(path)
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="DirectorySizes", daemon=True)
+                self._thread.start()
+
+        return self.cached_size(path) or 0, False
+
+    def poll(self):
+        """
+        Returns a list of (path, size) for background scans that finished since the last call.
+        """
+        with self._lock:
+            done, self._done = self._done, []
+
+        return done
+
+    @property
+    def busy(self):
+        return self._thread is not None or len(self._done) > 0
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if len(self._queue) == 0:
+                    self._thread = None
+                    break
+
+                path = self._queue[0]
+                generation = self._generation
+
+            total_size = self.size(path)
+
+            with self._lock:
+                if generation != self._generation:
+                    ## Something was invalidated mid scan, go again.
+                    continue
+
+                if len(self._queue) > 0 and self._queue[0] == path:
+                    self._queue.popleft()
+
+                self._results[path] = total_size
+                self._done.append((path, total_size))
+
+        self.save()
+
+
+__all__ = (
+    'DirectorySizes',
+    )
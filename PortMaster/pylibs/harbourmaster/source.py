@@ -3,24 +3,38 @@
 
 # System imports
 import datetime
+import hashlib
 import json
 import re
+import shutil
 import zipfile
+import zlib
 
 from gettext import gettext as _
 from pathlib import Path
 from urllib.parse import urlparse, urlunparse
 
 # Included imports
+import tracing
 
 from loguru import logger
 from utility import cprint, cstrip
 
 # Module imports
+from .catalogue import *
 from .config import *
 from .info import *
 from .util import *
 
+def catalogue_entry_md5(entry):
+    """
+    The md5 of a ports.json entry, used in the ports.delta.json manifest.
+
+    tools/pm_catalogue_delta.py has to produce exactly the same value.
+    """
+    return hashlib.md5(json.dumps(entry, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
 ################################################################################
 ## APIS
 class BaseSource():
@@ -145,6 +159,7 @@ class GitHubRawReleaseV1(BaseSource):
         """
         ...
 
+    @tracing.traced()
     def update(self):
         # cprint(f"<b>{self._config['name']}</b>: updating")
         if self.hm.callback is not None:
@@ -580,6 +595,7 @@ class GitHubRepoV1(GitHubRawReleaseV1):
         """
         self._info = self._config.setdefault('data', {}).setdefault('info', {})
 
+    @tracing.traced()
     def update(self):
         # cprint(f"<b>{self._config['name']}</b>: updating")
         if self._did_update:
@@ -702,13 +718,113 @@ class PortMasterV3(BaseSource):
     # A safe number, at this point its better to just download the full zip again.
     MAX_IMAGES_XXX_ZIP = 4
 
+    # Version of the ports.delta.json format we understand.
+    DELTA_VERSION = 1
+
+    def __init__(self, hm, file_name, config):
+        self._images_hashes_file = hm.cfg_dir / f"images_{config['prefix']}" / "images_hashes.json"
+        self._catalogue_file = file_name.with_suffix('.catalogue')
+        self._catalogue = None
+        super().__init__(hm, file_name, config)
+
+    def auto_update(self):
+        ## Without the catalogue we have nothing to show.
+        if self._wants_update is None and not self._open_catalogue():
+            self._wants_update = _("Cache out of date.")
+
+        super().auto_update()
+
     def load(self):
-        self._data = self._config.setdefault('data', {}).setdefault('data', {})
         self.ports = self._config.setdefault('data', {}).setdefault('ports', [])
         self.utils = self._config.setdefault('data', {}).setdefault('utils', [])
-        self._info = self._config.setdefault('data', {}).setdefault('info', {})
+        ## ports.json key: [runtime name, arch], so a delta can undo what _add_util did.
+        self.runtime_keys = self._config.setdefault('data', {}).setdefault('runtime_keys', {})
+
+        if self._open_catalogue() and self._catalogue is not None:
+            self._data = CatalogueView(self._catalogue, 'data:')
+            self._info = CatalogueView(self._catalogue, 'info:')
+
+        else:
+            self._data = self._config.setdefault('data', {}).setdefault('data', {})
+            self._info = self._config.setdefault('data', {}).setdefault('info', {})
+
         self._load_images()
 
+    def _open_catalogue(self):
+        """
+        Opens the on disk catalogue, returns False if we should have one but it is missing or damaged.
+
+        Caches from before the catalogue keep everything in the source json, those are fine as they are.
+        """
+        catalogue_size = self._config.get('data', {}).get('catalogue', None)
+
+        if catalogue_size is None or self._catalogue is not None:
+            return True
+
+        try:
+            if self._catalogue_file.stat().st_size != catalogue_size:
+                raise HarbourException("size mismatch")
+
+            self._catalogue = CatalogueStore(self._catalogue_file)
+
+        except (OSError, HarbourException) as err:
+            logger.warning(f"{self.name}: unable to open {self._catalogue_file}: {err}")
+            return False
+
+        return True
+
+    def _catalogue_dicts(self):
+        """
+        The data and info we already have as plain dicts, ready to be updated.
+        """
+        if not self._open_catalogue():
+            return {}, {}
+
+        if self._catalogue is None:
+            return (
+                self._config.get('data', {}).get('data', {}),
+                self._config.get('data', {}).get('info', {}))
+
+        return (
+            dict(CatalogueView(self._catalogue, 'data:')),
+            dict(CatalogueView(self._catalogue, 'info:')))
+
+    def _save_catalogue(self):
+        """
+        Writes data and info to the catalogue, and swaps them for views of it.
+
+        If that fails they go in the source json like they used to.
+        """
+        records = {}
+        for key, value in self._data.items():
+            records['data:' + key] = value
+
+        for key, value in self._info.items():
+            records['info:' + key] = value
+
+        if self._catalogue is not None:
+            self._catalogue.close()
+            self._catalogue = None
+
+        try:
+            catalogue_size = catalogue_write(self._catalogue_file, records)
+            self._catalogue = CatalogueStore(self._catalogue_file)
+
+        except (OSError, HarbourException) as err:
+            logger.warning(f"{self.name}: unable to write {self._catalogue_file}: {err}")
+
+            self._config['data'].pop('catalogue', None)
+            self._config['data']['data']  = self._data
+            self._config['data']['info']  = self._info
+            return
+
+        self._config['data']['catalogue'] = catalogue_size
+        self._config['data'].pop('data', None)
+        self._config['data'].pop('info', None)
+
+        self._data = CatalogueView(self._catalogue, 'data:')
+        self._info = CatalogueView(self._catalogue, 'info:')
+
     def save(self):
         with self._file_name.open('w') as fh:
             json.dump(self._config, fh, indent=4)
@@ -738,6 +854,90 @@ class PortMasterV3(BaseSource):
         for port_name in (all_ports - seen_ports):
             logger.warning(f"Port image {port_name}: missing.")
 
+    def _image_files(self):
+        return {
+            file_name.name
+            for file_name in self._images_dir.iterdir()
+            if file_name.suffix in ('.png', '.jpg')}
+
+    def _load_image_hashes(self):
+        """
+        Image name -> "crc32:size" of the image on disk, as recorded when we last extracted it.
+        """
+        if not self._images_hashes_file.is_file():
+            return {}
+
+        with open(self._images_hashes_file, 'r') as fh:
+            image_hashes = json_safe_load(fh)
+
+        if not isinstance(image_hashes, dict):
+            return {}
+
+        return image_hashes
+
+    def _save_image_hashes(self, image_hashes):
+        with open(self._images_hashes_file, 'w') as fh:
+            json.dump(image_hashes, fh, indent=4, sort_keys=True)
+
+    def _image_hash(self, file_name):
+        crc = 0
+        size = 0
+        with open(file_name, 'rb') as fh:
+            while True:
+                data = fh.read(1024 * 64)
+                if len(data) == 0:
+                    break
+
+                crc = zlib.crc32(data, crc)
+                size += len(data)
+
+        return f"{crc:08x}:{size}"
+
+    def _extract_images(self, zf, image_hashes, images_on_disk):
+        """
+        Extracts the png & jpg files from zf, skipping any already on disk with the same contents.
+
+        Returns the names of all the images in the zip.
+        """
+        image_names = []
+
+        for zip_info in zf.infolist():
+            zip_name = zip_info.filename
+
+            if zip_name.casefold().rsplit('.')[-1] not in ('jpg', 'png'):
+                continue
+
+            clean_name = self.clean_name(zip_name.rsplit('/', 1)[-1])
+            image_names.append(clean_name)
+
+            # The zip directory has the crc32 and size, no need to decompress anything to compare.
+            image_hash = f"{zip_info.CRC:08x}:{zip_info.file_size}"
+            file_name = self._images_dir / clean_name
+
+            if clean_name in images_on_disk:
+                if image_hashes.get(clean_name) == image_hash:
+                    continue
+
+                # Images from before we kept hashes, reading them is still cheaper than writing them.
+                if clean_name not in image_hashes and self._image_hash(file_name) == image_hash:
+                    image_hashes[clean_name] = image_hash
+                    continue
+
+            logger.debug(f"adding {file_name}")
+
+            with zf.open(zip_info) as in_fh, open(file_name, 'wb') as out_fh:
+                shutil.copyfileobj(in_fh, out_fh)
+
+            image_hashes[clean_name] = image_hash
+
+        return image_names
+
+    def _delete_images(self, image_names, image_hashes):
+        for image_name in image_names:
+            logger.debug(f"removing {self._images_dir / image_name}")
+            (self._images_dir / image_name).unlink()
+            image_hashes.pop(image_name, None)
+
     def _update2(self):
         ## The new images.xxx.zip system.
         img_id = 0
@@ -755,12 +955,6 @@ class PortMasterV3(BaseSource):
             # It's an older version without the `images.zip` md5sum recorded.
             return False
 
-        # Find all the current images.
-        images_to_delete = [
-            file_name
-            for file_name in self._images_dir.iterdir()
-            if file_name.suffix in ('.png', '.jpg')]
-
         # See how many images.xxx.zip files need updating.
         images_zip_threshold = 0
         for img_id in range(1000):
@@ -782,6 +976,11 @@ class PortMasterV3(BaseSource):
             # Yeah lets just download the big zip again.
             return False
 
+        # Find all the current images.
+        images_on_disk = self._image_files()
+        images_to_keep = set()
+        image_hashes = self._load_image_hashes()
+
         for img_id in range(1000):
             zip_xxx_name = f'images.{img_id:03d}.zip'
 
@@ -795,12 +994,7 @@ class PortMasterV3(BaseSource):
             images_local_md5 = images_data.get(zip_xxx_name, {}).get('md5', None)
             if images_local_md5 == images_zip_md5:
                 # This zip file hasn't been updated, mark all images from this zip as okay.
-                for image_name in images_data[zip_xxx_name]['images']:
-                    file_name = (self._images_dir / image_name)
-
-                    if file_name in images_to_delete:
-                        images_to_delete.remove(file_name)
-
+                images_to_keep.update(images_data[zip_xxx_name]['images'])
                 continue
 
             logger.debug(f"images_zip_md5={images_zip_md5} != images_local_md5={images_local_md5}")
@@ -810,41 +1004,24 @@ class PortMasterV3(BaseSource):
             if images_zip is None:
                 # Abort, lets just fallback to tried and true images.zip
                 logger.debug(f"Unable to download {images_zip_url}")
+                self._save_image_hashes(image_hashes)
                 return False
 
             images_data[zip_xxx_name] = {}
             images_data[zip_xxx_name]['md5'] = images_zip_md5
-            images_data[zip_xxx_name]['images'] = []
 
-            # unzip the files, keep only png & jpg files
+            # unzip the changed files, keep only png & jpg files
             with zipfile.ZipFile(images_zip, 'r') as zf:
-                for zip_name in zf.namelist():
-                    if zip_name.casefold().rsplit('.')[-1] not in ('jpg', 'png'):
-                        continue
+                images_data[zip_xxx_name]['images'] = self._extract_images(zf, image_hashes, images_on_disk)
 
-                    clean_name = self.clean_name(zip_name.rsplit('/', 1)[-1])
-
-                    # Keep track of the files in this zip
-                    images_data[zip_xxx_name]['images'].append(clean_name)
-
-                    file_name = self._images_dir / clean_name
-                    if file_name not in images_to_delete:
-                        logger.debug(f"adding {file_name}")
-
-                    with open(file_name, 'wb') as fh:
-                        fh.write(zf.read(zip_name))
-
-                    # Mark the files for keeping.
-                    if file_name in images_to_delete:
-                        images_to_delete.remove(file_name)
+            images_to_keep.update(images_data[zip_xxx_name]['images'])
 
             # delete the sucker.
             images_zip.unlink()
 
         # delete any images not listed in any zip file.
-        for image_to_delete in images_to_delete:
-            logger.debug(f"removing {image_to_delete}")
-            image_to_delete.unlink()
+        self._delete_images(images_on_disk - images_to_keep, image_hashes)
+        self._save_image_hashes(image_hashes)
 
         # We got here, update the images.zip entry in the images_data
         images_data["images.zip"] = self._data['images.zip']['md5']
@@ -855,6 +1032,8 @@ class PortMasterV3(BaseSource):
         self._images_md5_file.write_text(self._data['images.zip']['md5'])
         self._images_md5 = self._data['images.zip']['md5']
 
+        return True
+
     def _update(self):
         # cprint(f"- <b>{self._config['name']}</b>: Fetching info")
         self.hm.callback.message("  - {}".format(_("Fetching info")))
@@ -896,29 +1075,15 @@ class PortMasterV3(BaseSource):
                 logger.debug(f"Unable to download {images_url_zip}")
                 return
 
-            images_to_delete = [
-                file_name
-                for file_name in self._images_dir.iterdir()
-                if file_name.suffix in ('.png', '.jpg')]
+            images_on_disk = self._image_files()
+            image_hashes = self._load_image_hashes()
 
+            # Only images that actually changed get written.
             with zipfile.ZipFile(images_zip, 'r') as zf:
-                for zip_name in zf.namelist():
-                    if zip_name.casefold().rsplit('.')[-1] not in ('jpg', 'png'):
-                        continue
-
-                    file_name = self._images_dir / self.clean_name(zip_name.rsplit('/', 1)[-1])
-                    if file_name not in images_to_delete:
-                        logger.debug(f"adding {file_name}")
+                images_to_keep = set(self._extract_images(zf, image_hashes, images_on_disk))
 
-                    with open(file_name, 'wb') as fh:
-                        fh.write(zf.read(zip_name))
-
-                    if file_name in images_to_delete:
-                        images_to_delete.remove(file_name)
-
-            for image_to_delete in images_to_delete:
-                logger.debug(f"removing {image_to_delete}")
-                image_to_delete.unlink()
+            self._delete_images(images_on_disk - images_to_keep, image_hashes)
+            self._save_image_hashes(image_hashes)
 
             if 'images.000.zip' in self._data and 'images' in self._data['images.000.zip']:
                 # build up the images.json with the data we have
@@ -950,6 +1115,219 @@ class PortMasterV3(BaseSource):
     def _clear(self):
         ...
 
+    def _delta_url(self):
+        if 'delta_url' in self._config:
+            return self._config['delta_url']
+
+        if self._config['url'].endswith('/ports.json'):
+            return self._config['url'][:-len('ports.json')] + 'ports.delta.json'
+
+        return None
+
+    def _add_port(self, key, asset):
+        asset = port_info_load(asset)
+        if asset is None:
+            ## Skip bad items.
+            return
+
+        result = {
+            'name': asset['name'],
+            'size': asset['source']['size'],
+            'md5': asset['source']['md5'],
+            'url': asset['source']['url'],
+            }
+
+        if self.clean_name(key) not in self._info:
+            self.ports.append(self.clean_name(key))
+
+        self._info[self.clean_name(key)] = asset
+        self._data[self.clean_name(key)] = result
+
+    def _remove_port(self, key):
+        if self.clean_name(key) in self._info:
+            self.ports.remove(self.clean_name(key))
+            del self._info[self.clean_name(key)]
+
+        self._data.pop(self.clean_name(key), None)
+
+    def _add_util(self, key, asset):
+        """
+        Returns True if it changed the runtimes info.
+        """
+        changed = False
+        result = {
+            'name': asset['name'],
+            'size': asset['size'],
+            'md5': asset['md5'],
+            'url': asset['url'],
+            }
+
+        if 'images' in asset:
+            result['images'] = asset['images']
+
+        if key.endswith('.squashfs'):
+            if 'runtime_name' in asset:
+                self.runtime_keys[key] = [asset['runtime_name'], asset['runtime_arch']]
+                key=asset['runtime_name']
+                arch=asset['runtime_arch']
+                self.hm.runtimes_info.setdefault(key, {}).setdefault('remote', {})[arch] = result.copy()
+
+            else:
+                self.runtime_keys[key] = [key, 'aarch64']
+                self.hm.runtimes_info.setdefault(key, {}).setdefault('remote', {})['aarch64'] = result.copy()
+
+            if 'name' in self.hm.runtimes_info[key]['remote']:
+                del self.hm.runtimes_info[key]['remote']['name']
+                del self.hm.runtimes_info[key]['remote']['size']
+                del self.hm.runtimes_info[key]['remote']['md5']
+                del self.hm.runtimes_info[key]['remote']['url']
+
+            self.hm.runtimes_info[key]['name'] = result['name']
+            self.hm.runtimes_info[key].setdefault('status', 'Unknown')
+            changed = True
+
+        self._data[self.clean_name(key)] = result
+        if key.lower() in ('images.zip', 'portmaster.zip'):
+            return changed
+
+        if self.clean_name(key) not in self.utils:
+            self.utils.append(self.clean_name(key))
+
+        return changed
+
+    def _remove_util(self, key):
+        """
+        Undoes _add_util, a runtime only goes once none of its arches are left. Returns True if it
+        changed the runtimes info.
+        """
+        changed = False
+
+        if key in self.runtime_keys:
+            key, arch = self.runtime_keys.pop(key)
+            runtime_remote = self.hm.runtimes_info.get(key, {}).get('remote', {})
+
+            if arch in runtime_remote:
+                del runtime_remote[arch]
+                changed = True
+
+            if len(runtime_remote) > 0:
+                ## Same as _add_util leaves it, the last arch added.
+                self._data[self.clean_name(key)] = list(runtime_remote.values())[-1].copy()
+                return changed
+
+        self._data.pop(self.clean_name(key), None)
+
+        if self.clean_name(key) in self.utils:
+            self.utils.remove(self.clean_name(key))
+
+        return changed
+
+    def _update_delta(self):
+        """
+        Patches the catalogue we already have with ports.delta.json.
+
+        ports.delta.json has the md5 of every entry in the current ports.json, plus the entries that
+        changed recently. If anything we need isn't in there we return None and the full ports.json is
+        downloaded instead, otherwise returns True if the runtimes info changed.
+        """
+        old_data = self._config.get('data', {})
+        old_manifest = old_data.get('manifest', None)
+        delta_url = self._delta_url()
+
+        if old_manifest is None or delta_url is None or self._config['version'] != self.VERSION:
+            return None
+
+        if not self._open_catalogue():
+            return None
+
+        ## Older sources don't have one, don't make a fuss about it.
+        delta = fetch_json(delta_url, quiet=True)
+        if not isinstance(delta, dict) or delta.get('version') != self.DELTA_VERSION:
+            return None
+
+        new_manifest = delta['manifest']
+        entries = delta.get('entries', {})
+        changes = {}
+
+        for section in ('ports', 'utils'):
+            old_section = old_manifest.get(section, {})
+            new_section = new_manifest.get(section, {})
+
+            changed_keys = [
+                key
+                for key, entry_md5 in new_section.items()
+                if old_section.get(key, None) != entry_md5]
+
+            for key in changed_keys:
+                entry = entries.get(section, {}).get(key, None)
+                if entry is None or catalogue_entry_md5(entry) != new_section[key]:
+                    logger.debug(f"{self.name}: {key} is not in the delta, fetching everything.")
+                    return None
+
+            changes[section] = (changed_keys, old_section.keys() - new_section.keys())
+
+        ## Caches from before runtime_keys don't know which runtime a removed squashfs was.
+        old_runtime_keys = old_data.get('runtime_keys', None)
+        for key in changes['utils'][1]:
+            if key.endswith('.squashfs') and (old_runtime_keys is None or key not in old_runtime_keys):
+                logger.debug(f"{self.name}: unknown runtime {key} removed, fetching everything.")
+                return None
+
+        self._data, self._info = self._catalogue_dicts()
+        self.ports = old_data.get('ports', [])
+        self.utils = old_data.get('utils', [])
+        self.runtime_keys = old_runtime_keys or {}
+
+        changed_ports, removed_ports = changes['ports']
+        for key in removed_ports:
+            self._remove_port(key)
+
+        for key in changed_ports:
+            self._add_port(key, entries['ports'][key])
+
+        changed = False
+        changed_utils, removed_utils = changes['utils']
+        for key in removed_utils:
+            changed = self._remove_util(key) or changed
+
+        for key in changed_utils:
+            changed = self._add_util(key, entries['utils'][key]) or changed
+
+        self._config['data']['manifest'] = new_manifest
+
+        logger.info(
+            f"{self.name}: delta update, {len(changed_ports)} ports changed, {len(removed_ports)} removed, "
+            f"{len(changed_utils)} utils changed, {len(removed_utils)} removed.")
+
+        return changed
+
+    def _update_full(self, data):
+        """
+        Rebuilds the catalogue from a full ports.json, returns True if the runtimes info changed.
+        """
+        changed = False
+
+        ## Hash the entries before port_info_load gets its hands on them.
+        manifest = {
+            section: {
+                key: catalogue_entry_md5(entry)
+                for key, entry in data[section].items()
+                }
+            for section in ('ports', 'utils')
+            }
+
+        ## Load data from the assets.
+        for key, asset in data['ports'].items():
+            self._add_port(key, asset)
+
+        for key, asset in data['utils'].items():
+            changed = self._add_util(key, asset) or changed
+
+        self._config.setdefault('data', {})['manifest'] = manifest
+
+        return changed
+
+    @tracing.traced()
     def update(self):
         # cprint(f"<b>{self._config['name']}</b>: updating")
         if self.hm.callback is not None:
@@ -961,6 +1339,7 @@ class PortMasterV3(BaseSource):
         self._info = {}
         self.ports = []
         self.utils = []
+        self.runtime_keys = {}
         self.images = {}
 
         if self._did_update:
@@ -972,63 +1351,14 @@ class PortMasterV3(BaseSource):
         if self.hm.callback is not None:
             self.hm.callback.message("  - {}".format(_("Fetching latest info")))
 
-        data = fetch_json(self._config['url'])
-        if data is None:
-            return
+        changed = self._update_delta()
 
-        ## Load data from the assets.
-        for key, asset in data['ports'].items():
-            asset = port_info_load(asset)
-            if asset is None:
-                ## Skip bad items.
-                continue
-
-            result = {
-                'name': asset['name'],
-                'size': asset['source']['size'],
-                'md5': asset['source']['md5'],
-                'url': asset['source']['url'],
-                }
-
-            self.ports.append(self.clean_name(key))
-            self._info[self.clean_name(key)] = asset
-            self._data[self.clean_name(key)] = result
-
-        for key, asset in data['utils'].items():
-            result = {
-                'name': asset['name'],
-                'size': asset['size'],
-                'md5': asset['md5'],
-                'url': asset['url'],
-                }
-
-            if 'images' in asset:
-                result['images'] = asset['images']
-
-            if key.endswith('.squashfs'):
-                if 'runtime_name' in asset:
-                    key=asset['runtime_name']
-                    arch=asset['runtime_arch']
-                    self.hm.runtimes_info.setdefault(key, {}).setdefault('remote', {})[arch] = result.copy()
-
-                else:
-                    self.hm.runtimes_info.setdefault(key, {}).setdefault('remote', {})['aarch64'] = result.copy()
-
-                if 'name' in self.hm.runtimes_info[key]['remote']:
-                    del self.hm.runtimes_info[key]['remote']['name']
-                    del self.hm.runtimes_info[key]['remote']['size']
-                    del self.hm.runtimes_info[key]['remote']['md5']
-                    del self.hm.runtimes_info[key]['remote']['url']
-
-                self.hm.runtimes_info[key]['name'] = result['name']
-                self.hm.runtimes_info[key].setdefault('status', 'Unknown')
-                changed = True
-
-            self._data[self.clean_name(key)] = result
-            if key.lower() in ('images.zip', 'portmaster.zip'):
-                continue
+        if changed is None:
+            data = fetch_json(self._config['url'])
+            if data is None:
+                return
 
-            self.utils.append(self.clean_name(key))
+            changed = self._update_full(data)
 
         if changed:
             self.hm.list_runtimes()
@@ -1042,8 +1372,8 @@ class PortMasterV3(BaseSource):
 
         self._config['data']['ports'] = self.ports
         self._config['data']['utils'] = self.utils
-        self._config['data']['data']  = self._data
-        self._config['data']['info']  = self._info
+        self._config['data']['runtime_keys'] = self.runtime_keys
+        self._save_catalogue()
 
         self._config['last_checked'] = datetime.datetime.now().isoformat()
 
@@ -1061,16 +1391,18 @@ class PortMasterV3(BaseSource):
             self.hm.callback.message_box(_("Unable to find {port_name}.").format(port_name=port_name))
             return None
 
+        port_data = self._data[port_name]
+
         if temp_dir is None:
-            file_size = self._data[port_name]['size']
+            file_size = port_data['size']
 
             if file_size > HM_MAX_TEMP_SIZE:
                 temp_dir = self.hm.ports_dir
             else:
                 temp_dir = self.hm.temp_dir
 
-        md5_result[0] = self._data[port_name]['md5']
-        zip_file = download(temp_dir / port_name, self._data[port_name]['url'], self._data[port_name]['md5'], callback=self.hm.callback)
+        md5_result[0] = port_data['md5']
+        zip_file = download(temp_dir / port_name, port_data['url'], port_data['md5'], callback=self.hm.callback)
 
         if zip_file is None:
             return None
@@ -1199,6 +1531,7 @@ HM_SOURCE_APIS = {
     }
 
 __all__ = (
+    'catalogue_entry_md5',
     'BaseSource',
     'raw_download',
     'HM_SOURCE_APIS',
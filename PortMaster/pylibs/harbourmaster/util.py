@@ -1,25 +1,29 @@
 
 # SPDX-License-Identifier: MIT
 
+import concurrent.futures
 import contextlib
 import datetime
 import functools
 import hashlib
 import json
+import os
 import platform
 import shutil
 import re
+import selectors
+import socket
 import subprocess
 import sys
 import tempfile
-import time
+import threading
 
 from gettext import gettext as _
 from pathlib import Path
 
 import loguru
 import pathlib
-import requests
+import tracing
 import utility
 
 from loguru import logger
@@ -27,6 +31,9 @@ from utility import cprint, cstrip
 
 from .config import *
 
+## requests pulls in urllib3, idna, charset_normalizer and certifi, only load it when we go online.
+requests = utility.lazy_import('requests')
+
 
 ################################################################################
 ## Exceptions
@@ -52,11 +59,14 @@ def json_safe_load(*args):
         return None
 
 
-def fetch(url):
+def fetch(url, quiet=False):
     try:
         r = requests.get(url, timeout=20)
         if r.status_code != 200:
-            logger.error(f"Failed to download {url!r}: {r.status_code}")
+            if quiet:
+                logger.debug(f"Failed to download {url!r}: {r.status_code}")
+            else:
+                logger.error(f"Failed to download {url!r}: {r.status_code}")
             return None
 
     except requests.exceptions.ConnectionError as err:
@@ -74,8 +84,8 @@ def fetch_data(url):
     return r.content
 
 
-def fetch_json(url):
-    r = fetch(url)
+def fetch_json(url, quiet=False):
+    r = fetch(url, quiet=quiet)
     if r is None:
         return None
 
@@ -355,6 +365,7 @@ def runtime_nicename(runtime):
     return runtime
 
 
+@tracing.traced()
 def download(file_name, file_url, md5_source=None, md5_result=None, callback=None, no_check=False):
     """
     Download a file from file_url into file_name, checks the md5sum of the file against md5_source if given.
@@ -395,6 +406,7 @@ def download(file_name, file_url, md5_source=None, md5_result=None, callback=Non
                 md5.update(data)
                 fh.write(data)
                 length += len(data)
+                tracing.count('download.bytes', len(data))
 
                 if callback is not None:
                     callback.progress(_("Downloading file."), length, total_length, 'data')
@@ -531,9 +543,64 @@ def remove_dict_list(base_dict, key, value):
             base_dict[key] = result[0]
 
 
+## st_dev "major:minor" -> (mount point, fs type), filled from /proc/self/mountinfo.
+__MOUNT_FS = None
+
+
+def _unescape_mount(value):
+    ## mountinfo escapes spaces, tabs, newlines and backslashes as octal.
+    return re.sub(r'\\([0-7]{3})', lambda match: chr(int(match.group(1), 8)), value)
+
+
+def _load_mountinfo():
+    global __MOUNT_FS
+
+    mounts = {}
+    try:
+        with open('/proc/self/mountinfo', 'r') as fh:
+            for line in fh:
+                ## 36 35 98:0 /mnt1 /mnt/parent rw,noatime master:1 - ext3 /dev/root rw,errors=continue
+                fields, _sep, extra = line.partition(' - ')
+                fields = fields.split(' ')
+                extra = extra.split(' ')
+
+                if len(fields) < 5 or len(extra) < 1:
+                    continue
+
+                ## Later mounts hide earlier ones on the same device.
+                mounts[fields[2]] = (_unescape_mount(fields[4]), extra[0])
+
+    except OSError:
+        return False
+
+    __MOUNT_FS = mounts
+    return True
+
+
+def _get_path_fs_df(path):
+    try:
+        lines = subprocess.check_output(['df', '-PT', str(path)]).decode().split('\n')
+    except subprocess.CalledProcessError as err:
+        return None
+
+    if len(lines) < 2:
+        return None
+
+    if lines[1].strip() == '':
+        return None
+
+    sections = re.split(r'\s+', lines[1])
+    if len(sections) < 2:
+        return None
+
+    return sections[1]
+
+
 def get_path_fs(path):
     """
     Get the fs type of the specified path.
+
+    Uses the mount table from /proc/self/mountinfo, only reloaded when we see a device we don't know about.
     """
 
     if HM_TESTING:
@@ -548,38 +615,35 @@ def get_path_fs(path):
     else:
         return None
 
-    try:
-        lines = subprocess.check_output(['df', '-PT', str(path)]).decode().split('\n')
-    except subprocess.CalledProcessError as err:
-        return None
+    if __MOUNT_FS is None and not _load_mountinfo():
+        return _get_path_fs_df(path)
 
-    if len(lines) < 2:
-        return None
-
-    if lines[1].strip() == '':
+    try:
+        st_dev = os.stat(path).st_dev
+    except OSError:
         return None
 
-    sections = re.split(r'\s+', lines[1])
-    if len(sections) < 2:
-        return None
+    device = f"{os.major(st_dev)}:{os.minor(st_dev)}"
 
-    return sections[1]
+    if device not in __MOUNT_FS:
+        ## Something got mounted since we last looked.
+        _load_mountinfo()
 
+    if device in __MOUNT_FS:
+        return __MOUNT_FS[device][1]
 
-def timeit(func):
-    if not HM_PERFTEST:
-        return func
+    ## btrfs subvolumes and friends report a device id that isn't in mountinfo.
+    real_path = os.path.realpath(path)
+    best_mount = None
+    for mount_point, fs_type in __MOUNT_FS.values():
+        if real_path == mount_point or real_path.startswith(mount_point.rstrip('/') + '/'):
+            if best_mount is None or len(mount_point) > len(best_mount[0]):
+                best_mount = (mount_point, fs_type)
 
-    @functools.wraps(func)
-    def timeit_wrapper(*args, **kwargs):
-        start_time = time.perf_counter()
-        result = func(*args, **kwargs)
-        end_time = time.perf_counter()
-        total_time = end_time - start_time
-        logger.debug(f'TIME: {func.__name__}({args}, {kwargs}): Took {total_time:.4f} seconds')
-        return result
+    if best_mount is None:
+        return _get_path_fs_df(path)
 
-    return timeit_wrapper
+    return best_mount[1]
 
 
 def port_sort_alphabetical(port_info):
@@ -699,9 +763,400 @@ class Callback:
             pass
 
 
+################################################################################
+## Fifo control
+class FifoRequest:
+    """
+    One command line read by FifoServer, reply() sends the result back the way it came in.
+    """
+    def __init__(self, server, line, client=None):
+        self.server = server
+        self.line = line
+        self.client = client
+        self.replied = False
+
+    def status(self, text):
+        """
+        Intermediate state like "WAIT", only the done file shows these.
+        """
+        if self.client is None:
+            self.server.write_done(text)
+
+    def send(self, text):
+        """
+        Sends a line to a socket client without finishing the request.
+        """
+        if self.client is not None:
+            self.server.send(self.client, text)
+
+    def reply(self, text):
+        self.replied = True
+
+        if self.client is None:
+            self.server.write_done(text)
+            self.server.write_reply(text)
+
+        else:
+            self.server.send(self.client, text)
+
+    def finish(self):
+        ## Never leave a client waiting on a command that didn't say anything.
+        if not self.replied:
+            self.reply("DONE")
+
+
+class FifoServer:
+    """
+    Reads commands for fifo_control, one per line, without busy waiting.
+
+    Commands come in on fifo_file and/or a unix socket. poll() blocks until one arrives
+    or the timeout runs out.
+
+    Results of fifo commands are written to done_file and, if given, to the reply_file fifo so a
+    shell script can block on `read` instead of polling the done file. Socket clients get the
+    result as a line on the same connection.
+    """
+    READ_SIZE = 4096
+
+    ## Seconds a socket client can stall reading its output before it is dropped.
+    SEND_TIMEOUT = 30
+
+    def __init__(self, fifo_file, done_file=None, reply_file=None, socket_file=None, socket_mode=0o777):
+        self.fifo_file = fifo_file and Path(fifo_file) or None
+        self.done_file = done_file and Path(done_file) or None
+        self.reply_file = reply_file and Path(reply_file) or None
+        self.socket_file = socket_file and Path(socket_file) or None
+        self.socket_mode = socket_mode
+
+        self.selector = None
+        self.fifo_fd = None
+        self.reply_fd = None
+        self.socket = None
+        self.buffers = {}
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def open(self):
+        self.selector = selectors.DefaultSelector()
+
+        ## The reply fifo must exist before the input fifo, scripts wait on the input fifo to appear.
+        if self.reply_file is not None:
+            if self.reply_file.exists():
+                self.reply_file.unlink()
+
+            os.mkfifo(self.reply_file, mode=0o777)
+            self.reply_file.chmod(0o777)
+            ## Opening it read/write means writing never blocks or fails for lack of a reader.
+            self.reply_fd = os.open(self.reply_file, os.O_RDWR | os.O_NONBLOCK)
+
+        if self.socket_file is not None:
+            if self.socket_file.exists():
+                self.socket_file.unlink()
+
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.socket.bind(str(self.socket_file))
+            self.socket.listen()
+            self.socket.setblocking(False)
+            self.socket_file.chmod(self.socket_mode)
+            self.selector.register(self.socket, selectors.EVENT_READ)
+
+        if self.fifo_file is not None:
+            if self.fifo_file.exists():
+                self.fifo_file.unlink()
+
+            os.mkfifo(self.fifo_file, mode=0o777)
+            self.fifo_file.chmod(0o777)
+            ## Holding a write end ourselves stops the fifo reporting EOF every time a writer closes it.
+            self.fifo_fd = os.open(self.fifo_file, os.O_RDWR | os.O_NONBLOCK)
+            self.selector.register(self.fifo_fd, selectors.EVENT_READ)
+
+    def close(self):
+        if self.selector is None:
+            return
+
+        for client in [client for client in self.buffers if isinstance(client, socket.socket)]:
+            self._drop(client)
+
+        self.selector.close()
+        self.selector = None
+        self.buffers.clear()
+
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
+
+            if self.socket_file.exists():
+                self.socket_file.unlink()
+
+        for fd_name, file_name in (('fifo_fd', self.fifo_file), ('reply_fd', self.reply_file)):
+            if getattr(self, fd_name) is not None:
+                os.close(getattr(self, fd_name))
+                setattr(self, fd_name, None)
+
+                if file_name.exists():
+                    file_name.unlink()
+
+    def _drop(self, client):
+        if client not in self.buffers:
+            return
+
+        self.selector.unregister(client)
+        self.buffers.pop(client, None)
+        client.close()
+
+    def poll(self, timeout=None):
+        """
+        Waits up to timeout seconds, None waits forever, and returns a list of FifoRequest.
+        """
+        fifo_requests = []
+
+        for key, events in self.selector.select(timeout):
+            source = key.fileobj
+
+            if source is self.socket:
+                try:
+                    client, address = self.socket.accept()
+
+                except OSError:
+                    continue
+
+                client.setblocking(False)
+                self.buffers[client] = b""
+                self.selector.register(client, selectors.EVENT_READ)
+                continue
+
+            try:
+                if source == self.fifo_fd:
+                    data = os.read(self.fifo_fd, self.READ_SIZE)
+
+                else:
+                    data = source.recv(self.READ_SIZE)
+
+            except BlockingIOError:
+                continue
+
+            except OSError as err:
+                logger.warning(f"fifo: read failed: {err}")
+                data = b""
+
+            if data == b"" and source != self.fifo_fd:
+                ## Client hung up.
+                self._drop(source)
+                continue
+
+            *lines, self.buffers[source] = (self.buffers.get(source, b"") + data).split(b"\n")
+
+            for line in lines:
+                line = line.decode('utf-8', 'replace').strip()
+
+                if line == "":
+                    continue
+
+                fifo_requests.append(FifoRequest(self, line, source != self.fifo_fd and source or None))
+
+        return fifo_requests
+
+    def write_done(self, text):
+        if self.done_file is not None:
+            self.done_file.write_text(text)
+
+    def write_reply(self, text):
+        if self.reply_fd is None:
+            return
+
+        try:
+            os.write(self.reply_fd, f"{text}\n".encode('utf-8'))
+
+        except BlockingIOError:
+            ## Nobody is reading, don't let stale replies pile up.
+            logger.warning(f"fifo: reply fifo is full, dropping {text!r}")
+
+    def send(self, client, text):
+        if client not in self.buffers:
+            ## Already dropped, the rest of its output goes nowhere.
+            return
+
+        ## Clients are non-blocking for poll(), sendall() needs to wait for slow readers.
+        try:
+            client.settimeout(self.SEND_TIMEOUT)
+            client.sendall(f"{text}\n".encode('utf-8'))
+
+        except OSError as err:
+            logger.warning(f"fifo: unable to reply to client: {err}")
+            self._drop(client)
+            return
+
+        client.setblocking(False)
+
+
+class FileSync:
+    """
+    Copies files into place, skipping any that are already there.
+
+    A file is already there if the target is the same file, or has the same size and mtime. New files are
+    hardlinked where the filesystem allows it, otherwise copied with their mtime on a small thread pool.
+    Call wait() or use it as a context manager to make sure everything has landed.
+    """
+
+    ## FAT only keeps mtimes to 2 seconds.
+    MTIME_SLACK = 2
+
+    def __init__(self, workers=4, hardlink=True):
+        self.workers = workers
+        self.hardlink = hardlink
+
+        self.copied = 0
+        self.linked = 0
+        self.skipped = 0
+        self.failed = 0
+
+        self._pool = None
+        self._futures = []
+        self._queued = set()
+        self._texts = {}
+        self._no_link = set()
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _is_synced(self, src_stat, dst):
+        try:
+            dst_stat = os.stat(dst)
+
+        except OSError:
+            return False
+
+        if (dst_stat.st_dev, dst_stat.st_ino) == (src_stat.st_dev, src_stat.st_ino):
+            return True
+
+        return (
+            dst_stat.st_size == src_stat.st_size and
+            abs(dst_stat.st_mtime - src_stat.st_mtime) <= self.MTIME_SLACK)
+
+    def _sync(self, src, dst):
+        try:
+            src_stat = os.stat(src)
+
+            if self._is_synced(src_stat, dst):
+                self._count('skipped')
+                return
+
+            if dst.is_symlink() or dst.exists():
+                dst.unlink()
+
+            if self.hardlink and str(dst.parent) not in self._no_link:
+                try:
+                    os.link(src, dst)
+                    self._count('linked')
+                    return
+
+                except OSError:
+                    ## vfat/exfat or another filesystem, don't bother trying again.
+                    with self._lock:
+                        self._no_link.add(str(dst.parent))
+
+            shutil.copyfile(src, dst)
+
+            try:
+                shutil.copystat(src, dst)
+
+            except OSError:
+                pass
+
+            self._count('copied')
+
+        except OSError as err:
+            logger.warning(f"Unable to copy {src} to {dst}: {err}")
+            self._count('failed')
+
+    def copy(self, src, dst):
+        src = Path(src)
+        dst = Path(dst)
+
+        with self._lock:
+            if str(dst) in self._queued:
+                return
+
+            self._queued.add(str(dst))
+
+        if self.workers == 0:
+            self._sync(src, dst)
+            return
+
+        if self._pool is None:
+            self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers)
+
+        self._futures.append(self._pool.submit(self._sync, src, dst))
+
+    def write_text(self, dst, text):
+        """
+        Writes text to dst, unless it already has exactly that in it.
+
+        With a thread pool this waits for wait(), and the last text for each file wins.
+        """
+        if self.workers != 0:
+            self._texts[str(dst)] = text
+            return
+
+        self._write_text(Path(dst), text)
+
+    def _write_text(self, dst, text):
+        try:
+            if dst.is_file() and dst.read_text() == text:
+                self._count('skipped')
+                return
+
+            with open(dst, 'w') as fh:
+                fh.write(text)
+
+            self._count('copied')
+
+        except (OSError, UnicodeDecodeError) as err:
+            logger.warning(f"Unable to write {dst}: {err}")
+            self._count('failed')
+
+    def wait(self):
+        futures, self._futures = self._futures, []
+        texts, self._texts = self._texts, {}
+
+        for future in futures:
+            future.result()
+
+        for dst, text in texts.items():
+            self._write_text(Path(dst), text)
+
+        self._queued.clear()
+
+    def close(self):
+        self.wait()
+
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+        if (self.copied + self.linked + self.failed) > 0:
+            logger.debug(f"FileSync: {self.copied} copied, {self.linked} linked, {self.skipped} unchanged, {self.failed} failed.")
+
+
 __all__ = (
     'Callback',
     'CancelEvent',
+    'FifoRequest',
+    'FifoServer',
+    'FileSync',
     'HarbourException',
     'add_dict_list_unique',
     'add_list_unique',
@@ -726,7 +1181,6 @@ __all__ = (
     'remove_dict_list',
     'remove_pm_signature',
     'runtime_nicename',
-    'timeit',
     'version_parse',
     'PORT_SORT_FUNCS',
     )
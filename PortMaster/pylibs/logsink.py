@@ -0,0 +1,213 @@
+
+# SPDX-License-Identifier: MIT
+
+"""
+Log file sinks that keep writes to the SD card off the hot paths.
+
+  queued: records are collected in memory and written in batches by a background thread every
+          FLUSH_INTERVAL seconds, errors are written straight away so a crash still has its context.
+  ring:   only the last RING_SIZE records are kept, they are written when an error is logged or at exit.
+  sync:   the plain loguru file sink, every record is written as it is logged.
+
+Repetitive debug messages, like button presses and key repeats, are rate limited per line of code in
+the queued and ring modes.
+"""
+
+import collections
+import threading
+import time
+
+from loguru import logger
+
+
+## Seconds between writes in queued mode.
+FLUSH_INTERVAL = 2.0
+
+## Write early if this many records are waiting.
+FLUSH_RECORDS = 500
+
+## Records kept in ring mode.
+RING_SIZE = 1000
+
+## Debug messages allowed from the same line of code per RATE_LIMIT_PERIOD seconds.
+RATE_LIMIT_COUNT = 20
+RATE_LIMIT_PERIOD = 1.0
+
+ERROR_LEVEL = logger.level("ERROR").no
+INFO_LEVEL = logger.level("INFO").no
+
+
+class RateLimiter:
+    def __init__(self, count=RATE_LIMIT_COUNT, period=RATE_LIMIT_PERIOD):
+        self.count = count
+        self.period = period
+        ## key: [window_start, messages, suppressed]
+        self.windows = {}
+
+    def check(self, record):
+        """
+        Returns (allowed, suppressed), suppressed is how many messages from the same place were dropped
+        before this one.
+        """
+        if record['level'].no >= INFO_LEVEL:
+            return True, 0
+
+        key = (record['name'], record['function'], record['line'])
+        now = time.monotonic()
+
+        window = self.windows.get(key, None)
+        if window is None or (now - window[0]) >= self.period:
+            suppressed = window is not None and window[2] or 0
+            self.windows[key] = [now, 1, 0]
+            return True, suppressed
+
+        if window[1] < self.count:
+            window[1] += 1
+            return True, 0
+
+        window[2] += 1
+        return False, 0
+
+    def pending(self):
+        """
+        Returns and clears the messages suppressed in the current windows.
+        """
+        results = []
+        for (name, function, line), window in self.windows.items():
+            if window[2] > 0:
+                results.append((f"{name}:{function}:{line}", window[2]))
+                window[2] = 0
+
+        return results
+
+
+class LogFileSink:
+    """
+    A loguru sink, `logger.add(LogFileSink(file_name), ...)`.
+    """
+    def __init__(self, file_name, mode='queued', ring_size=RING_SIZE, flush_interval=FLUSH_INTERVAL):
+        if mode not in ('queued', 'ring'):
+            raise ValueError(f"Unknown log mode {mode}")
+
+        self.file_name = file_name
+        self.mode = mode
+        self.flush_interval = flush_interval
+        self.limiter = RateLimiter()
+
+        if mode == 'ring':
+            self.records = collections.deque(maxlen=ring_size)
+        else:
+            self.records = []
+
+        self._fh = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = None
+
+        if mode == 'queued':
+            self._thread = threading.Thread(target=self._run, name="LogFileSink", daemon=True)
+            self._thread.start()
+
+    def write(self, message):
+        allowed, suppressed = self.limiter.check(message.record)
+        if not allowed:
+            return
+
+        with self._lock:
+            if suppressed > 0:
+                self.records.append(suppressed_line(message.record, suppressed))
+
+            self.records.append(str(message))
+            waiting = len(self.records)
+
+        if message.record['level'].no >= ERROR_LEVEL:
+            self._write_pending()
+
+        elif self.mode == 'queued' and waiting >= FLUSH_RECORDS:
+            self._wake.set()
+
+    def _write_pending(self):
+        ## Not called flush(), loguru calls that after every write.
+        with self._write_lock:
+            with self._lock:
+                if len(self.records) == 0:
+                    return
+
+                lines = ''.join(self.records)
+                self.records.clear()
+
+            try:
+                if self._fh is None:
+                    self._fh = open(self.file_name, 'a', encoding='utf-8')
+
+                self._fh.write(lines)
+                self._fh.flush()
+
+            except OSError:
+                ## Nowhere left to log it, don't take the gui down with it.
+                pass
+
+    def _run(self):
+        while not self._stopping:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._write_pending()
+
+    def stop(self):
+        """
+        Called by loguru on logger.remove(), which it also does at exit.
+        """
+        self._stopping = True
+
+        if self._thread is not None:
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+
+        with self._lock:
+            for location, suppressed in self.limiter.pending():
+                self.records.append(f"suppressed {suppressed} more debug messages from {location}\n")
+
+        self._write_pending()
+
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+def suppressed_line(record, suppressed):
+    return (
+        f"{record['time']:YYYY-MM-DD HH:mm:ss.SSS} | {'DEBUG':<8} | "
+        f"{record['name']}:{record['function']}:{record['line']} - suppressed {suppressed} similar messages\n")
+
+
+def log_mode(argv):
+    """
+    The log mode picked on the command line, `--log-ring` or `--log-sync`, otherwise queued.
+    """
+    if '--log-sync' in argv:
+        return 'sync'
+
+    if '--log-ring' in argv:
+        return 'ring'
+
+    return 'queued'
+
+
+def add_file_sink(file_name, level="DEBUG", mode='queued'):
+    """
+    Adds a log file in mode, returns the loguru handler id.
+    """
+    if mode == 'sync':
+        return logger.add(file_name, level=level, backtrace=True, diagnose=True)
+
+    return logger.add(LogFileSink(file_name, mode), level=level, backtrace=True, diagnose=True, colorize=False)
+
+
+__all__ = (
+    'LogFileSink',
+    'add_file_sink',
+    'log_mode',
+    )
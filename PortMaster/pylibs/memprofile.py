@@ -0,0 +1,237 @@
+
+# SPDX-License-Identifier: MIT
+
+"""
+Memory profiling for low memory devices, see `--profile-memory`.
+
+Everything is a no-op until enable() is called. After that snapshot() writes the RSS, the memory python has
+allocated, the top allocators, what grew since the last snapshot and the size of anything registered with
+add_sizes() to the log. Lines are logged as each snapshot is taken, so they are there even if the process
+gets killed for running out of memory.
+"""
+
+import os
+import sys
+import tracemalloc
+
+from loguru import logger
+
+
+PYLIBS_DIR = os.path.dirname(os.path.abspath(__file__)) + os.sep
+
+## Number of lines shown for top allocators and growth.
+TOP_LIMIT = 10
+
+
+class MemoryProfiler:
+    def __init__(self):
+        self.enabled = False
+        self.previous = None
+        self.phases = set()
+        self.size_funcs = []
+
+    def enable(self, frames=1):
+        if self.enabled:
+            return
+
+        self.enabled = True
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def _take_snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            tracemalloc.Filter(False, "<unknown>"),
+            ))
+
+    def snapshot(self, phase, once=False):
+        if not self.enabled:
+            return
+
+        if once and phase in self.phases:
+            return
+
+        self.phases.add(phase)
+
+        current, peak = tracemalloc.get_traced_memory()
+        rss, rss_peak = process_memory()
+        snapshot = self._take_snapshot()
+
+        prefix = f"memory: [{phase}]"
+        logger.info(
+            f"{prefix} rss {format_size(rss)} (peak {format_size(rss_peak)}), "
+            f"python {format_size(current)} (peak {format_size(peak)})")
+
+        for stat in snapshot.statistics('lineno')[:TOP_LIMIT]:
+            logger.info(f"{prefix} top: {format_size(stat.size):>10} in {stat.count:>7} blocks at {format_frame(stat.traceback[0])}")
+
+        if self.previous is not None:
+            growth = [
+                stat
+                for stat in snapshot.compare_to(self.previous, 'lineno')
+                if stat.size_diff > 0]
+
+            for stat in growth[:TOP_LIMIT]:
+                logger.info(f"{prefix} grew: {format_size(stat.size_diff, True):>10} at {format_frame(stat.traceback[0])}")
+
+        for size_func in self.size_funcs:
+            try:
+                sizes = size_func()
+
+            except Exception as err:
+                logger.warning(f"{prefix} unable to get sizes from {size_func}: {err}")
+                continue
+
+            for name, (size, entries) in sizes.items():
+                logger.info(f"{prefix} size: {name} {format_size(size)} ({entries} entries)")
+
+        self.previous = snapshot
+
+    def finish(self):
+        if not self.enabled:
+            return
+
+        self.snapshot('exit')
+
+        self.enabled = False
+        self.previous = None
+        self.size_funcs.clear()
+        tracemalloc.stop()
+
+
+def format_size(size, signed=False):
+    if size is None:
+        return "?"
+
+    sign = ""
+    if signed:
+        sign = size < 0 and "-" or "+"
+        size = abs(size)
+
+    if size < 1024 * 1024:
+        return f"{sign}{size / 1024:.1f} KB"
+
+    return f"{sign}{size / (1024 * 1024):.1f} MB"
+
+
+def format_frame(frame):
+    file_name = frame.filename
+    if file_name.startswith(PYLIBS_DIR):
+        file_name = file_name[len(PYLIBS_DIR):]
+
+    return f"{file_name}:{frame.lineno}"
+
+
+def process_memory():
+    """
+    Returns (rss, peak rss) of this process in bytes, either can be None if it isn't known.
+    """
+    rss = None
+    rss_peak = None
+
+    try:
+        with open('/proc/self/status', 'r') as fh:
+            for line in fh:
+                if line.startswith('VmRSS:'):
+                    rss = int(line.split()[1]) * 1024
+
+                elif line.startswith('VmHWM:'):
+                    rss_peak = int(line.split()[1]) * 1024
+
+    except (OSError, ValueError, IndexError):
+        pass
+
+    if rss_peak is None:
+        try:
+            import resource
+            ## Linux reports KB, macOS reports bytes.
+            rss_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            if sys.platform != 'darwin':
+                rss_peak *= 1024
+
+        except (ImportError, OSError):
+            pass
+
+    return rss, rss_peak
+
+
+def deep_sizeof(obj):
+    """
+    Returns roughly how many bytes obj takes up, following dicts, lists, tuples and sets.
+    """
+    seen = set()
+    total = 0
+    stack = [obj]
+
+    while len(stack) > 0:
+        item = stack.pop()
+
+        if id(item) in seen:
+            continue
+
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+
+    return total
+
+
+PROFILER = MemoryProfiler()
+
+
+def enable(frames=1):
+    """
+    Starts tracemalloc, frames is how much of each traceback to keep.
+    """
+    PROFILER.enable(frames)
+
+
+def is_enabled():
+    return PROFILER.enabled
+
+
+def snapshot(phase, once=False):
+    """
+    Logs memory use at phase, with once=True only the first time phase is reached.
+    """
+    if not PROFILER.enabled:
+        return
+
+    PROFILER.snapshot(phase, once)
+
+
+def add_sizes(size_func):
+    """
+    size_func returns {name: (bytes, entries)}, it is logged with every snapshot.
+    """
+    if not PROFILER.enabled:
+        return
+
+    PROFILER.size_funcs.append(size_func)
+
+
+def finish():
+    """
+    Takes a last snapshot and stops profiling.
+    """
+    PROFILER.finish()
+
+
+__all__ = (
+    'add_sizes',
+    'deep_sizeof',
+    'enable',
+    'finish',
+    'is_enabled',
+    'process_memory',
+    'snapshot',
+    )
@@ -0,0 +1,264 @@
+
+# SPDX-License-Identifier: MIT
+
+"""
+Headless gui benchmark, replays a scripted session and records what every frame costs.
+
+It is started with `pugwash benchmark <results.json> [device]`, tools/pm_gui_benchmark.py sets up a
+synthetic catalogue and runs it for each theme, colour scheme and device with the offscreen video driver.
+"""
+
+import ctypes
+import json
+import time
+
+import sdl2
+
+from loguru import logger
+
+
+## (phase, action, button, amount)
+##   press: press and release button amount times, letting the gui settle after each.
+##   hold:  hold button down for amount ms, so key repeat kicks in.
+##   wait:  run frames for amount ms.
+SCRIPT = (
+    ('startup',     'wait',  None,    500),
+    ('main_menu',   'press', 'DOWN',  3),
+    ('main_menu',   'press', 'UP',    2),
+    ('ports_list',  'press', 'A',     1),
+    ('scroll',      'press', 'DOWN',  30),
+    ('scroll',      'hold',  'DOWN',  2000),
+    ('scroll',      'press', 'R1',    5),
+    ('scroll',      'press', 'L1',    3),
+    ('filters',     'press', 'X',     1),
+    ('filters',     'press', 'DOWN',  6),
+    ('filters',     'press', 'A',     1),
+    ('filters',     'press', 'DOWN',  4),
+    ('filters',     'press', 'A',     1),
+    ('filters',     'press', 'B',     1),
+    ('filters',     'press', 'X',     1),
+    ('filters',     'press', 'UP',    20),
+    ('filters',     'press', 'A',     1),
+    ('filters',     'press', 'B',     1),
+    ('port_info',   'press', 'A',     1),
+    ('port_info',   'press', 'RIGHT', 5),
+    ('port_info',   'press', 'LEFT',  2),
+    ('port_info',   'press', 'UP',    1),
+    ('port_info',   'press', 'DOWN',  1),
+    ('port_info',   'press', 'B',     1),
+    ('ports_list',  'press', 'B',     1),
+    ('main_menu',   'press', 'DOWN',  2),
+    )
+
+## Longest to wait for the gui to go idle after a press, themes with looping animations never do.
+SETTLE_TIME = 250
+
+
+def percentile(values, percent):
+    if len(values) == 0:
+        return 0
+
+    values = sorted(values)
+    return values[min(int(len(values) * percent / 100), len(values) - 1)]
+
+
+def hit_rate(hits, misses):
+    if hits + misses == 0:
+        return None
+
+    return round(hits / (hits + misses), 4)
+
+
+class FrameStats:
+    def __init__(self):
+        self.update_ms = []
+        self.draw_ms = []
+        self.text_renders = []
+        self.text_hits = 0
+        self.text_misses = 0
+        self.image_hits = 0
+        self.image_misses = 0
+
+    def add(self, update_ms, draw_ms, text_renders, text_hits, image_hits, image_misses):
+        self.update_ms.append(update_ms)
+        self.text_renders.append(text_renders)
+
+        if draw_ms is not None:
+            self.draw_ms.append(draw_ms)
+
+        self.text_hits += text_hits
+        self.text_misses += text_renders
+        self.image_hits += image_hits
+        self.image_misses += image_misses
+
+    def merge(self, other):
+        self.update_ms.extend(other.update_ms)
+        self.draw_ms.extend(other.draw_ms)
+        self.text_renders.extend(other.text_renders)
+        self.text_hits += other.text_hits
+        self.text_misses += other.text_misses
+        self.image_hits += other.image_hits
+        self.image_misses += other.image_misses
+
+    def summary(self):
+        def timings(values):
+            return {
+                'mean': round(sum(values) / max(len(values), 1), 3),
+                'p50': round(percentile(values, 50), 3),
+                'p95': round(percentile(values, 95), 3),
+                'max': round(max(values, default=0), 3),
+                }
+
+        return {
+            'frames': len(self.update_ms),
+            'draws': len(self.draw_ms),
+            'update_ms': timings(self.update_ms),
+            'draw_ms': timings(self.draw_ms),
+            'text_renders': sum(self.text_renders),
+            'text_renders_per_frame': round(sum(self.text_renders) / max(len(self.text_renders), 1), 3),
+            'text_renders_max': max(self.text_renders, default=0),
+            'text_hit_rate': hit_rate(self.text_hits, self.text_misses),
+            'image_hit_rate': hit_rate(self.image_hits, self.image_misses),
+            }
+
+
+class GUIBenchmark:
+    def __init__(self, gui, script=SCRIPT):
+        self.gui = gui
+        self.script = script
+        self.phases = {}
+
+        self.keys = {
+            button: key
+            for key, button in gui.events.KEY_MAP.items()
+            if key != sdl2.SDLK_ESCAPE}
+
+        ## Draw as often as the frame rate allows.
+        self.gui.frame_start = sdl2.SDL_GetTicks64()
+
+    def push_key(self, button, pressed):
+        event = sdl2.SDL_Event()
+        event.type = pressed and sdl2.SDL_KEYDOWN or sdl2.SDL_KEYUP
+        event.key.keysym.sym = self.keys[button]
+        sdl2.SDL_PushEvent(ctypes.byref(event))
+
+    def frame(self, phase):
+        gui = self.gui
+        text = gui.text
+        images = gui.images
+
+        text_renders = text.renders + text.glyph_renders
+        text_hits = text.cache_hits
+        image_hits = images.cache_hits
+        image_misses = images.cache_misses
+        draw_counter = gui.draw_counter
+
+        gui.events.handle_events()
+
+        started = time.perf_counter()
+        gui.do_update()
+        updated = time.perf_counter()
+        gui.do_draw()
+        ended = time.perf_counter()
+
+        self.phases.setdefault(phase, FrameStats()).add(
+            (updated - started) * 1000,
+            gui.draw_counter != draw_counter and (ended - updated) * 1000 or None,
+            text.renders + text.glyph_renders - text_renders,
+            text.cache_hits - text_hits,
+            images.cache_hits - image_hits,
+            images.cache_misses - image_misses)
+
+        if gui.timers.elapsed('updates_per_second', 1000, run_first=True):
+            gui.images._clean()
+
+        ## Same pacing as the real loop, but never block waiting for input.
+        remaining = gui.frame_start + gui.frame_time - sdl2.SDL_GetTicks64()
+        if remaining > 0:
+            sdl2.SDL_Delay(remaining)
+
+        gui.frame_start = sdl2.SDL_GetTicks64()
+
+    def settle(self, phase):
+        finish = sdl2.SDL_GetTicks64() + SETTLE_TIME
+
+        while sdl2.SDL_GetTicks64() < finish:
+            self.frame(phase)
+
+            if self.gui.is_idle():
+                break
+
+    def run_for(self, phase, millis):
+        finish = sdl2.SDL_GetTicks64() + millis
+
+        while sdl2.SDL_GetTicks64() < finish:
+            self.frame(phase)
+
+    def run(self):
+        for phase, action, button, amount in self.script:
+            logger.debug(f"benchmark: {phase} {action} {button} {amount}")
+
+            if action == 'press':
+                for i in range(amount):
+                    self.push_key(button, True)
+                    self.frame(phase)
+                    self.push_key(button, False)
+                    self.settle(phase)
+
+            elif action == 'hold':
+                self.push_key(button, True)
+                self.run_for(phase, amount)
+                self.push_key(button, False)
+                self.settle(phase)
+
+            elif action == 'wait':
+                self.run_for(phase, amount)
+                self.settle(phase)
+
+            else:
+                raise ValueError(f"Unknown benchmark action {action}")
+
+        total = FrameStats()
+        for stats in self.phases.values():
+            total.merge(stats)
+
+        return {
+            'phases': {
+                phase: stats.summary()
+                for phase, stats in self.phases.items()},
+            'total': total.summary(),
+            }
+
+
+def run_benchmark(gui, results_file):
+    """
+    Replays SCRIPT against gui and writes the results to results_file.
+    """
+    render_info = sdl2.SDL_RendererInfo()
+    sdl2.SDL_GetRendererInfo(gui.renderer.sdlrenderer, render_info)
+
+    device_info = gui.hm.device
+
+    results = {
+        'device': device_info['device'],
+        'resolution': list(device_info['resolution']),
+        'theme': gui.themes.get_current_theme(),
+        'scheme': gui.themes.get_current_theme_scheme(),
+        'video_driver': (sdl2.SDL_GetCurrentVideoDriver() or b'').decode('utf-8'),
+        'render_driver': render_info.name.decode('utf-8'),
+        'fps': 1000 // max(gui.frame_time, 1),
+        }
+
+    results.update(GUIBenchmark(gui).run())
+
+    with open(results_file, 'w') as fh:
+        json.dump(results, fh, indent=4)
+
+    return results
+
+
+__all__ = (
+    'GUIBenchmark',
+    'SCRIPT',
+    'run_benchmark',
+    )
@@ -13,6 +13,7 @@ import sdl2
 import sdl2.ext
 
 import harbourmaster
+import memprofile
 import pySDL2gui
 
 from pathlib import Path
@@ -190,7 +191,12 @@ class BaseScene:
                 self.music_volume = region_data.get("music-volume", 128)
 
             # print(f"Loading region {region_name}: {region_data}")
-            region = pySDL2gui.Region(self.gui, region_data, region_name, number, rects)
+            ## The theme data is only verified the first time a section is loaded.
+            plan_key = (section, region_name)
+            if plan_key not in self.gui.region_plans:
+                self.gui.region_plans[plan_key] = pySDL2gui.Region(self.gui, region_data, region_name, number, rects)
+
+            region = self.gui.region_plans[plan_key].copy()
 
             if "image" in region_data and "{" in region_data["image"]:
                 image_keys = []
@@ -211,17 +217,18 @@ class BaseScene:
             if "bar" in region_data:
                 found = False
                 text_keys = []
-                bar_copy = region_data["bar"][:]
-                for i in range(len(region_data["bar"])):
-                    bar_item = region_data["bar"][i]
+                new_bar = region_data["bar"][:]
+                for i, bar_item in enumerate(region_data["bar"]):
                     if not isinstance(bar_item, str) or "{" not in bar_item:
                         continue
 
                     found = True
-                    region_data["bar"][i] = self.gui.format_data(bar_item, text_keys)
+                    new_bar[i] = self.gui.format_data(bar_item, text_keys)
 
                 if found:
-                    self.bar_regions[region_name] = (region, bar_copy)
+                    ## Don't modify the theme data, the next scene to load this section needs the original.
+                    region.bar = new_bar
+                    self.bar_regions[region_name] = (region, region_data["bar"])
                     for key in text_keys:
                         self.update_regions.setdefault(key, []).append(region_name)
 
@@ -266,12 +273,10 @@ class BaseScene:
                 new_image = self.gui.format_data(text)
                 # print(f"Loading image {region} -> {text} -> {new_image}")
                 region.image = self.gui.images.load(new_image)
-                self.gui.updated = True
 
             if region_name in self.text_regions:
                 region, text = self.text_regions[region_name]
                 region.text = self.gui.format_data(text)
-                self.gui.updated = True
 
             elif region_name in self.bar_regions:
                 region, bar = self.bar_regions[region_name]
@@ -284,7 +289,6 @@ class BaseScene:
                     new_bar[i] = self.gui.format_data(bar_item)
 
                 region.bar = new_bar
-                self.gui.updated = True
 
     def do_update(self, events):
         for region in self.regions:
@@ -293,12 +297,34 @@ class BaseScene:
 
         return False
 
-    def do_draw(self):
+    def collect_damage(self):
+        """
+        Returns a list of Rects covering the regions that changed since the last call.
+        """
+        damage = []
+        for region in self.regions:
+            rect = region.damage_rect()
+            if rect is not None:
+                damage.append(rect)
+
+        return damage
+
+    def is_animating(self):
+        for region in self.regions:
+            if region.visible and region.is_animating():
+                return True
+
+        return False
+
+    def do_draw(self, clip=None):
         for region in self.regions:
             # print(f"DRAW {region}")
             if not region.visible:
                 continue
 
+            if clip is not None and not region.bounds().colliderect(clip):
+                continue
+
             region.draw()
 
     def set_buttons(self, key_map):
@@ -423,11 +449,14 @@ class DisclaimerScene(BaseScene):
 
         self.last_elapsed = None
 
-    def do_draw(self):
+    def do_update(self, events):
+        super().do_update(events)
+
         elapsed = self.gui.timers.since('disclaimer_wait') // 1000
 
         elapsed = min(elapsed, self.disclaimer_wait)
 
+        ## This used to happen in do_draw, but that only gets called when something changed.
         if elapsed != self.last_elapsed:
             if elapsed < self.disclaimer_wait:
                 self.tags['button_bar'].bar = [f'Wait {self.disclaimer_wait - elapsed} seconds']
@@ -436,15 +465,6 @@ class DisclaimerScene(BaseScene):
 
             self.last_elapsed = elapsed
 
-        super().do_draw()
-
-    def do_update(self, events):
-        super().do_update(events)
-
-        elapsed = self.gui.timers.since('disclaimer_wait') // 1000
-
-        elapsed = min(elapsed, self.disclaimer_wait)
-
         if elapsed == self.disclaimer_wait:
             if events.was_pressed('A'):
                 cfg_data = self.gui.get_config()
@@ -1061,7 +1081,11 @@ class RuntimesScene(BaseScene):
         all_download_size = 0
         all_installed = True
         primary_arch = self.gui.hm.device['primary_arch']
-        for runtime, runtime_data in self.gui.hm.list_runtimes():
+
+        ## Hashing happens in the background, runtime_verified gets called as each one finishes.
+        self.verifying = set(self.gui.verify_runtimes())
+
+        for runtime, runtime_data in self.gui.hm.list_runtimes(verify=False):
             if primary_arch not in runtime_data['remote']:
                 continue
 
@@ -1121,12 +1145,39 @@ class RuntimesScene(BaseScene):
         self.last_verified = None
         if not runtimes:
             self.update_selection()
-            
+
+    def runtime_verified(self, runtime):
+        self.verifying.discard(runtime)
+
+        if runtime == self.last_select:
+            self.update_selection()
+
+    def runtime_status(self, runtime):
+        if runtime not in self.runtimes_data or not self.runtimes[runtime]['installed']:
+            return _('Not Installed')
+
+        if runtime in self.verifying:
+            return _('Verifying')
+
+        runtime_status = self.runtimes_data[runtime].get('local', {}).get('status', 'Unverified')
+
+        return {
+            'Not Installed':    _('Not Installed'),
+            'Update Available': _('Update Available'),
+            'Verified':         _('Verified'),
+            'Unverified':       _('Unverified'),
+            'Broken':           _('Broken'),
+            }.get(runtime_status, _('Installed'))
+
     def update_selection(self):
         runtime_info = self.runtimes[self.last_select]
 
         self.gui.set_data('runtime_info.name', runtime_info['name'])
-        self.gui.set_data('runtime_info.status', runtime_info['installed'] and _('Installed') or _('Not Installed'))
+        if self.last_select == 'all':
+            self.gui.set_data('runtime_info.status', runtime_info['installed'] and _('Installed') or _('Not Installed'))
+
+        else:
+            self.gui.set_data('runtime_info.status', self.runtime_status(self.last_select))
         self.gui.set_data('runtime_info.in_use', len(runtime_info['ports']) > 0 and _('Used') or _('Not Used'))
         self.gui.set_data('runtime_info.ports', harbourmaster.oc_join(runtime_info['ports']))
         self.gui.set_data('runtime_info.download_size', harbourmaster.nice_size(runtime_info['download_size']))
@@ -1716,6 +1767,7 @@ class PortListBaseScene():
         if events.was_pressed('B'):
             self.button_back()
             self.gui.pop_scene()
+            memprofile.snapshot('after scrolling')
             return True
 
         if events.was_pressed('A') and len(self.port_list) > 0:
@@ -4,6 +4,7 @@
 import copy
 import functools
 import gettext
+import hashlib
 import json
 import zipfile
 
@@ -19,6 +20,10 @@ from loguru import logger
 
 _ = gettext.gettext
 
+## Bump this when theme_compile changes what it produces.
+THEME_CACHE_VERSION = 1
+THEME_CACHE_FILE = harbourmaster.HM_TOOLS_DIR / "PortMaster" / "config" / "theme_cache.json"
+
 
 ## TODO: make this all a class, and maybe make it less janky, maybe...
 def extract_requirements(text, strict=False):
@@ -64,7 +69,7 @@ def theme_merge(target, source):
     return temp
 
 
-def theme_check_images(gui, region_data):
+def theme_image_names(region_data):
     for element_name, element_data in region_data.items():
         for element_key, element_value in element_data.items():
             if not isinstance(element_value, str):
@@ -75,12 +80,10 @@ def theme_check_images(gui, region_data):
                     # Fuck it, you're on your own buddy. :D
                     continue
 
-                res = gui.images.load_data_lazy(element_value, {})
-                if res is not None:
-                    logger.debug(f"loaded image {element_value}")
+                yield element_value
 
 
-def theme_apply(gui, section_data, base_data, elements):
+def theme_apply(section_data, base_data, elements, actions):
     new_data = {}
     capabilities = harbourmaster.device_info()['capabilities']
 
@@ -121,14 +124,20 @@ def theme_apply(gui, section_data, base_data, elements):
         else:
             new_data[region_name] = theme_merge(base_data, region_data)
 
-    theme_check_images(gui, new_data)
+    actions.extend(
+        ["image", image_name]
+        for image_name in theme_image_names(new_data))
 
     return new_data
 
 
-def theme_load(gui, theme_file, color_scheme=None):
-    logger.info(f"Loading theme {theme_file}")
+def theme_compile(theme_file, color_scheme=None):
+    """
+    Resolves theme_file for the current device into the section data used by the gui.
 
+    Anything that has to be loaded into the gui is returned as a list of actions
+    for theme_replay, so the result can be cached.
+    """
     with open(theme_file, 'r') as fh:
         theme_data = json.load(fh)
 
@@ -140,6 +149,7 @@ def theme_load(gui, theme_file, color_scheme=None):
     base_data = {}
     elements = {}
     sections = {}
+    actions = []
 
     all_schemes = [
         scheme_name
@@ -233,23 +243,7 @@ def theme_load(gui, theme_file, color_scheme=None):
             elif section_name == "#resources":
                 logger.debug("- loading resources:")
                 for resource_name, resource_data in section_data.items():
-                    resource_set_name = resource_data.get("name", resource_name)
-
-                    if resource_name.lower().rsplit('.', 1)[-1] in ('jpg', 'png', 'svg'):
-                        success = gui.images.load_data(resource_name, resource_data) is None and 'FAIL' or 'OKAY'
-
-                        if resource_set_name != resource_name:
-                            logger.debug(f"  - loading image {resource_name} as {resource_set_name} - [{success}]")
-                        else:
-                            logger.debug(f"  - loading image {resource_name} - [{success}]")
-
-                    elif resource_name.lower().rsplit('.', 1)[-1] in ('ogg', 'wav', 'mp3', 'mod'):
-                        success = gui.sounds.load(resource_name, resource_set_name) is None and 'FAIL' or 'OKAY'
-
-                        if resource_set_name != resource_name:
-                            logger.debug(f"  - loading sound {resource_name} as {resource_set_name} - [{success}]")
-                        else:
-                            logger.debug(f"  - loading sound {resource_name} - [{success}]")
+                    actions.append(["resource", resource_name, resource_data])
 
             elif section_name == "#elements":
                 logger.debug("- loading elements:")
@@ -272,22 +266,22 @@ def theme_load(gui, theme_file, color_scheme=None):
                         last_value = element_value
 
                     if last_value is not None:
-                        gui.default_rects.make_rect(element_data.get('parent', 'root'), element_name, last_value)
+                        actions.append(["rect", element_data.get('parent', 'root'), element_name, last_value])
 
             elif section_name == "#pallet":
                 logger.debug("- loading pallet:")
                 for pallet_name, pallet_value in section_data.items():
-                    gui.pallet[pallet_name] = pallet_value
+                    actions.append(["pallet", pallet_name, pallet_value])
 
             elif section_name == "#override":
                 logger.debug("- loading override:")
                 for override_name, override_value in section_data.items():
-                    gui.override[override_name] = override_value
+                    actions.append(["override", override_name, override_value])
 
             elif section_name == "#animations":
                 logger.debug("- defining animations")
                 for animation_name, animation_options in section_data.items():
-                    gui.animations.add_animation(animation_name, animation_options)
+                    actions.append(["animation", animation_name, animation_options])
 
         else:
             section_name, requirements = extract_requirements(section_name, strict=True)
@@ -301,10 +295,10 @@ def theme_load(gui, theme_file, color_scheme=None):
                     continue
 
                 logger.debug(f"  - loading section {section_name}")
-                sections[section_name] = theme_apply(gui, section_data, sections[section_name], elements)
+                sections[section_name] = theme_apply(section_data, sections[section_name], elements, actions)
             else:
                 logger.debug(f"  - loading section {section_name}")
-                sections[section_name] = theme_apply(gui, section_data, base_data, elements)
+                sections[section_name] = theme_apply(section_data, base_data, elements, actions)
 
     # if harbourmaster.HM_TESTING:
     #     with open('debug.json', 'w') as fh:
@@ -330,9 +324,133 @@ def theme_load(gui, theme_file, color_scheme=None):
         ## Temporary Hack
         sections['featured_ports'] = copy.deepcopy(sections['ports_list'])
 
+    return {
+        "sections": sections,
+        "actions": actions,
+        }
+
+
+def theme_replay(gui, actions):
+    """
+    Loads the resources, rects, pallet, overrides, animations and images recorded by theme_compile.
+    """
+    for action, *args in actions:
+        if action == "resource":
+            resource_name, resource_data = args
+            resource_set_name = resource_data.get("name", resource_name)
+
+            if resource_name.lower().rsplit('.', 1)[-1] in ('jpg', 'png', 'svg'):
+                success = gui.images.load_data(resource_name, resource_data) is None and 'FAIL' or 'OKAY'
+
+                if resource_set_name != resource_name:
+                    logger.debug(f"  - loading image {resource_name} as {resource_set_name} - [{success}]")
+                else:
+                    logger.debug(f"  - loading image {resource_name} - [{success}]")
+
+            elif resource_name.lower().rsplit('.', 1)[-1] in ('ogg', 'wav', 'mp3', 'mod'):
+                success = gui.sounds.load(resource_name, resource_set_name) is None and 'FAIL' or 'OKAY'
+
+                if resource_set_name != resource_name:
+                    logger.debug(f"  - loading sound {resource_name} as {resource_set_name} - [{success}]")
+                else:
+                    logger.debug(f"  - loading sound {resource_name} - [{success}]")
+
+        elif action == "rect":
+            parent, element_name, value = args
+            gui.default_rects.make_rect(parent, element_name, value)
+
+        elif action == "pallet":
+            pallet_name, pallet_value = args
+            gui.pallet[pallet_name] = pallet_value
+
+        elif action == "override":
+            override_name, override_value = args
+            gui.override[override_name] = override_value
+
+        elif action == "animation":
+            animation_name, animation_options = args
+            gui.animations.add_animation(animation_name, animation_options)
+
+        elif action == "image":
+            image_name, = args
+            res = gui.images.load_data_lazy(image_name, {})
+            if res is not None:
+                logger.debug(f"loaded image {image_name}")
+
+
+def theme_cache_key(theme_file, color_scheme):
+    device = harbourmaster.device_info()
+
+    key_data = json.dumps([
+        THEME_CACHE_VERSION,
+        harbourmaster.hash_file(theme_file),
+        color_scheme,
+        list(device["resolution"]),
+        sorted(device["capabilities"]),
+        ])
+
+    return hashlib.md5(key_data.encode('utf-8')).hexdigest()
+
+
+def theme_cache_load(cache_key):
+    if not THEME_CACHE_FILE.is_file():
+        return None
+
+    try:
+        with open(THEME_CACHE_FILE, 'r') as fh:
+            cache_data = json.load(fh)
+
+    except (OSError, ValueError) as err:
+        logger.warning(f"Unable to load theme cache: {err}")
+        return None
+
+    if not isinstance(cache_data, dict) or cache_data.get("key") != cache_key:
+        return None
+
+    return cache_data.get("theme")
+
+
+def theme_cache_save(cache_key, compiled):
+    temp_file = THEME_CACHE_FILE.with_suffix(".tmp")
+
+    try:
+        THEME_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(temp_file, 'w') as fh:
+            json.dump({"key": cache_key, "theme": compiled}, fh)
+
+        temp_file.replace(THEME_CACHE_FILE)
+
+    except OSError as err:
+        logger.warning(f"Unable to save theme cache: {err}")
+
+        if temp_file.is_file():
+            temp_file.unlink()
+
+
+def theme_load(gui, theme_file, color_scheme=None):
+    logger.info(f"Loading theme {theme_file}")
+
+    ## Any resolved regions belong to the previous theme/scheme.
+    gui.region_plans.clear()
+
+    cache_key = theme_cache_key(theme_file, color_scheme)
+    compiled = theme_cache_load(cache_key)
+
+    if compiled is not None:
+        logger.debug("- using compiled theme cache")
+
+    else:
+        compiled = theme_compile(theme_file, color_scheme)
+        if compiled is None:
+            return None
+
+        theme_cache_save(cache_key, compiled)
+
+    theme_replay(gui, compiled["actions"])
 
+    return compiled["sections"]
 
-    return sections
 
 
 class Theme:
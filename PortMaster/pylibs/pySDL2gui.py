@@ -71,6 +71,8 @@ import sdl2
 import sdl2.ext
 import sdl2.sdlmixer
 
+import tracing
+
 from loguru import logger
 
 try:
@@ -120,6 +122,10 @@ class GUI:
         self.pallet = {}
         self.default_rects = NamedRects([0, 0, *self.renderer.logical_size])
         self.formatter = formatter
+        self.updated = True
+
+        ## Resolved Regions for each theme section, see Region.copy
+        self.region_plans = {}
 
     def set_data(self, key, value):
         # This needs to be handled by the gui parent class
@@ -384,6 +390,22 @@ class Rect:
 
         return Rect(x, y, w, h)
 
+    def union(self, other):
+        '''
+        Return new Rect that covers both self and other
+        '''
+        return Rect.from_corners(
+            min(self.x, other.x), min(self.y, other.y),
+            max(self.right, other.right), max(self.bottom, other.bottom))
+
+    def colliderect(self, other):
+        '''
+        Return True if self and other overlap
+        '''
+        return (
+            self.x < other.right and other.x < self.right and
+            self.y < other.bottom and other.y < self.bottom)
+
     @property
     def w(self):
         return self.width
@@ -760,6 +782,14 @@ class AnimationManager:
                 self._gui.set_data(f"animation.{animation_name}", f"{animation['frame']:03d}")
                 continue
 
+    def is_running(self):
+        '''
+        Returns True if any animation is still changing frames.
+        '''
+        return any(
+            not animation['done']
+            for animation in self._animations.values())
+
     def change_scene(self):
         time = sdl2.SDL_GetTicks64()
         for animation_name, animation in self._animations.items():
@@ -1109,6 +1139,10 @@ class ImageManager():
         self.textures = {}
         self.cache = []
 
+        ## Counted for the gui benchmark.
+        self.cache_hits = 0
+        self.cache_misses = 0
+
     def load(self, filename):
         '''
         Load an image file into a Texture or receive a previously cached
@@ -1120,9 +1154,11 @@ class ImageManager():
         if filename in self.cache:
             i = self.cache.index(filename)
             self.cache.insert(0, self.cache.pop(i))
+            self.cache_hits += 1
             return self.images[filename]
 
         elif filename in self.images:
+            self.cache_hits += 1
             return self.images[filename]
 
         else:
@@ -1131,11 +1167,14 @@ class ImageManager():
             if res_filename is None:
                 return None
 
-            surf = sdl2.ext.image.load_img(res_filename)
+            self.cache_misses += 1
+
+            with tracing.span('ImageManager.load', file=str(filename)):
+                surf = sdl2.ext.image.load_img(res_filename)
 
-            texture = sdl2.ext.renderer.Texture(self.renderer, surf)
+                texture = sdl2.ext.renderer.Texture(self.renderer, surf)
 
-            sdl2.SDL_FreeSurface(surf)
+                sdl2.SDL_FreeSurface(surf)
 
             self.textures[filename] = texture
             self.images[filename] = Image(texture, renderer=self.renderer)
@@ -1170,9 +1209,11 @@ class ImageManager():
             if not isinstance(image_size[0], int) or not isinstance(image_size[1], int):
                 return None
 
-            surf = sdl2.ext.image.load_svg(res_filename, width=image_size[0], height=image_size[1])
+            with tracing.span('ImageManager.load_data', file=str(file_name)):
+                surf = sdl2.ext.image.load_svg(res_filename, width=image_size[0], height=image_size[1])
         else:
-            surf = sdl2.ext.image.load_img(res_filename)
+            with tracing.span('ImageManager.load_data', file=str(file_name)):
+                surf = sdl2.ext.image.load_img(res_filename)
 
         texture = sdl2.ext.renderer.Texture(self.renderer, surf)
         sdl2.SDL_FreeSurface(surf)
@@ -1293,6 +1334,18 @@ class ImageManager():
 
         return image
 
+    def memory_sizes(self):
+        '''
+        Rough size of the loaded image textures, {name: (bytes, entries)}.
+        '''
+        pixels = sum(
+            texture.size[0] * texture.size[1]
+            for texture in self.textures.values())
+
+        return {
+            'image_textures': (pixels * 4, len(self.textures)),
+            }
+
     def _clean(self):
         'Remove old images when max_images is reached'
         for filename in self.cache[self.max_images:]:
@@ -1350,6 +1403,218 @@ class FontTTF(sdl2.ext.FontTTF):
         return self.render_text(text, style_key, width=width, align=align, line_h=line_h)
 
 
+class GlyphAtlas:
+    '''
+    Rasterizes the glyphs of a font at a given size once into a single texture.
+
+    Strings are then drawn as a batch of quads from that texture, so drawing
+    a new string does not create a new texture. Kerning and shaping are not
+    applied, so this is only used for single line list items.
+    '''
+    ATLAS_SIZE = (512, 512)
+    PRELOAD = ''.join(chr(c) for c in range(32, 127))
+
+    def __init__(self, gui, font, size):
+        self.gui = gui
+        self.renderer = gui.renderer
+        self.font = font
+        self.size = size
+
+        style_key = f"{size}"
+        if style_key not in font._styles:
+            font.add_style(style_key, size, (255, 255, 255))
+
+        self._ttf_font = font._styles[style_key]['font']
+        self.height = sdl2.sdlttf.TTF_FontHeight(self._ttf_font)
+
+        self._surface = sdl2.SDL_CreateRGBSurfaceWithFormat(
+            0, self.ATLAS_SIZE[0], self.ATLAS_SIZE[1], 32, sdl2.SDL_PIXELFORMAT_ARGB8888)
+
+        if not self._surface:
+            raise GUIRuntimeError(f"Unable to create glyph atlas: {sdl2.SDL_GetError()}")
+
+        self._texture = None
+        self._glyphs = {}
+        self._cursor_x = 0
+        self._cursor_y = 0
+        self._row_height = 0
+        self._dirty = False
+        self._full = False
+        ## SDL_RenderGeometry is new in SDL 2.0.18, before that pysdl2 binds it to a stub that raises.
+        self._use_geometry = sdl2.dll.version_tuple >= (2, 0, 18)
+
+        for char in self.PRELOAD:
+            self._add_glyph(char)
+
+    def __del__(self):
+        self.destroy()
+
+    def destroy(self):
+        if self._texture is not None:
+            self._texture.destroy()
+            self._texture = None
+
+        if self._surface:
+            sdl2.SDL_FreeSurface(self._surface)
+            self._surface = None
+
+    def _add_glyph(self, char):
+        if self._full:
+            return False
+
+        self.gui.text.glyph_renders += 1
+        surface = sdl2.sdlttf.TTF_RenderUTF8_Blended(
+            self._ttf_font, char.encode('utf-8'), sdl2.SDL_Color(255, 255, 255, 255))
+
+        if not surface:
+            ## Some versions of SDL_ttf refuse to render whitespace, just keep the advance.
+            text_w, text_h = c_int(0), c_int(0)
+            if sdl2.sdlttf.TTF_SizeUTF8(self._ttf_font, char.encode('utf-8'), byref(text_w), byref(text_h)) != 0:
+                return False
+
+            self._glyphs[char] = (0, 0, text_w.value, 0)
+            return True
+
+        try:
+            glyph_w, glyph_h = surface.contents.w, surface.contents.h
+
+            if self._cursor_x + glyph_w > self.ATLAS_SIZE[0]:
+                self._cursor_x = 0
+                self._cursor_y += self._row_height + 1
+                self._row_height = 0
+
+            if glyph_w > self.ATLAS_SIZE[0] or self._cursor_y + glyph_h > self.ATLAS_SIZE[1]:
+                logger.debug(f"Glyph atlas {self.font.family_name}:{self.size} is full.")
+                self._full = True
+                return False
+
+            sdl2.SDL_SetSurfaceBlendMode(surface, sdl2.SDL_BLENDMODE_NONE)
+            sdl2.SDL_BlitSurface(
+                surface, None, self._surface,
+                sdl2.SDL_Rect(self._cursor_x, self._cursor_y, glyph_w, glyph_h))
+
+            self._glyphs[char] = (self._cursor_x, self._cursor_y, glyph_w, glyph_h)
+            self._cursor_x += glyph_w + 1
+            self._row_height = max(self._row_height, glyph_h)
+            self._dirty = True
+
+        finally:
+            sdl2.SDL_FreeSurface(surface)
+
+        return True
+
+    def _prepare(self, text):
+        '''
+        Make sure all glyphs of text are in the atlas, and the texture is up to date.
+        '''
+        for char in text:
+            if char not in self._glyphs and not self._add_glyph(char):
+                return False
+
+        if self._dirty or self._texture is None:
+            if self._texture is not None:
+                self._texture.destroy()
+
+            self._texture = sdl2.ext.Texture(self.renderer, self._surface.contents)
+            sdl2.SDL_SetTextureBlendMode(self._texture.tx, sdl2.SDL_BLENDMODE_BLEND)
+            self._dirty = False
+
+        return True
+
+    def text_width(self, text):
+        if not self._prepare(text):
+            return None
+
+        return sum(self._glyphs[char][2] for char in text)
+
+    def draw_text(self, text, area, align, color):
+        '''
+        Draw a single line of text aligned inside area and clipped to it.
+
+        text: text to draw, must not contain newlines
+        area: Rect to align and clip the text to
+        align: Rect point name to align the text to
+        color: 3-tuple rgb color
+
+        returns the Rect the text was positioned at, or None if the text
+        cannot be drawn with the atlas.
+        '''
+        width = self.text_width(text)
+        if width is None:
+            return None
+
+        text_rect = Rect(0, 0, width, self.height)
+        setattr(text_rect, align, getattr(area, align, area.topleft))
+
+        quads = []
+        x = text_rect.x
+        for char in text:
+            glyph_x, glyph_y, glyph_w, glyph_h = self._glyphs[char]
+
+            left   = max(x, area.x)
+            right  = min(x + glyph_w, area.right)
+            top    = max(text_rect.y, area.y)
+            bottom = min(text_rect.y + glyph_h, area.bottom)
+
+            if glyph_h > 0 and right > left and bottom > top:
+                quads.append((
+                    glyph_x + (left - x), glyph_y + (top - text_rect.y),
+                    right - left, bottom - top,
+                    left, top))
+
+            x += glyph_w
+
+        if len(quads) > 0:
+            if not (self._use_geometry and self._draw_geometry(quads, color)):
+                self._draw_copies(quads, color)
+
+        return text_rect
+
+    def _draw_geometry(self, quads, color):
+        atlas_w, atlas_h = self.ATLAS_SIZE
+        vertices = (sdl2.SDL_Vertex * (len(quads) * 4))()
+        indices = (c_int * (len(quads) * 6))()
+        vertex_color = sdl2.SDL_Color(color[0], color[1], color[2], 255)
+
+        for i, (src_x, src_y, quad_w, quad_h, dst_x, dst_y) in enumerate(quads):
+            for j, (off_x, off_y) in enumerate(((0, 0), (quad_w, 0), (quad_w, quad_h), (0, quad_h))):
+                vertex = vertices[i * 4 + j]
+                vertex.position.x = dst_x + off_x
+                vertex.position.y = dst_y + off_y
+                vertex.color = vertex_color
+                vertex.tex_coord.x = (src_x + off_x) / atlas_w
+                vertex.tex_coord.y = (src_y + off_y) / atlas_h
+
+            base = i * 4
+            indices[i * 6: i * 6 + 6] = (base, base + 1, base + 2, base, base + 2, base + 3)
+
+        sdl2.SDL_SetTextureColorMod(self._texture.tx, 255, 255, 255)
+        try:
+            result = sdl2.SDL_RenderGeometry(
+                self.renderer.sdlrenderer, self._texture.tx,
+                vertices, len(vertices), indices, len(indices))
+
+        except RuntimeError as err:
+            logger.debug(f"SDL_RenderGeometry unavailable, falling back to SDL_RenderCopy: {err}")
+            self._use_geometry = False
+            return False
+
+        if result != 0:
+            logger.debug(f"SDL_RenderGeometry failed, falling back to SDL_RenderCopy: {sdl2.SDL_GetError()}")
+            self._use_geometry = False
+            return False
+
+        return True
+
+    def _draw_copies(self, quads, color):
+        sdl2.SDL_SetTextureColorMod(self._texture.tx, *color[:3])
+        for src_x, src_y, quad_w, quad_h, dst_x, dst_y in quads:
+            self.renderer.copy(
+                self._texture,
+                (src_x, src_y, quad_w, quad_h),
+                dstrect=(dst_x, dst_y, quad_w, quad_h))
+
+
 class TextManager:
     MAX_TEXTURES = 50
 
@@ -1358,8 +1623,17 @@ class TextManager:
         self.renderer = gui.renderer
         self._textures = {}
         self._texture_list = collections.deque([])
+        self._atlases = {}
         self.fonts = {}
 
+        ## Draw single line list items via GlyphAtlas instead of a texture per string.
+        self.use_glyph_atlas = False
+
+        ## Counted for the gui benchmark, renders are cache misses.
+        self.cache_hits = 0
+        self.renders = 0
+        self.glyph_renders = 0
+
     def add_font(self, font_name, font_file):
         if font_name not in self.fonts:
             self.fonts[font_name] = FontTTF(str(font_file), 22, (255, 255, 255, 255))
@@ -1373,6 +1647,22 @@ class TextManager:
             key = self._texture_list.pop()
             del self._textures[key]
 
+    def memory_sizes(self):
+        """
+        Rough size of the cached text textures and glyph atlases, {name: (bytes, entries)}.
+        """
+        pixels = sum(
+            texture.size.width * texture.size.height
+            for texture in self._textures.values())
+
+        ## Each atlas keeps its surface as well as the texture.
+        atlas_size = GlyphAtlas.ATLAS_SIZE[0] * GlyphAtlas.ATLAS_SIZE[1] * 4 * 2
+
+        return {
+            'text_textures': (pixels * 4, len(self._textures)),
+            'glyph_atlases': (atlas_size * len(self._atlases), len(self._atlases)),
+            }
+
     def line_height(self, font_name, size):
         if font_name not in self.fonts:
             font_file = self.gui.resources.find(font_name)
@@ -1385,6 +1675,30 @@ class TextManager:
 
         return font.line_height(size)
 
+    def glyph_atlas(self, font_name, size):
+        if font_name not in self.fonts:
+            font_file = self.gui.resources.find(font_name)
+            if font_file is None:
+                raise GUIValueError(f"Unknown font {font_name}.")
+
+            self.add_font(font_name, font_file)
+
+        key = (font_name, size)
+        if key not in self._atlases:
+            self._atlases[key] = GlyphAtlas(self.gui, self.fonts[font_name], size)
+
+        return self._atlases[key]
+
+    def draw_text(self, text, font_name, size, area, *, align="topleft", color=(255, 255, 255)):
+        """
+        Draws a single line of text with the glyph atlas, returns None if it
+        couldn't and the text should be drawn with render_text instead.
+        """
+        if not self.use_glyph_atlas or '\n' in text:
+            return None
+
+        return self.glyph_atlas(font_name, size).draw_text(text, area, align, color)
+
     def render_text(self, text, font_name, size, *, width=None, align="left", line_h=None):
         if font_name not in self.fonts:
             font_file = self.gui.resources.find(font_name)
@@ -1400,14 +1714,17 @@ class TextManager:
 
         key = f"{font.family_name}:{size!r}:{width}:{align}:{line_h}:{text}"
         if key not in self._textures:
-            surface = font.quick_render(text, size, width=width, align=align, line_h=line_h)
-            texture = self._textures[key] = Texture(
-                self.gui,
-                sdl2.ext.Texture(self.renderer, surface))
-            sdl2.SDL_FreeSurface(surface)
+            self.renders += 1
+            with tracing.span('TextManager.render_text'):
+                surface = font.quick_render(text, size, width=width, align=align, line_h=line_h)
+                texture = self._textures[key] = Texture(
+                    self.gui,
+                    sdl2.ext.Texture(self.renderer, surface))
+                sdl2.SDL_FreeSurface(surface)
             self._texture_list.appendleft(key)
             return texture
 
+        self.cache_hits += 1
         self._texture_list.remove(key)
         self._texture_list.appendleft(key)
         return self._textures[key]
@@ -1669,12 +1986,16 @@ class EventManager:
                 controller = sdl2.SDL_GameControllerFromInstanceID(event.cdevice.which)
                 sdl2.SDL_GameControllerClose(controller)
 
+            elif event.type in (sdl2.SDL_RENDER_TARGETS_RESET, sdl2.SDL_RENDER_DEVICE_RESET, sdl2.SDL_WINDOWEVENT):
+                ## Window changed or render target contents were lost, redraw everything.
+                self.gui.updated = True
+
         for key in self.repeat.keys():
             next_repeat = self.repeat[key]
             if next_repeat is not None and next_repeat <= ticks_now:
                 # Trigger was_pressed state
                 self.last_buttons[key] = False
-                print(f'REPEAT {key} {ticks_now - next_repeat}')
+                logger.debug(f'REPEAT {key} {ticks_now - next_repeat}')
                 self.repeat[key] = ticks_now + self.REPEAT_RATE
 
     def any_pressed(self):
@@ -2020,6 +2341,37 @@ class Region:
         "mul":   sdl2.SDL_BLENDMODE_MUL,   # Color multiplication (SDL >= 2.0.12)
         }
 
+    ALIGN_TO_TEXTALIGN = {
+        'center': 'center',
+        'topleft': 'left',
+        'midleft': 'left',
+        'bottomleft': 'left',
+        'topcenter': 'center',
+        'bottomcenter': 'center',
+        'topright': 'right',
+        'midright': 'right',
+        'bottomright': 'right',
+        'midtop': 'center',
+        'midbottom': 'center',
+        }
+
+    ALIGN_OPPOSITE = {
+        'midtop': 'midbottom',
+        'midbottom': 'midtop',
+        'topcenter': 'bottomcenter',
+        'bottomcenter': 'topcenter',
+        'center': 'center',
+        'topleft': 'bottomright',
+        'midleft': 'midright',
+        'bottomleft': 'topright',
+        'topright': 'bottomleft',
+        'midright': 'midleft',
+        'bottomright': 'topleft',
+        }
+
+    ## Maximum number of list row bar layouts kept by draw.
+    MAX_BAR_LAYOUTS = 64
+
     DATA = {}
 
     def __init__(self, gui, data, name=None, number=0, rects=None):
@@ -2161,6 +2513,112 @@ class Region:
             # Trigger text setting code
             self.text = self._text
 
+        self._drawn_state = None
+        self._drawn_rect = None
+        self._text_area = None
+        self._bar_layouts = {}
+
+    def copy(self):
+        '''
+        Returns a new Region with the same resolved theme attributes, without
+        verifying the theme data again.
+
+        Images are looked up again as they may have been unloaded since.
+        '''
+        region = object.__new__(self.__class__)
+        region.__dict__.update(self.__dict__)
+
+        region.area = self.area.copy()
+
+        region.image = self.images.load(self._dict.get('image'))
+        region.pimage = self.images.load(self._dict.get('pimage'))
+        if region.patch and not region.pimage:
+            region.pimage = region.image
+            region.image = None
+
+        region.pointer = self.images.load(self._dict.get('pointer'))
+        region._bar = region._verify_bar('bar', optional=True, align=region.align)
+
+        if self.list is not None:
+            region.list = list(self.list)
+            region._list_selected = list(self._list_selected)
+
+        if self.options is not None:
+            region.options = list(self.options)
+
+        if self.info is not None:
+            region.info = list(self.info)
+
+        region.scroll_last_update = sdl2.SDL_GetTicks64()
+        region._drawn_state = None
+        region._drawn_rect = None
+        region._text_area = None
+        region._bar_layouts = {}
+
+        return region
+
+    def draw_state(self):
+        '''
+        Returns a tuple of everything that changes how this Region is drawn.
+        '''
+        return (
+            self.visible,
+            self.area.tuple(),
+            self._text,
+            self.image,
+            self.pimage,
+            self._bar and tuple(self._bar),
+            self.list and tuple(self.list),
+            tuple(getattr(self, '_list_selected', None) or ()),
+            self.selected,
+            self.selectedx,
+            self.scroll_pos,
+            self.progress_amount,
+            )
+
+    def is_animating(self):
+        '''
+        Returns True if the Region is autoscrolling its text.
+        '''
+        return self.autoscroll is not None and self.scroll_max > 0
+
+    def bounds(self):
+        '''
+        Returns the Rect this Region may draw into, including the list pointer.
+        '''
+        rect = self.area.copy()
+
+        if self.pointer is not None:
+            if self.pointer_size is not None:
+                pointer_w, pointer_h = self.pointer_size
+            else:
+                pointer_w, pointer_h = self.pointer.srcrect.w, self.pointer.srcrect.h
+
+            rect.inflate(
+                (pointer_w + abs(self.pointer_offset[0])) * 2,
+                (pointer_h + abs(self.pointer_offset[1])) * 2)
+
+        return rect
+
+    def damage_rect(self):
+        '''
+        Returns the Rect that needs to be redrawn since the last call, or None
+        if nothing has changed.
+        '''
+        state = self.draw_state()
+        if state == self._drawn_state:
+            return None
+
+        rect = self.bounds()
+        old_rect = self._drawn_rect
+
+        self._drawn_state = state
+        self._drawn_rect = rect
+
+        if old_rect is not None:
+            return rect.union(old_rect)
+
+        return rect
 
     def draw(self, area=None, text=None, image=None):
         '''
@@ -2174,10 +2632,7 @@ class Region:
         area = area or self.area.copy()
         image = image or self.image
 
-        if self.blendmode not in self.BLEND_MODES:
-            self.blendmode = None
-
-        self.gui.renderer.blendmode = self.BLEND_MODES[self.blendmode]
+        self.gui.renderer.blendmode = self.BLEND_MODES.get(self.blendmode, sdl2.SDL_BLENDMODE_NONE)
 
         # FILL AND OUTLINE
         if self.patch:
@@ -2302,7 +2757,11 @@ class Region:
             if color_mod is not None:
                 image.set_color_mod(color_mod)
 
-        text_area = area.inflated(-self.borderx * 2, -self.bordery * 2)
+        area_key = area.tuple()
+        if self._text_area is None or self._text_area[0] != area_key:
+            self._text_area = (area_key, area.inflated(-self.borderx * 2, -self.bordery * 2))
+
+        text_area = self._text_area[1]
 
         # if self.font and self.fontsize:
         #     self.fonts.load(self.font, self.fontsize)
@@ -2310,36 +2769,6 @@ class Region:
         #     return
 
         # RENDER BAR (toolbarish)
-        align_to_textalign = {
-            'center': 'center',
-            'topleft': 'left',
-            'midleft': 'left',
-            'bottomleft': 'left',
-            'topcenter': 'center',
-            'bottomcenter': 'center',
-            'topright': 'right',
-            'midright': 'right',
-            'bottomright': 'right',
-            'midtop': 'center',
-            'midbottom': 'center',
-            }
-
-        align_opposite = {
-            'midtop': 'midbottom',
-            'midbottom': 'midtop',
-            'bottomcenter': 'topcenter',
-            'topcenter': 'bottomcenter',
-            'bottomcenter': 'topcenter',
-            'center': 'center',
-            'topleft': 'bottomright',
-            'midleft': 'midright',
-            'bottomleft': 'topright',
-            'bottomcenter': 'topcenter',
-            'topright': 'bottomleft',
-            'midright': 'midleft',
-            'bottomright': 'topleft',
-            }
-
         if self._bar:
             self._draw_bar(text_area, self._bar)
 
@@ -2361,7 +2790,7 @@ class Region:
                         self.font,
                         self.fontsize,
                         width=text_area.width,
-                        align=align_to_textalign[self.align],
+                        align=self.ALIGN_TO_TEXTALIGN[self.align],
                         line_h=int(itemsize))
 
                 else:
@@ -2369,7 +2798,7 @@ class Region:
                         self._text,
                         self.font,
                         self.fontsize,
-                        align=align_to_textalign[self.align],
+                        align=self.ALIGN_TO_TEXTALIGN[self.align],
                         line_h=int(itemsize),
                         )
 
@@ -2436,7 +2865,14 @@ class Region:
                     self.renderer.fill(irect, self.alt_fill)
 
                 if isinstance(t, (list, tuple)):
-                    bar = self._verify_bar(None, t, irect, align=align_to_textalign[self.align])
+                    bar_key = (tuple(t), irect.tuple())
+                    bar = self._bar_layouts.get(bar_key)
+                    if bar is None:
+                        if len(self._bar_layouts) >= self.MAX_BAR_LAYOUTS:
+                            self._bar_layouts.clear()
+
+                        bar = self._bar_layouts[bar_key] = self._verify_bar(
+                            None, t, irect, align=self.ALIGN_TO_TEXTALIGN[self.align])
 
                     x = self.bar_selected(i)
                     # if i == self.selected:
@@ -2458,7 +2894,7 @@ class Region:
 
                     texture = self.texts.render_text(
                         t,
-                        self.font, self.fontsize, align=align_to_textalign[self.align])
+                        self.font, self.fontsize, align=self.ALIGN_TO_TEXTALIGN[self.align])
 
                     x, y, self.scroll_max, alignment = autoscroll_text(
                         texture.size,
@@ -2504,8 +2940,8 @@ class Region:
                             if self.pointer_attach == 'list':
                                 drawn_rect = irect
 
-                            (x, y) = getattr(drawn_rect, align_opposite[self.pointer_align[0]])
-                            setattr(pointer_rect, align_opposite[self.pointer_align[1]], (x, y))
+                            (x, y) = getattr(drawn_rect, self.ALIGN_OPPOSITE[self.pointer_align[0]])
+                            setattr(pointer_rect, self.ALIGN_OPPOSITE[self.pointer_align[1]], (x, y))
 
                             pointer_rect.x -= self.pointer_offset[0]
                             pointer_rect.y -= self.pointer_offset[1]
@@ -2527,18 +2963,25 @@ class Region:
                     else:
                         fontcolor = self.font_color
 
-                    texture = self.texts.render_text(
-                        t,
-                        self.font, self.fontsize, align=align_to_textalign[self.align])
+                    drawn_rect = None
+                    if self.textclip:
+                        drawn_rect = self.texts.draw_text(
+                            t, self.font, self.fontsize, irect,
+                            align=self.align, color=fontcolor)
 
-                    x, y = getattr(irect, self.align, irect.topleft)
-                    setattr(texture.size, self.align, (x, y))
+                    if drawn_rect is None:
+                        texture = self.texts.render_text(
+                            t,
+                            self.font, self.fontsize, align=self.ALIGN_TO_TEXTALIGN[self.align])
 
-                    with texture.with_color_mod(fontcolor):
-                        if self.textclip:
-                            texture.draw_in(irect, clip=True)
-                        else:
-                            texture.draw_in(irect, fit=True)
+                        x, y = getattr(irect, self.align, irect.topleft)
+                        setattr(texture.size, self.align, (x, y))
+
+                        with texture.with_color_mod(fontcolor):
+                            if self.textclip:
+                                texture.draw_in(irect, clip=True)
+                            else:
+                                texture.draw_in(irect, fit=True)
 
                 irect.y += itemsize + self.item_spacer
                 i += 1
@@ -2560,8 +3003,6 @@ class Region:
                 if self.selected == 1:
                     self.selected += 1
 
-        self.gui.updated = True
-
     def add_option(self, option, text, index=0, description=None, in_section=False):
         if self.list is None:
             self.list = []
@@ -2591,7 +3032,6 @@ class Region:
             # We add a blank before a "section" in the list.
             self.add_option(None, "", in_section=True)
 
-        self.gui.updated = True
         self.descriptions.append(description)
         self.options.append(option)
         self.list.append(text)
@@ -2736,7 +3176,6 @@ class Region:
 
         if self._bar is None:
             self._list_selected[selected] = new_index
-            self.gui.updated = True
 
         else:
             self.selectedx = self.new_index
@@ -2867,9 +3306,7 @@ class Region:
 
                 updated = True
 
-        if updated:
-            self.gui.updated = True
-
+        ## Redrawing is picked up by damage_rect.
         return updated
 
     @property
@@ -3354,6 +3791,27 @@ def deep_print(d, name=None, l=0, file=None):
             print(f'{"  " * (l + 1)}{k}: {v}', file=file)
 
 
+def merge_rects(rects):
+    '''
+    Merge overlapping Rects, returns a new list of Rects that covers the same area.
+    '''
+    merged = []
+    for rect in rects:
+        rect = rect.copy()
+
+        i = 0
+        while i < len(merged):
+            if merged[i].colliderect(rect):
+                rect = rect.union(merged.pop(i))
+                i = 0
+            else:
+                i += 1
+
+        merged.append(rect)
+
+    return merged
+
+
 def range_list(start, low, high, step):
     '''
     Creates a list of strings representing numbers within a given
@@ -0,0 +1,292 @@
+
+# SPDX-License-Identifier: MIT
+
+"""
+Lightweight tracing: nested spans, counters and histograms.
+
+Everything is a no-op until enable() is called (`--trace`, or HM_TRACE / HM_PERFTEST in the environment).
+At exit finish() writes a Chrome trace-event json file, which can be opened in chrome://tracing or
+https://ui.perfetto.dev, and returns a summary table for the log.
+"""
+
+import functools
+import json
+import os
+import random
+import threading
+import time
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def set(self, **kwargs):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'args', 'started')
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.started = None
+
+    def __enter__(self):
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *args):
+        self.tracer._add_span(self.name, self.started, time.perf_counter_ns(), self.args)
+        return False
+
+    def set(self, **kwargs):
+        """
+        Add more args to the span, for things only known once it is done.
+        """
+        self.args.update(kwargs)
+
+
+class Histogram:
+    ## Percentiles come from a fixed size random sample, so long sessions don't grow without bound.
+    MAX_SAMPLES = 4096
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.samples = []
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+
+        if self.min is None or value < self.min:
+            self.min = value
+
+        if self.max is None or value > self.max:
+            self.max = value
+
+        if len(self.samples) < self.MAX_SAMPLES:
+            self.samples.append(value)
+
+        else:
+            index = random.randrange(self.count)
+            if index < self.MAX_SAMPLES:
+                self.samples[index] = value
+
+    def percentile(self, percent):
+        if len(self.samples) == 0:
+            return 0
+
+        samples = sorted(self.samples)
+        return samples[min(int(len(samples) * percent / 100), len(samples) - 1)]
+
+
+class Tracer:
+    ## Past this many events spans are still summarised but left out of the trace file.
+    MAX_EVENTS = 100000
+
+    def __init__(self):
+        self.enabled = False
+        self.trace_file = None
+        self.started = time.perf_counter_ns()
+        self.events = []
+        self.dropped = 0
+        self.counters = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def enable(self, trace_file=None):
+        self.enabled = True
+        self.trace_file = trace_file
+
+    def span(self, name, **args):
+        if not self.enabled:
+            return _NULL_SPAN
+
+        return _Span(self, name, args)
+
+    def _add_span(self, name, started, ended, args):
+        duration_ms = (ended - started) / 1000000
+
+        with self._lock:
+            self.histograms.setdefault(name, Histogram()).add(duration_ms)
+
+            if len(self.events) >= self.MAX_EVENTS:
+                self.dropped += 1
+                return
+
+            event = {
+                'name': name,
+                'ph': 'X',
+                'ts': (started - self.started) / 1000,
+                'dur': (ended - started) / 1000,
+                'pid': os.getpid(),
+                'tid': threading.get_ident(),
+                }
+
+            if args:
+                event['args'] = args
+
+            self.events.append(event)
+
+    def count(self, name, value=1):
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self.counters[name] = total = self.counters.get(name, 0) + value
+
+            if len(self.events) < self.MAX_EVENTS:
+                self.events.append({
+                    'name': name,
+                    'ph': 'C',
+                    'ts': (time.perf_counter_ns() - self.started) / 1000,
+                    'pid': os.getpid(),
+                    'args': {name: total},
+                    })
+
+    def observe(self, name, value):
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self.histograms.setdefault(name, Histogram()).add(value)
+
+    def summary(self):
+        """
+        Returns the summary table as log lines.
+        """
+        lines = [f"trace: {'name':<40} | {'count':>7} | {'total ms':>10} | {'mean':>8} | {'p50':>8} | {'p95':>8} | {'max':>8}"]
+
+        with self._lock:
+            histograms = sorted(self.histograms.items(), key=lambda item: item[1].total, reverse=True)
+            counters = sorted(self.counters.items())
+
+        for name, histogram in histograms:
+            lines.append(
+                f"trace: {name:<40} | {histogram.count:>7} | {histogram.total:>10.1f} | "
+                f"{histogram.total / histogram.count:>8.2f} | {histogram.percentile(50):>8.2f} | "
+                f"{histogram.percentile(95):>8.2f} | {histogram.max:>8.2f}")
+
+        for name, total in counters:
+            lines.append(f"trace: {name:<40} | {total:>7}")
+
+        if self.dropped > 0:
+            lines.append(f"trace: {self.dropped} spans left out of the trace file")
+
+        return lines
+
+    def write(self, trace_file):
+        with self._lock:
+            data = {
+                'traceEvents': list(self.events),
+                'displayTimeUnit': 'ms',
+                }
+
+        tmp_file = f"{trace_file}.tmp"
+        with open(tmp_file, 'w') as fh:
+            json.dump(data, fh)
+
+        os.replace(tmp_file, trace_file)
+
+
+TRACER = Tracer()
+
+
+def enable(trace_file=None):
+    """
+    Start tracing, trace_file is where finish() writes the Chrome trace.
+    """
+    TRACER.enable(trace_file)
+
+
+def is_enabled():
+    return TRACER.enabled
+
+
+def span(name, **args):
+    """
+    Times a block, `with tracing.span('load_ports'):`
+    """
+    if not TRACER.enabled:
+        return _NULL_SPAN
+
+    return _Span(TRACER, name, args)
+
+
+def traced(name=None):
+    """
+    Decorator that wraps each call of a function in a span.
+    """
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def traced_wrapper(*args, **kwargs):
+            if not TRACER.enabled:
+                return func(*args, **kwargs)
+
+            with _Span(TRACER, span_name, {}):
+                return func(*args, **kwargs)
+
+        return traced_wrapper
+
+    return decorator
+
+
+def count(name, value=1):
+    TRACER.count(name, value)
+
+
+def observe(name, value):
+    """
+    Add a value to a histogram, like frame times.
+    """
+    TRACER.observe(name, value)
+
+
+def finish():
+    """
+    Writes the trace file and returns the summary lines, or an empty list if tracing was never enabled.
+    """
+    if not TRACER.enabled:
+        return []
+
+    lines = TRACER.summary()
+
+    if TRACER.trace_file is not None:
+        try:
+            TRACER.write(TRACER.trace_file)
+            lines.append(f"trace: written to {TRACER.trace_file}")
+
+        except OSError as err:
+            lines.append(f"trace: unable to write {TRACER.trace_file}: {err}")
+
+    TRACER.enabled = False
+    return lines
+
+
+if os.environ.get('HM_TRACE', os.environ.get('HM_PERFTEST', None)) is not None:
+    enable()
+
+
+__all__ = (
+    'count',
+    'enable',
+    'finish',
+    'is_enabled',
+    'observe',
+    'span',
+    'traced',
+    )
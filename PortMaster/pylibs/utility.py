@@ -1,23 +1,181 @@
 
 # SPDX-License-Identifier: MIT
 
+import functools
+import importlib
 import os
 import sys
+import time
 
-import colorama
-from ansimarkup import AnsiMarkup, parse as ansiparse
 
+################################################################################
+## Lazy imports
+class LazyModule:
+    """
+    Stands in for a module until an attribute is first used, then imports it.
+
+    Used for the heavy modules (requests, png, ...) that a lot of runs never touch.
+    """
+    def __init__(self, name):
+        self.__dict__['_lazy_name'] = name
+        self.__dict__['_lazy_module'] = None
+
+    def _lazy_load(self):
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            module = importlib.import_module(self.__dict__['_lazy_name'])
+            self.__dict__['_lazy_module'] = module
+
+        return module
+
+    def __getattr__(self, name):
+        return getattr(self._lazy_load(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._lazy_load(), name, value)
+
+    def __repr__(self):
+        if self.__dict__['_lazy_module'] is None:
+            return f"<lazy module {self.__dict__['_lazy_name']!r}>"
+
+        return repr(self.__dict__['_lazy_module'])
+
+
+def lazy_import(name):
+    """
+    Returns the module if it is already loaded, otherwise a LazyModule for it.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    return LazyModule(name)
+
+
+################################################################################
+## Startup import profiling
+class ImportProfiler:
+    """
+    A meta path finder that times every module as it is executed, like `python -X importtime`.
+    """
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.records = []
+        self._stack = []
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+
+        else:
+            return None
+
+        loader = spec.loader
+        ## Builtin and frozen importers are classes, patching those would time everything after.
+        if loader is None or isinstance(loader, type) or not hasattr(loader, 'exec_module'):
+            return spec
+
+        exec_module = loader.exec_module
+
+        def timed_exec_module(module):
+            self._stack.append(0)
+            started = time.perf_counter_ns()
+            try:
+                exec_module(module)
+
+            finally:
+                cumulative = (time.perf_counter_ns() - started) // 1000
+                children = self._stack.pop()
+                if self._stack:
+                    self._stack[-1] += cumulative
+
+                self.records.append((len(self._stack), fullname, cumulative - children, cumulative))
+
+        try:
+            loader.exec_module = timed_exec_module
+
+        except AttributeError:
+            pass
 
-am = AnsiMarkup(tags={
-    'warn': ansiparse('<b><y>'),
-    'error': ansiparse('<b><r>'),
-    'info': ansiparse('<b><e>'),
-    'debug': ansiparse('<b><m>'),
-    })
+        return spec
 
+    def report(self, limit=10):
+        """
+        Returns the breakdown as log lines, the module table followed by the slowest imports.
+        """
+        lines = ["import time: self [us] | cumulative | imported package"]
+        for depth, name, self_us, cumulative_us in self.records:
+            lines.append(f"import time: {self_us:>9} | {cumulative_us:>10} | {'  ' * depth}{name}")
 
+        total_us = sum(
+            cumulative_us
+            for depth, name, self_us, cumulative_us in self.records
+            if depth == 0)
+
+        lines.append(
+            f"startup: {(time.perf_counter() - self.started) * 1000:.1f} ms, "
+            f"imports: {total_us / 1000:.1f} ms for {len(self.records)} modules")
+
+        slowest = sorted(self.records, key=lambda record: record[2], reverse=True)[:limit]
+        for depth, name, self_us, cumulative_us in slowest:
+            lines.append(f"slowest import: {name} {self_us / 1000:.1f} ms")
+
+        return lines
+
+
+__import_profiler = None
+
+
+def profile_imports():
+    """
+    Starts timing imports, see `--profile-startup`.
+    """
+    global __import_profiler
+
+    if __import_profiler is None:
+        __import_profiler = ImportProfiler()
+        sys.meta_path.insert(0, __import_profiler)
+
+
+def import_profile_report(limit=10):
+    """
+    Stops timing imports and returns the report lines, or an empty list if it was never started.
+    """
+    global __import_profiler
+
+    if __import_profiler is None:
+        return []
+
+    if __import_profiler in sys.meta_path:
+        sys.meta_path.remove(__import_profiler)
+
+    lines = __import_profiler.report(limit)
+    __import_profiler = None
+    return lines
+
+
+################################################################################
+## Colour output
 __colorama = None
 __output_fh = None
+__output_markup = False
+
+
+@functools.lru_cache(maxsize=None)
+def _markup():
+    ## ansimarkup and colorama are only loaded once something is actually printed.
+    from ansimarkup import AnsiMarkup, parse as ansiparse
+
+    return AnsiMarkup(tags={
+        'warn': ansiparse('<b><y>'),
+        'error': ansiparse('<b><r>'),
+        'info': ansiparse('<b><e>'),
+        'debug': ansiparse('<b><m>'),
+        })
 
 
 def to_str(data):
@@ -34,10 +192,17 @@ def in_terminal():
     return os.isatty(sys.stdout.fileno()) and os.isatty(sys.stdin.fileno())
 
 
-def do_cprint_output(file_handle):
+def do_cprint_output(file_handle, markup=False):
+    """
+    Send cprint output to file_handle, None goes back to stdout.
+
+    Colour tags are stripped unless markup is True, then they are passed through as is.
+    """
     global __output_fh
+    global __output_markup
 
     __output_fh = file_handle
+    __output_markup = markup
 
 
 def do_color(mode=None):
@@ -48,11 +213,13 @@ def do_color(mode=None):
 
     if mode is True:
         if __colorama is None or __colorama is False:
+            import colorama
             colorama.init(strip=False)
             __colorama = True
 
     elif mode is False:
         if __colorama is True:
+            import colorama
             colorama.init(strip=True)
         __colorama = False
 
@@ -63,8 +230,10 @@ def cprint(*args, **kwargs):
     if __colorama is None:
         do_color()
 
+    am = _markup()
+
     if __output_fh is not None:
-        color_func = am.strip
+        color_func = __output_markup and to_str or am.strip
         kwargs.setdefault('file', __output_fh)
     elif 'file' in kwargs:
         color_func = am.strip
@@ -80,11 +249,12 @@ def cprint(*args, **kwargs):
         **kwargs)
 
 def cstrip(arg):
-    return am.strip(to_str(arg))
+    return _markup().strip(to_str(arg))
 
 __all__ = (
     'cprint',
     'cstrip',
     'do_color',
     'in_terminal',
+    'lazy_import',
     )
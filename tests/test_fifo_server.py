@@ -0,0 +1,85 @@
+
+# SPDX-License-Identifier: MIT
+
+import builtins
+import socket
+import sys
+import threading
+import time
+
+from pathlib import Path
+
+PORTMASTER_DIR = Path(__file__).resolve().parent.parent / 'PortMaster'
+sys.path.insert(0, str(PORTMASTER_DIR / 'exlibs'))
+sys.path.insert(0, str(PORTMASTER_DIR / 'pylibs'))
+
+builtins.PORTMASTER_DEBUG = False
+
+import pytest
+
+
+@pytest.fixture
+def fifo_server(tmp_path, monkeypatch):
+    for name in ('HM_TOOLS_DIR', 'HM_PORTS_DIR', 'HM_SCRIPTS_DIR'):
+        monkeypatch.setenv(name, str(tmp_path))
+
+    from harbourmaster.util import FifoServer
+
+    with FifoServer(None, socket_file=tmp_path / 'hm.sock', socket_mode=0o600) as server:
+        yield server
+
+
+def connect(server, line):
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(str(server.socket_file))
+    client.sendall(f"{line}\n".encode('utf-8'))
+
+    for i in range(10):
+        fifo_requests = server.poll(1)
+        if len(fifo_requests) > 0:
+            return client, fifo_requests[0]
+
+    raise AssertionError("request never arrived")
+
+
+def test_send_waits_for_slow_reader(fifo_server):
+    client, request = connect(fifo_server, "list")
+    assert request.line == "list"
+
+    received = []
+
+    def slow_reader():
+        ## Let the socket buffer fill up before reading.
+        time.sleep(0.5)
+
+        while True:
+            data = client.recv(4096)
+            if data == b"":
+                break
+
+            received.append(data)
+            time.sleep(0.001)
+
+    reader = threading.Thread(target=slow_reader)
+    reader.start()
+
+    lines = [f"{i:06d} " + "x" * 200 for i in range(5000)]
+    for line in lines:
+        request.send(line)
+
+    request.reply("DONE")
+    fifo_server.close()
+    reader.join(10)
+
+    assert b"".join(received).decode('utf-8') == "".join(f"{line}\n" for line in lines + ["DONE"])
+
+
+def test_send_after_drop_is_ignored(fifo_server):
+    client, request = connect(fifo_server, "list")
+
+    fifo_server._drop(request.client)
+    request.send("ignored")
+    request.reply("DONE")
+
+    client.settimeout(1)
+    assert client.recv(4096) == b""
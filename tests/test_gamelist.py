@@ -0,0 +1,77 @@
+
+# SPDX-License-Identifier: MIT
+
+import builtins
+import sys
+import xml.etree.ElementTree as ET
+
+from pathlib import Path
+
+PORTMASTER_DIR = Path(__file__).resolve().parent.parent / 'PortMaster'
+sys.path.insert(0, str(PORTMASTER_DIR / 'exlibs'))
+sys.path.insert(0, str(PORTMASTER_DIR / 'pylibs'))
+
+builtins.PORTMASTER_DEBUG = False
+
+import pytest
+
+
+@pytest.fixture
+def platform(tmp_path, monkeypatch):
+    for name in ('HM_TOOLS_DIR', 'HM_PORTS_DIR', 'HM_SCRIPTS_DIR'):
+        monkeypatch.setenv(name, str(tmp_path))
+
+    from harbourmaster.platform import PlatformBase
+
+    class FakeHarbourMaster:
+        ports_dir = tmp_path
+        scripts_dir = tmp_path
+
+    class GamelistPlatform(PlatformBase):
+        def gamelist_file(self):
+            return tmp_path / 'gamelist.xml'
+
+    return GamelistPlatform(FakeHarbourMaster())
+
+
+def write_gameinfo(ports_dir, port_name, text):
+    gameinfo_file = ports_dir / port_name / 'gameinfo.xml'
+    gameinfo_file.parent.mkdir()
+    gameinfo_file.write_text(text)
+    return gameinfo_file
+
+
+def gameinfo(port_name):
+    return f"<gameList><game><path>./{port_name}.sh</path><name>{port_name}</name></game></gameList>"
+
+
+def gamelist_paths(ports_dir):
+    root = ET.parse(ports_dir / 'gamelist.xml').getroot()
+    return [game.find('path').text for game in root.iter('game')]
+
+
+def test_session_skips_broken_gameinfo(platform, tmp_path):
+    gameinfo_files = [
+        write_gameinfo(tmp_path, 'good1', gameinfo('good1')),
+        write_gameinfo(tmp_path, 'broken', "<gameList><game>"),
+        write_gameinfo(tmp_path, 'good2', gameinfo('good2')),
+        ]
+
+    with platform.gamelist_session():
+        results = [platform.gamelist_add(gameinfo_file) for gameinfo_file in gameinfo_files]
+
+    assert results == [True, False, True]
+    assert gamelist_paths(tmp_path) == ['./good1.sh', './good2.sh']
+
+
+def test_session_skips_gameinfo_without_path(platform, tmp_path):
+    gameinfo_files = [
+        write_gameinfo(tmp_path, 'nopath', "<gameList><game><name>nopath</name></game></gameList>"),
+        write_gameinfo(tmp_path, 'good', gameinfo('good')),
+        ]
+
+    with platform.gamelist_session():
+        results = [platform.gamelist_add(gameinfo_file) for gameinfo_file in gameinfo_files]
+
+    assert results == [False, True]
+    assert gamelist_paths(tmp_path) == ['./good.sh']
@@ -0,0 +1,99 @@
+
+# SPDX-License-Identifier: MIT
+
+import sys
+import time
+
+from pathlib import Path
+
+PORTMASTER_DIR = Path(__file__).resolve().parent.parent / 'PortMaster'
+sys.path.insert(0, str(PORTMASTER_DIR / 'exlibs'))
+sys.path.insert(0, str(PORTMASTER_DIR / 'pylibs'))
+
+import pytest
+
+from loguru import logger
+
+import logsink
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    handler_ids = []
+
+    def add_sink(mode, **kwargs):
+        handler_ids.append(logger.add(
+            logsink.LogFileSink(tmp_path / 'log.txt', mode, **kwargs),
+            level="DEBUG", colorize=False, format="{level} {message}"))
+
+    yield tmp_path / 'log.txt', add_sink
+
+    for handler_id in handler_ids:
+        try:
+            logger.remove(handler_id)
+        except ValueError:
+            pass
+
+
+def read_lines(file_name):
+    if not file_name.is_file():
+        return []
+
+    return file_name.read_text().splitlines()
+
+
+def test_queued_waits_for_flush_interval(log_file):
+    file_name, add_sink = log_file
+    add_sink('queued', flush_interval=0.5)
+
+    for i in range(5):
+        logger.info(f"message {i}")
+
+    assert read_lines(file_name) == []
+
+    time.sleep(1.0)
+    assert read_lines(file_name) == [f"INFO message {i}" for i in range(5)]
+
+
+def test_queued_writes_errors_straight_away(log_file):
+    file_name, add_sink = log_file
+    add_sink('queued', flush_interval=60)
+
+    logger.info("before")
+    logger.error("broken")
+
+    assert read_lines(file_name) == ["INFO before", "ERROR broken"]
+
+
+def test_ring_writes_only_on_error_or_exit(log_file):
+    file_name, add_sink = log_file
+    add_sink('ring', ring_size=3)
+
+    for i in range(5):
+        logger.info(f"message {i}")
+
+    time.sleep(0.2)
+    assert read_lines(file_name) == []
+
+    logger.error("broken")
+    assert read_lines(file_name) == ["INFO message 3", "INFO message 4", "ERROR broken"]
+
+    logger.info("after")
+    assert len(read_lines(file_name)) == 3
+
+    logger.remove()
+    assert read_lines(file_name)[-1] == "INFO after"
+
+
+def test_rate_limits_debug_messages(log_file):
+    file_name, add_sink = log_file
+    add_sink('queued', flush_interval=60)
+
+    for i in range(logsink.RATE_LIMIT_COUNT + 10):
+        logger.debug(f"PRESSED {i}")
+
+    logger.remove()
+
+    lines = read_lines(file_name)
+    assert len(lines) == logsink.RATE_LIMIT_COUNT + 1
+    assert lines[-1].startswith("suppressed 10 more debug messages from ")
@@ -0,0 +1,64 @@
+
+# SPDX-License-Identifier: MIT
+
+import builtins
+import sys
+
+from pathlib import Path
+
+PORTMASTER_DIR = Path(__file__).resolve().parent.parent / 'PortMaster'
+sys.path.insert(0, str(PORTMASTER_DIR / 'exlibs'))
+sys.path.insert(0, str(PORTMASTER_DIR / 'pylibs'))
+
+builtins.PORTMASTER_DEBUG = False
+
+import pytest
+
+
+RUNTIME = 'mono-6.12.0.122.squashfs'
+
+
+@pytest.fixture
+def harbour(tmp_path, monkeypatch):
+    for name in ('HM_TOOLS_DIR', 'HM_PORTS_DIR', 'HM_SCRIPTS_DIR'):
+        monkeypatch.setenv(name, str(tmp_path))
+
+    from harbourmaster.harbour import HarbourMaster
+
+    class FakeHarbourMaster:
+        libs_dir = tmp_path
+        runtime_verified = HarbourMaster.runtime_verified
+
+        def __init__(self):
+            self.runtimes_info = {
+                RUNTIME: {
+                    'name': RUNTIME,
+                    'remote': {
+                        'aarch64': {'md5': 'remote-aarch64'},
+                        'x86_64': {'md5': 'remote-x86_64'},
+                        },
+                    },
+                }
+
+    (tmp_path / RUNTIME).write_bytes(b'runtime')
+    return FakeHarbourMaster()
+
+
+def test_sidecar_md5_is_verified(harbour):
+    (harbour.libs_dir / (RUNTIME + '.md5')).write_text(f"installed-md5  {RUNTIME}\n")
+
+    assert harbour.runtime_verified(RUNTIME, 'installed-md5') == 'Verified'
+    assert harbour.runtimes_info[RUNTIME]['local']['md5'] == 'installed-md5'
+
+
+def test_sidecar_mismatch_is_unverified(harbour):
+    (harbour.libs_dir / (RUNTIME + '.md5')).write_text(f"installed-md5  {RUNTIME}\n")
+
+    assert harbour.runtime_verified(RUNTIME, 'other-md5') == 'Unverified'
+
+
+def test_remote_md5_without_sidecar(harbour):
+    assert harbour.runtime_verified(RUNTIME, 'remote-x86_64') == 'Verified'
+    assert harbour.runtimes_info[RUNTIME]['local']['arch'] == 'x86_64'
+
+    assert harbour.runtime_verified(RUNTIME, 'other-md5') == 'Broken'
@@ -0,0 +1,311 @@
+
+# SPDX-License-Identifier: MIT
+
+import builtins
+import functools
+import http.server
+import json
+import sys
+import threading
+
+from pathlib import Path
+
+PORTMASTER_DIR = Path(__file__).resolve().parent.parent / 'PortMaster'
+TOOLS_DIR = Path(__file__).resolve().parent.parent / 'tools'
+sys.path.insert(0, str(PORTMASTER_DIR / 'exlibs'))
+sys.path.insert(0, str(PORTMASTER_DIR / 'pylibs'))
+sys.path.insert(0, str(TOOLS_DIR))
+
+builtins.PORTMASTER_DEBUG = False
+
+import pytest
+
+import pm_catalogue_delta
+
+
+def runtime_asset(runtime, arch, md5=None):
+    return {
+        'name': runtime,
+        'runtime_name': runtime,
+        'runtime_arch': arch,
+        'size': 1000,
+        'md5': md5 or f"{runtime}-{arch}",
+        'url': f"http://127.0.0.1/{runtime}.{arch}",
+        }
+
+
+def port_entry(stem, md5=None):
+    return {
+        'version': 3,
+        'name': f"{stem}.zip",
+        'items': [f"{stem}.sh", f"{stem}/"],
+        'items_opt': None,
+        'attr': {
+            'title': stem,
+            'porter': ['porter'],
+            'desc': f"{stem} description",
+            'inst': "",
+            'genres': ['action'],
+            'image': {},
+            'rtr': True,
+            'exp': False,
+            'runtime': [],
+            'store': [],
+            'availability': 'full',
+            'reqs': [],
+            'arch': ['aarch64'],
+            'min_glibc': "",
+            },
+        'source': {
+            'date_added': '2024-01-01',
+            'date_updated': '2024-01-01',
+            'size': 1000,
+            'md5': md5 or f"{stem}-md5",
+            'url': f"http://127.0.0.1/{stem}.zip",
+            },
+        }
+
+
+def catalogue(ports, utils):
+    return {
+        'ports': {f"{stem}.zip": port_entry(stem, md5) for stem, md5 in ports},
+        'utils': utils,
+        }
+
+
+MONO = 'mono-6.12.0.122.squashfs'
+LOVE = 'love-11.5.squashfs'
+
+OLD_CATALOGUE = catalogue(
+    [('alpha', None), ('bravo', None), ('charlie', None)],
+    {
+        'mono.aarch64.squashfs': runtime_asset(MONO, 'aarch64'),
+        'mono.x86_64.squashfs': runtime_asset(MONO, 'x86_64'),
+        'love.aarch64.squashfs': runtime_asset(LOVE, 'aarch64'),
+        'gameinfo.zip': {'name': 'gameinfo.zip', 'size': 1, 'md5': 'gameinfo-1', 'url': 'http://127.0.0.1/gameinfo.zip'},
+        })
+
+## bravo changed, charlie removed, delta added, one mono arch removed, love and gameinfo changed.
+NEW_CATALOGUE = catalogue(
+    [('alpha', None), ('bravo', 'bravo-md5-2'), ('delta', None)],
+    {
+        'mono.aarch64.squashfs': runtime_asset(MONO, 'aarch64'),
+        'love.aarch64.squashfs': runtime_asset(LOVE, 'aarch64', 'love-2'),
+        'love.x86_64.squashfs': runtime_asset(LOVE, 'x86_64'),
+        'gameinfo.zip': {'name': 'gameinfo.zip', 'size': 2, 'md5': 'gameinfo-2', 'url': 'http://127.0.0.1/gameinfo.zip'},
+        })
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requested.append(self.path)
+        super().do_GET()
+
+
+@pytest.fixture
+def catalogue_server(tmp_path):
+    """
+    Serves ports.json and ports.delta.json from 127.0.0.1, yields (www_dir, requested paths, ports.json url).
+    """
+    www_dir = tmp_path / 'www'
+    www_dir.mkdir()
+
+    server = http.server.ThreadingHTTPServer(
+        ('127.0.0.1', 0),
+        functools.partial(QuietHandler, directory=str(www_dir)))
+    server.requested = []
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        yield www_dir, server.requested, f"http://127.0.0.1:{server.server_address[1]}/ports.json"
+
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def publish(www_dir, new_data, old_datas, delta=None):
+    if delta is None:
+        delta = pm_catalogue_delta.build_delta(new_data, old_datas)
+
+    with open(www_dir / 'ports.json', 'w') as fh:
+        json.dump(new_data, fh)
+
+    with open(www_dir / 'ports.delta.json', 'w') as fh:
+        json.dump(delta, fh)
+
+
+@pytest.fixture
+def new_source(tmp_path, monkeypatch):
+    for name in ('HM_TOOLS_DIR', 'HM_PORTS_DIR', 'HM_SCRIPTS_DIR'):
+        monkeypatch.setenv(name, str(tmp_path))
+
+    from harbourmaster.source import PortMasterV3
+    from harbourmaster.util import Callback
+
+    class FakeHarbourMaster:
+        config = {'no-check': True, 'offline': True}
+
+        def __init__(self, cfg_dir, callback):
+            self.cfg_dir = cfg_dir
+            self.callback = callback
+            self.runtimes_info = {}
+
+        def list_runtimes(self):
+            pass
+
+        def save_config(self):
+            pass
+
+    def _new_source(name, url=None, hm=None):
+        """
+        A PortMasterV3 source in its own directory, reloaded from disk if it has been saved before.
+        """
+        cfg_dir = tmp_path / name
+        cfg_dir.mkdir(exist_ok=True)
+        source_file = cfg_dir / 'pm.source.json'
+
+        if source_file.is_file():
+            with open(source_file, 'r') as fh:
+                config = json.load(fh)
+
+        else:
+            config = {
+                'prefix': 'pm',
+                'name': 'PortMaster',
+                'url': url,
+                'version': PortMasterV3.VERSION,
+                'last_checked': None,
+                'data': {},
+                }
+
+            if url is None:
+                del config['url']
+
+        if hm is None:
+            hm = FakeHarbourMaster(cfg_dir, url is not None and Callback() or None)
+
+        return PortMasterV3(hm, source_file, config)
+
+    return _new_source
+
+
+@pytest.fixture
+def source(new_source):
+    return new_source('remove')
+
+
+def source_state(source):
+    return {
+        'ports': sorted(source.ports),
+        'utils': sorted(source.utils),
+        'data': dict(source._data),
+        'info': dict(source._info),
+        'manifest': source._config['data']['manifest'],
+        'runtime_keys': source.runtime_keys,
+        }
+
+
+def delta_update(new_source, catalogue_server, delta=None, drop_runtime_keys=False):
+    """
+    Updates a cache of OLD_CATALOGUE to NEW_CATALOGUE, returns the source and the urls it fetched.
+    """
+    www_dir, requested, url = catalogue_server
+
+    publish(www_dir, OLD_CATALOGUE, [])
+    old_source = new_source('delta', url)
+    old_source.update()
+
+    if drop_runtime_keys:
+        ## Like a cache from before runtime_keys.
+        del old_source._config['data']['runtime_keys']
+        old_source.save()
+
+    publish(www_dir, NEW_CATALOGUE, [OLD_CATALOGUE], delta)
+    requested.clear()
+
+    ## Picked up from disk, like the next time harbourmaster runs.
+    source = new_source('delta', url, old_source.hm)
+    source.update()
+
+    return source, requested[:]
+
+
+def full_update(new_source, catalogue_server):
+    www_dir, requested, url = catalogue_server
+
+    publish(www_dir, NEW_CATALOGUE, [])
+    source = new_source('full', url)
+    source.update()
+
+    return source
+
+
+def test_remove_runtime_arch(source):
+    runtime = MONO
+    utils = {
+        f"mono.{arch}.squashfs": runtime_asset(runtime, arch)
+        for arch in ('aarch64', 'x86_64')}
+
+    for key, asset in utils.items():
+        source._add_util(key, asset)
+
+    assert source._remove_util('mono.aarch64.squashfs') is True
+    assert list(source.hm.runtimes_info[runtime]['remote']) == ['x86_64']
+    assert source.utils == [source.clean_name(runtime)]
+    assert source._data[source.clean_name(runtime)]['md5'] == f"{runtime}-x86_64"
+
+    assert source._remove_util('mono.x86_64.squashfs') is True
+    assert source.hm.runtimes_info[runtime]['remote'] == {}
+    assert source.utils == []
+    assert source.clean_name(runtime) not in source._data
+    assert source.runtime_keys == {}
+
+
+def test_remove_plain_util(source):
+    source._add_util('images.zip', {'name': 'images.zip', 'size': 1, 'md5': 'x', 'url': 'http://127.0.0.1/images.zip'})
+    source._add_util('gameinfo.zip', {'name': 'gameinfo.zip', 'size': 1, 'md5': 'y', 'url': 'http://127.0.0.1/gameinfo.zip'})
+
+    assert source._remove_util('gameinfo.zip') is False
+    assert 'gameinfo.zip' not in source.utils
+    assert 'images.zip' in source._data
+
+
+def test_delta_matches_full_update(new_source, catalogue_server):
+    delta_source, requested = delta_update(new_source, catalogue_server)
+    full_source = full_update(new_source, catalogue_server)
+
+    assert requested == ['/ports.delta.json']
+    assert source_state(delta_source) == source_state(full_source)
+    assert delta_source.hm.runtimes_info == full_source.hm.runtimes_info
+
+
+def test_delta_missing_entry_fetches_everything(new_source, catalogue_server):
+    ## Built against the new catalogue, so none of our changes are in it.
+    delta = pm_catalogue_delta.build_delta(NEW_CATALOGUE, [NEW_CATALOGUE])
+
+    delta_source, requested = delta_update(new_source, catalogue_server, delta=delta)
+
+    assert requested == ['/ports.delta.json', '/ports.json']
+    assert source_state(delta_source) == source_state(full_update(new_source, catalogue_server))
+
+
+def test_delta_version_mismatch_fetches_everything(new_source, catalogue_server):
+    delta = pm_catalogue_delta.build_delta(NEW_CATALOGUE, [OLD_CATALOGUE])
+    delta['version'] += 1
+
+    delta_source, requested = delta_update(new_source, catalogue_server, delta=delta)
+
+    assert requested == ['/ports.delta.json', '/ports.json']
+    assert source_state(delta_source) == source_state(full_update(new_source, catalogue_server))
+
+
+def test_delta_unknown_removed_runtime_fetches_everything(new_source, catalogue_server):
+    delta_source, requested = delta_update(new_source, catalogue_server, drop_runtime_keys=True)
+
+    assert requested == ['/ports.delta.json', '/ports.json']
+    assert source_state(delta_source) == source_state(full_update(new_source, catalogue_server))
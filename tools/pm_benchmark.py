@@ -0,0 +1,527 @@
+#!/usr/bin/env python3
+#
+# SPDX-License-Identifier: MIT
+#
+# Benchmarks the harbourmaster hot paths against a synthetic catalogue, without touching the network.
+#
+#   pm_benchmark.py [--ports 2000] [--installed 200] [--repeat 5] [--work-dir DIR]
+#                   [--baseline FILE] [--save-baseline] [--tolerance 0.25]
+#
+# A ports.json with --ports entries, --installed fake installed ports and a few port zips are generated
+# in the work directory (a temp directory by default), ports.json is served from 127.0.0.1 so the real
+# source update code runs. Each benchmark is run --repeat times and the median is reported.
+#
+# Results are compared against the baseline file (tools/pm_benchmark_baseline.json by default), anything
+# slower than the baseline by more than --tolerance is flagged and the exit code is 1. Baselines are only
+# meaningful on the machine that made them, use --save-baseline to write one.
+#
+#   pm_benchmark.py --generate DIR [--ports 2000] [--installed 200]
+#
+# Just writes the synthetic ports.json, installed ports and zips to DIR.
+#
+
+import argparse
+import builtins
+import contextlib
+import datetime
+import functools
+import hashlib
+import http.server
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+
+from pathlib import Path
+
+
+TOOLS_DIR = Path(__file__).resolve().parent
+PYLIBS_DIR = TOOLS_DIR.parent / 'PortMaster' / 'pylibs'
+EXLIBS_DIR = TOOLS_DIR.parent / 'PortMaster' / 'exlibs'
+
+DEFAULT_BASELINE = TOOLS_DIR / 'pm_benchmark_baseline.json'
+BASELINE_VERSION = 1
+
+## Mirrors harbourmaster.config.HM_GENRES, the generator doesn't need harbourmaster loaded.
+GENRES = [
+    "action", "adventure", "arcade", "casino/card", "fps", "platformer", "puzzle", "racing",
+    "rhythm", "rpg", "simulation", "sports", "strategy", "visual novel", "other",
+    ]
+
+RUNTIMES = [
+    "frt_3.5.2.squashfs",
+    "godot_4.2.2.squashfs",
+    "mono-6.12.0.122-aarch64.squashfs",
+    "solarus-1.6.5.squashfs",
+    "jdk11.squashfs",
+    "weston_pkg_0.2.squashfs",
+    ]
+
+RUNTIME_ARCHES = ['aarch64', 'armhf', 'x86_64']
+
+WORDS = [
+    "dark", "super", "space", "quest", "cave", "star", "dungeon", "pixel", "metal", "dream",
+    "shadow", "island", "robot", "castle", "rogue", "forest", "racer", "tower", "blade", "sky",
+    ]
+
+FILTER_COMBOS = [
+    [],
+    ['installed'],
+    ['rtr'],
+    ['!rtr', 'puzzle'],
+    ['action', 'rtr'],
+    ['godot'],
+    ['update available', 'installed'],
+    ]
+
+
+################################################################################
+## Generator
+def fake_md5(*parts):
+    return hashlib.md5(':'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+
+def port_names(index, rng):
+    title = ' '.join(rng.choice(WORDS).capitalize() for _ in range(rng.randint(1, 3))) + f" {index:05d}"
+    stem = f"benchport{index:05d}"
+    return title, stem
+
+
+def make_port_entry(index, rng, base_url):
+    title, stem = port_names(index, rng)
+    added = datetime.date(2020, 1, 1) + datetime.timedelta(days=rng.randrange(1500))
+    updated = added + datetime.timedelta(days=rng.randrange(300))
+
+    runtime = []
+    if rng.random() < 0.25:
+        runtime = [rng.choice(RUNTIMES)]
+
+    size = rng.randrange(100_000, 2_000_000_000)
+
+    return f"{stem}.zip", {
+        'version': 3,
+        'name': f"{stem}.zip",
+        'items': [f"{title}.sh", f"{stem}/"],
+        'items_opt': None,
+        'attr': {
+            'title': title,
+            'porter': rng.sample([f"porter{n:03d}" for n in range(80)], rng.randint(1, 2)),
+            'desc': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(20, 60))),
+            'desc_md': None,
+            'inst': "Copy your game files into ports/" + stem + "/gamedata.",
+            'inst_md': None,
+            'genres': rng.sample(GENRES, rng.randint(1, 3)),
+            'image': {'screenshot': f"{stem}.screenshot.png"},
+            'rtr': rng.random() < 0.4,
+            'exp': rng.random() < 0.05,
+            'runtime': runtime,
+            'store': [],
+            'availability': 'full',
+            'reqs': rng.choice([[], [], ['power'], ['!lowres'], ['wide']]),
+            'arch': ['aarch64'],
+            'min_glibc': "",
+            },
+        'source': {
+            'date_added': added.isoformat(),
+            'date_updated': updated.isoformat(),
+            'size': size,
+            'md5': fake_md5(stem, size),
+            'url': f"{base_url}/{stem}.zip",
+            'downloads': rng.randrange(50000),
+            },
+        }
+
+
+def make_util_entries(base_url):
+    utils = {}
+
+    for runtime in RUNTIMES:
+        for arch in RUNTIME_ARCHES:
+            key = f"{runtime.rsplit('.', 1)[0]}.{arch}.squashfs"
+            utils[key] = {
+                'name': runtime,
+                'runtime_name': runtime,
+                'runtime_arch': arch,
+                'size': 50_000_000,
+                'md5': fake_md5(runtime, arch),
+                'url': f"{base_url}/{key}",
+                }
+
+    return utils
+
+
+def make_catalogue(count, seed=1, base_url="http://127.0.0.1/bench"):
+    """
+    Returns a ports.json style catalogue with count ports and some runtimes.
+    """
+    rng = random.Random(seed)
+    ports = {}
+
+    for index in range(count):
+        key, entry = make_port_entry(index, rng, base_url)
+        ports[key] = entry
+
+    return {
+        'ports': ports,
+        'utils': make_util_entries(base_url),
+        }
+
+
+def write_installed_port(ports_dir, entry, rng, files_per_port=8, outdated=False):
+    """
+    Writes an installed port, like harbourmaster leaves behind.
+    """
+    stem = entry['name'][:-4]
+    script_name = entry['items'][0]
+    port_dir = ports_dir / stem
+    data_dir = port_dir / 'data'
+    data_dir.mkdir(parents=True, exist_ok=True)
+
+    for file_number in range(files_per_port):
+        (data_dir / f"file{file_number:03d}.bin").write_bytes(os.urandom(rng.randrange(256, 8192)))
+
+    (ports_dir / script_name).write_text(f"#!/bin/bash\n\necho {stem}\n")
+
+    port_info = json.loads(json.dumps(entry))
+    del port_info['source']
+    port_info['status'] = {
+        'source': 'PortMaster',
+        'md5': outdated and fake_md5(stem, 'old') or entry['source']['md5'],
+        'status': 'Installed',
+        }
+    port_info['files'] = {
+        'port.json': f"{stem}/port.json",
+        script_name: script_name,
+        f"{stem}/": f"{stem}/",
+        }
+
+    with (port_dir / 'port.json').open('w') as fh:
+        json.dump(port_info, fh, indent=4)
+
+    return port_dir
+
+
+def write_port_zip(zip_file, entry, rng, files_per_port=32):
+    """
+    Writes a port zip that installs cleanly from a local file.
+    """
+    stem = entry['name'][:-4]
+    port_info = json.loads(json.dumps(entry))
+    del port_info['source']
+
+    with zipfile.ZipFile(zip_file, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(f"{stem}/port.json", json.dumps(port_info, indent=4))
+        zf.writestr(entry['items'][0], f"#!/bin/bash\n\necho {stem}\n")
+
+        for file_number in range(files_per_port):
+            zf.writestr(f"{stem}/data/file{file_number:03d}.bin", os.urandom(rng.randrange(256, 16384)))
+
+    return zip_file
+
+
+def generate(work_dir, port_count, installed_count, zip_count=4, seed=1):
+    """
+    Writes ports.json, the fake installed ports and some zips into work_dir.
+
+    Returns the names of the zips, which are not installed.
+    """
+    rng = random.Random(seed)
+    work_dir = Path(work_dir)
+    ports_dir = work_dir / 'ports'
+    zips_dir = work_dir / 'zips'
+    ports_dir.mkdir(parents=True, exist_ok=True)
+    zips_dir.mkdir(parents=True, exist_ok=True)
+
+    catalogue = make_catalogue(port_count, seed)
+
+    with (work_dir / 'ports.json').open('w') as fh:
+        json.dump(catalogue, fh, indent=4)
+
+    entries = list(catalogue['ports'].values())
+    rng.shuffle(entries)
+
+    for entry in entries[:installed_count]:
+        write_installed_port(ports_dir, entry, rng, outdated=(rng.random() < 0.1))
+
+    zip_names = []
+    for entry in entries[installed_count:installed_count + zip_count]:
+        write_port_zip(zips_dir / entry['name'], entry, rng)
+        zip_names.append(entry['name'])
+
+    return zip_names
+
+
+################################################################################
+## Benchmarks
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@functools.lru_cache(maxsize=None)
+def import_harbourmaster(work_dir):
+    ## harbourmaster works out its directories on import.
+    os.environ['HM_TOOLS_DIR'] = str(work_dir / 'tools')
+    os.environ['HM_PORTS_DIR'] = str(work_dir / 'ports')
+    os.environ['HM_SCRIPTS_DIR'] = str(work_dir / 'ports')
+
+    sys.path[:0] = [str(PYLIBS_DIR), str(EXLIBS_DIR)]
+
+    ## pugwash normally sets this.
+    if not hasattr(builtins, 'PORTMASTER_DEBUG'):
+        builtins.PORTMASTER_DEBUG = False
+
+    import utility
+    from loguru import logger
+
+    logger.remove()
+    utility.do_cprint_output(open(os.devnull, 'w'))
+
+    import harbourmaster
+    return harbourmaster
+
+
+def time_it(repeat, func, setup=None):
+    times = []
+
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+
+    return statistics.median(times)
+
+
+def time_installs(hm, work_dir, zip_names, repeat):
+    install_times = []
+    uninstall_times = []
+
+    for _ in range(repeat):
+        for zip_name in zip_names:
+            zip_file = work_dir / 'zips' / zip_name
+
+            started = time.perf_counter()
+            if hm.install_port(str(zip_file)) != 0:
+                raise RuntimeError(f"Unable to install {zip_file}")
+            install_times.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            if hm.uninstall_port(zip_name) != 0:
+                raise RuntimeError(f"Unable to uninstall {zip_name}")
+            uninstall_times.append(time.perf_counter() - started)
+
+    return install_times, uninstall_times
+
+
+@contextlib.contextmanager
+def serve_directory(directory):
+    """
+    Serves directory from 127.0.0.1 on a spare port, yields the base url.
+    """
+    server = http.server.ThreadingHTTPServer(
+        ('127.0.0.1', 0),
+        functools.partial(QuietHandler, directory=str(directory)))
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def setup_sources(harbourmaster, config, ports_url):
+    """
+    Leaves only the PortMaster source, pointed at ports_url. Returns a fresh HarbourMaster.
+    """
+    callback = harbourmaster.Callback()
+
+    ## First run sets up the config.
+    hm = harbourmaster.HarbourMaster(config, callback=callback)
+
+    for source_file in hm.cfg_dir.glob('*.source.json'):
+        if 'multiverse' in source_file.name:
+            source_file.unlink()
+
+    hm = harbourmaster.HarbourMaster(config, callback=callback)
+    hm.sources['pm']._config['url'] = ports_url
+
+    return hm
+
+
+def run_benchmarks(work_dir, zip_names, repeat):
+    harbourmaster = import_harbourmaster(work_dir)
+    (work_dir / 'tools' / 'PortMaster').mkdir(parents=True, exist_ok=True)
+
+    config = {'offline': True, 'no-check': True, 'quiet': True}
+    callback = harbourmaster.Callback()
+
+    def new_hm():
+        return harbourmaster.HarbourMaster(config, callback=callback)
+
+    with serve_directory(work_dir) as base_url:
+        hm = setup_sources(harbourmaster, config, f"{base_url}/ports.json")
+        source = hm.sources['pm']
+
+        results = {}
+
+        def source_update():
+            source._did_update = False
+            source.update()
+
+        results['source_update'] = time_it(repeat, source_update)
+
+        results['init'] = time_it(repeat, new_hm)
+
+        hm = new_hm()
+        results['load_ports'] = time_it(repeat, hm.load_ports)
+
+        def dirty_port_attrs():
+            hm._port_attrs_updated = True
+
+        results['build_port_attrs'] = time_it(repeat, hm.build_port_attrs, dirty_port_attrs)
+
+        for filters in FILTER_COMBOS:
+            results[f"list_ports_new[{','.join(filters)}]"] = time_it(
+                repeat, functools.partial(hm.list_ports_new, filters=filters))
+
+        results['list_ports_new[recently_added]'] = time_it(
+            repeat, functools.partial(hm.list_ports_new, sort_by='recently_added'))
+
+        port_names = list(hm.list_ports_names_new([]))
+        sample = random.Random(2).sample(port_names, min(500, len(port_names)))
+
+        def port_info_sample():
+            for port_name in sample:
+                hm.port_info(port_name)
+
+        results['port_info[x500]'] = time_it(repeat, port_info_sample)
+
+        ## install_port still has a stray print or two, keep them out of the report.
+        with open(os.devnull, 'w') as null, contextlib.redirect_stdout(null):
+            install_times, uninstall_times = time_installs(hm, work_dir, zip_names, repeat)
+
+        if len(install_times) > 0:
+            results['install_port'] = statistics.median(install_times)
+            results['uninstall_port'] = statistics.median(uninstall_times)
+
+        return results
+
+
+################################################################################
+## Reporting
+def compare(results, baseline, tolerance):
+    """
+    Prints the results next to the baseline, returns the names of anything that got slower.
+    """
+    slower = []
+    baseline_results = (baseline or {}).get('results', {})
+
+    print(f"{'benchmark':<44} {'ms':>10} {'baseline':>10} {'change':>8}")
+    for name, seconds in results.items():
+        line = f"{name:<44} {seconds * 1000:>10.2f}"
+
+        if name in baseline_results and baseline_results[name] > 0:
+            change = seconds / baseline_results[name] - 1
+            line += f" {baseline_results[name] * 1000:>10.2f} {change * 100:>+7.1f}%"
+
+            if change > tolerance:
+                line += "  SLOWER"
+                slower.append(name)
+
+        print(line)
+
+    return slower
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Benchmark harbourmaster against a synthetic catalogue.")
+    parser.add_argument('--ports', type=int, default=2000, help="ports in the catalogue")
+    parser.add_argument('--installed', type=int, default=200, help="fake installed ports")
+    parser.add_argument('--zips', type=int, default=4, help="ports to install and uninstall")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per benchmark, the median is used")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--work-dir', type=Path, default=None, help="keep the generated files here")
+    parser.add_argument('--generate', type=Path, default=None, metavar='DIR', help="only generate the files")
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help="write the results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed slow down before failing")
+    args = parser.parse_args(argv[1:])
+
+    if args.generate is not None:
+        zip_names = generate(args.generate, args.ports, args.installed, args.zips, args.seed)
+        print(f"{args.generate}: {args.ports} ports, {args.installed} installed, {len(zip_names)} zips.")
+        return 0
+
+    temp_dir = None
+    work_dir = args.work_dir
+    if work_dir is None:
+        temp_dir = tempfile.mkdtemp(prefix='pm_benchmark.')
+        work_dir = Path(temp_dir)
+
+    work_dir = work_dir.resolve()
+
+    try:
+        zip_names = generate(work_dir, args.ports, args.installed, args.zips, args.seed)
+        results = run_benchmarks(work_dir, zip_names, args.repeat)
+
+    finally:
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir)
+
+    meta = {
+        'ports': args.ports,
+        'installed': args.installed,
+        'repeat': args.repeat,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        }
+
+    baseline = None
+    if args.baseline.is_file():
+        with args.baseline.open('r') as fh:
+            baseline = json.load(fh)
+
+        if baseline.get('version', None) != BASELINE_VERSION:
+            print(f"Ignoring {args.baseline}, it is from a different version of this script.")
+            baseline = None
+
+        elif (baseline['meta']['ports'], baseline['meta']['installed']) != (args.ports, args.installed):
+            print(f"Ignoring {args.baseline}, it was made with --ports {baseline['meta']['ports']} --installed {baseline['meta']['installed']}.")
+            baseline = None
+
+    slower = compare(results, baseline, args.tolerance)
+
+    if args.save_baseline:
+        with args.baseline.open('w') as fh:
+            json.dump({
+                'version': BASELINE_VERSION,
+                'meta': meta,
+                'results': results,
+                }, fh, indent=4)
+
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if len(slower) > 0:
+        print(f"{len(slower)} benchmarks are more than {args.tolerance * 100:.0f}% slower than the baseline.")
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main(sys.argv))
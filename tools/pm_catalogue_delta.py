@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+#
+# SPDX-License-Identifier: MIT
+#
+# Builds ports.delta.json next to a ports.json, so clients can skip downloading the whole catalogue.
+#
+#   pm_catalogue_delta.py <new ports.json> <old ports.json> [<older ports.json> ...]
+#
+# The delta holds the md5 of every entry in the new ports.json, and the full entry for everything
+# that changed since any of the old ones. Clients older than all of them just grab ports.json.
+#
+#   pm_catalogue_delta.py --serve <directory> [port]
+#
+# Serves a directory over http, handy as a stand-in for the real server when testing. Point a source
+# url at http://127.0.0.1:8000/ports.json.
+#
+
+import functools
+import hashlib
+import http.server
+import json
+import sys
+
+from pathlib import Path
+
+
+DELTA_VERSION = 1
+SECTIONS = ('ports', 'utils')
+
+
+def entry_md5(entry):
+    ## Must match harbourmaster.source.catalogue_entry_md5
+    return hashlib.md5(json.dumps(entry, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+def catalogue_manifest(data):
+    return {
+        section: {
+            key: entry_md5(entry)
+            for key, entry in data.get(section, {}).items()
+            }
+        for section in SECTIONS
+        }
+
+
+def build_delta(new_data, old_datas):
+    manifest = catalogue_manifest(new_data)
+    old_manifests = [
+        catalogue_manifest(old_data)
+        for old_data in old_datas]
+
+    entries = {}
+    for section in SECTIONS:
+        entries[section] = {
+            key: new_data[section][key]
+            for key, md5sum in manifest[section].items()
+            if any(old_manifest[section].get(key, None) != md5sum for old_manifest in old_manifests)
+            }
+
+    return {
+        'version': DELTA_VERSION,
+        'manifest': manifest,
+        'entries': entries,
+        }
+
+
+def serve(directory, port=8000):
+    handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=str(directory))
+
+    with http.server.ThreadingHTTPServer(('127.0.0.1', port), handler) as httpd:
+        print(f"Serving {directory} on http://127.0.0.1:{port}/")
+        try:
+            httpd.serve_forever()
+
+        except KeyboardInterrupt:
+            pass
+
+
+def main(argv):
+    if len(argv) >= 3 and argv[1] == '--serve':
+        serve(Path(argv[2]), int(argv[3]) if len(argv) > 3 else 8000)
+        return 0
+
+    if len(argv) < 3:
+        print(f"{argv[0]} <new ports.json> <old ports.json> [<older ports.json> ...]")
+        print(f"{argv[0]} --serve <directory> [port]")
+        return 255
+
+    new_file = Path(argv[1])
+
+    with new_file.open('r') as fh:
+        new_data = json.load(fh)
+
+    old_datas = []
+    for old_file in argv[2:]:
+        with open(old_file, 'r') as fh:
+            old_datas.append(json.load(fh))
+
+    delta = build_delta(new_data, old_datas)
+
+    delta_file = new_file.with_name('ports.delta.json')
+    with delta_file.open('w') as fh:
+        json.dump(delta, fh, separators=(',', ':'))
+
+    print(f"{delta_file}: {sum(len(entries) for entries in delta['entries'].values())} changed entries.")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main(sys.argv))
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+#
+# SPDX-License-Identifier: MIT
+#
+# Headless benchmark of the pugwash render path, using the offscreen SDL video driver and the software renderer.
+#
+#   pm_gui_benchmark.py [--ports 2000] [--installed 200] [--devices rg351p,rg353v,x55,rg552]
+#                       [--theme DIR ...] [--schemes "Light Mode,Dark Mode"] [--fps 60]
+#                       [--video-driver offscreen] [--work-dir DIR] [--output FILE] [--phases]
+#
+# A synthetic catalogue is generated like pm_benchmark.py does, with a screenshot for every port. Then
+# `pugwash benchmark` is run once for every colour scheme of every theme (the default theme plus any --theme
+# directories) on every device, a theme change needs a restart so each one is its own process. Each run
+# replays pylibs/pugbench.py SCRIPT: scrolling the ports list, opening and using the filters, and paging
+# through port info.
+#
+# Reported for each run are the per-frame update and draw times, how many TTF renders happen per frame,
+# and the hit rates of the text and image texture caches. --output writes everything, including the
+# per-phase breakdown, as json.
+#
+# Requires PySDL2 to find SDL2, SDL2_ttf and SDL2_image, like pugwash itself.
+#
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from pathlib import Path
+
+import pm_benchmark
+
+
+PUGWASH = pm_benchmark.TOOLS_DIR.parent / 'PortMaster' / 'pugwash'
+DEFAULT_THEME_DIR = pm_benchmark.PYLIBS_DIR / 'default_theme'
+
+## One of each resolution from harbourmaster.hardware.HW_INFO that themes usually special case.
+DEFAULT_DEVICES = ['rg351p', 'rg353v', 'x55', 'rg552']
+
+RUN_TIMEOUT = 600
+
+
+def write_screenshots(images_dir, port_names, variants=8):
+    """
+    Gives every port a screenshot, so the port image cache gets used like it does on a device.
+    """
+    import png
+
+    images_dir.mkdir(parents=True, exist_ok=True)
+
+    width, height = 320, 240
+    screenshots = []
+    for variant in range(variants):
+        rows = [
+            [((x + variant * 32) ^ y) & 0xFF for x in range(width) for _ in range(3)]
+            for y in range(height)]
+
+        screenshot = images_dir / f"_variant{variant}.png"
+        with screenshot.open('wb') as fh:
+            png.Writer(width, height, greyscale=False).write(fh, rows)
+
+        screenshots.append(screenshot.read_bytes())
+        screenshot.unlink()
+
+    for index, port_name in enumerate(port_names):
+        (images_dir / f"{port_name[:-4]}.screenshot.png").write_bytes(screenshots[index % variants])
+
+
+def theme_schemes(theme_dir):
+    with (theme_dir / 'theme.json').open('r') as fh:
+        theme_data = json.load(fh)
+
+    schemes = [
+        scheme_name
+        for scheme_name in theme_data.get('#schemes', {})
+        if not scheme_name.startswith('#')]
+
+    return schemes or [None]
+
+
+def prepare(work_dir, args):
+    """
+    Generates the catalogue and sets up the config directory pugwash will use.
+    """
+    pm_benchmark.generate(work_dir, args.ports, args.installed, zip_count=0, seed=args.seed)
+
+    harbourmaster = pm_benchmark.import_harbourmaster(work_dir)
+    (work_dir / 'tools' / 'PortMaster').mkdir(parents=True, exist_ok=True)
+
+    config = {'offline': True, 'no-check': True, 'quiet': True}
+    with pm_benchmark.serve_directory(work_dir) as base_url:
+        hm = pm_benchmark.setup_sources(harbourmaster, config, f"{base_url}/ports.json")
+        hm.sources['pm'].update()
+
+    source = hm.sources['pm']
+    write_screenshots(source._images_dir, source.ports)
+
+    themes = [('default_theme', DEFAULT_THEME_DIR)]
+    for theme_dir in args.theme:
+        theme_dir = theme_dir.resolve()
+        shutil.copytree(theme_dir, hm.cfg_dir.parent / 'themes' / theme_dir.name, dirs_exist_ok=True)
+        themes.append((theme_dir.name, theme_dir))
+
+    return hm.cfg_dir, themes
+
+
+def run_pugwash(work_dir, cfg_dir, theme_name, scheme, device, args):
+    cfg_file = cfg_dir / 'config.json'
+    with cfg_file.open('r') as fh:
+        cfg_data = json.load(fh)
+
+    cfg_data.update({
+        'disclaimer': True,
+        'theme': theme_name,
+        'theme-scheme': scheme,
+        'fps': args.fps,
+        'sfx-disabled': True,
+        'music-disabled': True,
+        })
+
+    with cfg_file.open('w') as fh:
+        json.dump(cfg_data, fh, indent=4)
+
+    results_file = work_dir / f"results.{theme_name}.{scheme}.{device}.json"
+
+    env = dict(os.environ)
+    env.update({
+        'HM_TOOLS_DIR': str(work_dir / 'tools'),
+        'HM_PORTS_DIR': str(work_dir / 'ports'),
+        'HM_SCRIPTS_DIR': str(work_dir / 'ports'),
+        'SDL_VIDEODRIVER': args.video_driver,
+        'SDL_RENDER_DRIVER': 'software',
+        'SDL_AUDIODRIVER': 'dummy',
+        })
+
+    ## Run from the git checkout so pugwash runs windowed in testing mode.
+    process = subprocess.run(
+        [sys.executable, str(PUGWASH), 'benchmark', str(results_file), device, '--offline', '--no-check', '--quiet'],
+        cwd=str(pm_benchmark.TOOLS_DIR.parent),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        timeout=RUN_TIMEOUT)
+
+    if process.returncode != 0 or not results_file.is_file():
+        print(f"pugwash benchmark failed for {theme_name} / {scheme} / {device}:")
+        print(process.stderr)
+        return None
+
+    with results_file.open('r') as fh:
+        return json.load(fh)
+
+
+def format_rate(rate):
+    if rate is None:
+        return "-"
+
+    return f"{rate * 100:.1f}%"
+
+
+def report(all_results, show_phases):
+    print(
+        f"{'theme':<28} {'device':<8} {'size':>9} {'frames':>6} {'draws':>5} "
+        f"{'upd p50':>7} {'upd p95':>7} {'drw p50':>7} {'drw p95':>7} {'drw max':>7} "
+        f"{'ttf/frm':>7} {'ttf max':>7} {'text hit':>8} {'img hit':>8}")
+
+    def row(name, device, resolution, stats):
+        print(
+            f"{name:<28} {device:<8} {resolution:>9} {stats['frames']:>6} {stats['draws']:>5} "
+            f"{stats['update_ms']['p50']:>7.2f} {stats['update_ms']['p95']:>7.2f} "
+            f"{stats['draw_ms']['p50']:>7.2f} {stats['draw_ms']['p95']:>7.2f} {stats['draw_ms']['max']:>7.2f} "
+            f"{stats['text_renders_per_frame']:>7.2f} {stats['text_renders_max']:>7} "
+            f"{format_rate(stats['text_hit_rate']):>8} {format_rate(stats['image_hit_rate']):>8}")
+
+    for results in all_results:
+        name = f"{results['theme']}/{results['scheme']}"
+        resolution = f"{results['resolution'][0]}x{results['resolution'][1]}"
+
+        row(name[:28], results['device'], resolution, results['total'])
+
+        if show_phases:
+            for phase, stats in results['phases'].items():
+                row(f"  {phase}", "", "", stats)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Benchmark the pugwash gui headless against a synthetic catalogue.")
+    parser.add_argument('--ports', type=int, default=2000, help="ports in the catalogue")
+    parser.add_argument('--installed', type=int, default=200, help="fake installed ports")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--devices', default=','.join(DEFAULT_DEVICES), help="devices from HW_INFO to run as")
+    parser.add_argument('--theme', type=Path, action='append', default=[], metavar='DIR', help="also benchmark this theme")
+    parser.add_argument('--schemes', default=None, help="only run these colour schemes")
+    parser.add_argument('--fps', type=int, default=60)
+    parser.add_argument('--video-driver', default='offscreen', help="SDL_VIDEODRIVER, offscreen or dummy")
+    parser.add_argument('--work-dir', type=Path, default=None, help="keep the generated files here")
+    parser.add_argument('--output', type=Path, default=None, help="write all results to this json file")
+    parser.add_argument('--phases', action='store_true', help="show each phase of the script")
+    args = parser.parse_args(argv[1:])
+
+    devices = [device.strip() for device in args.devices.split(',') if device.strip()]
+    only_schemes = args.schemes is not None and [scheme.strip() for scheme in args.schemes.split(',')] or None
+
+    temp_dir = None
+    work_dir = args.work_dir
+    if work_dir is None:
+        temp_dir = tempfile.mkdtemp(prefix='pm_gui_benchmark.')
+        work_dir = Path(temp_dir)
+
+    work_dir = work_dir.resolve()
+    all_results = []
+
+    try:
+        cfg_dir, themes = prepare(work_dir, args)
+
+        for theme_name, theme_dir in themes:
+            for scheme in theme_schemes(theme_dir):
+                if only_schemes is not None and scheme not in only_schemes:
+                    continue
+
+                for device in devices:
+                    print(f"Running {theme_name} / {scheme} / {device}")
+                    results = run_pugwash(work_dir, cfg_dir, theme_name, scheme, device, args)
+
+                    if results is not None:
+                        all_results.append(results)
+
+    finally:
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir)
+
+    report(all_results, args.phases)
+
+    if args.output is not None:
+        with args.output.open('w') as fh:
+            json.dump({
+                'ports': args.ports,
+                'installed': args.installed,
+                'fps': args.fps,
+                'results': all_results,
+                }, fh, indent=4)
+
+        print(f"Saved results to {args.output}")
+
+    return 0 if len(all_results) > 0 else 1
+
+
+if __name__ == '__main__':
+    exit(main(sys.argv))